@@ -13,7 +13,7 @@ from app.database import Base
 from app.config import get_settings
 
 # Импортируем все модели для autogenerate
-from app.models import HousingComplex, House, Binding
+from app.models import HousingComplex, HousingComplexStats, House, Binding, User, RefreshRun, ProcessedPage
 
 # this is the Alembic Config object
 config = context.config
@@ -23,7 +23,8 @@ settings = get_settings()
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
 # Interpret the config file for Python logging.
-if config.config_file_name is not None:
+# При запуске из приложения (upgrade_schema) логирование уже настроено
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -46,6 +47,15 @@ def run_migrations_offline() -> None:
 
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
+    # upgrade_schema передаёт своё соединение: миграции выполняются в его транзакции
+    # под блокировкой, фиксирует транзакцию вызывающий код
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
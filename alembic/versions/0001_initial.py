@@ -0,0 +1,89 @@
+"""Начальная схема БД
+
+Revision ID: 0001_initial
+Revises:
+Create Date: 2026-10-19 10:00:00
+
+Соответствует схеме, которую создавал Base.metadata.create_all. Для БД,
+созданной через create_all, выполните `alembic stamp 0001_initial`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_initial'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'housing_complexes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=500), nullable=False),
+        sa.Column('address', sa.String(length=500), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('developer', sa.String(length=300), nullable=True),
+        sa.Column('source_url', sa.String(length=1000), nullable=False),
+        sa.Column('data_hash', sa.String(length=64), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_housing_complexes_id', 'housing_complexes', ['id'])
+    op.create_index('ix_housing_complexes_name', 'housing_complexes', ['name'])
+    op.create_index('ix_housing_complexes_address', 'housing_complexes', ['address'])
+    op.create_index('ix_housing_complexes_source_url', 'housing_complexes', ['source_url'], unique=True)
+    op.create_index('ix_housing_complexes_data_hash', 'housing_complexes', ['data_hash'])
+    op.create_index('idx_housing_complex_data_hash', 'housing_complexes', ['data_hash'])
+
+    op.create_table(
+        'houses',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('address', sa.String(length=500), nullable=False),
+        sa.Column('floors', sa.Integer(), nullable=True, comment='Этажность дома'),
+        sa.Column('apartments_count', sa.Integer(), nullable=True, comment='Количество квартир'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_houses_id', 'houses', ['id'])
+    op.create_index('ix_houses_address', 'houses', ['address'], unique=True)
+    op.create_index('idx_house_address', 'houses', ['address'])
+
+    op.create_table(
+        'bindings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('house_id', sa.Integer(), nullable=False),
+        sa.Column('housing_complex_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['house_id'], ['houses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['housing_complex_id'], ['housing_complexes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('house_id', 'housing_complex_id', name='uq_house_housing_complex'),
+    )
+    op.create_index('ix_bindings_id', 'bindings', ['id'])
+    op.create_index('idx_binding_house', 'bindings', ['house_id'])
+    op.create_index('idx_binding_housing_complex', 'bindings', ['housing_complex_id'])
+
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('hashed_password', sa.String(length=255), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_table('users')
+    op.drop_table('bindings')
+    op.drop_table('houses')
+    op.drop_table('housing_complexes')
@@ -0,0 +1,178 @@
+"""Нормализованный ключ адреса дома и удаление дублей домов
+
+Revision ID: 0002_house_address_key
+Revises: 0001_initial
+Create Date: 2026-10-19 11:00:00
+
+- Добавляет houses.address_key (нормализованный адрес) с уникальным индексом
+- Схлопывает дома с одинаковым ключом: привязки переносятся на дом с меньшим id,
+  пустые floors/apartments_count заполняются из дублей
+- Удаляет индексы по houses.address (поиск теперь идёт по address_key)
+
+Нормализатор адреса скопирован в миграцию: её результат не меняется вместе с app.utils.address.
+"""
+from typing import List, Optional
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_house_address_key'
+down_revision = '0001_initial'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+# Нормализатор адреса, замороженный на момент миграции (копия app.utils.address):
+# ключи в БД не должны зависеть от будущих изменений нормализатора
+_CITY_MARKERS = {"г", "город", "гор"}
+_HOUSE_MARKERS = {
+    "д": "", "дом": "", "вл": "вл", "влд": "вл", "владение": "вл", "к": "к", "корп": "к", "корпус": "к",
+    "стр": "с", "строение": "с", "с": "с", "лит": "лит", "литера": "лит",
+}
+_STREET_TYPES = {
+    "ул": "ул", "улица": "ул", "пр-т": "пр-кт", "пр-кт": "пр-кт", "просп": "пр-кт", "проспект": "пр-кт",
+    "пер": "пер", "переулок": "пер", "б-р": "б-р", "бул": "б-р", "бульвар": "б-р", "ш": "ш", "шоссе": "ш",
+    "наб": "наб", "набережная": "наб", "пл": "пл", "площадь": "пл", "пр-д": "проезд", "проезд": "проезд",
+    "туп": "туп", "тупик": "туп", "ал": "ал", "аллея": "ал", "мкр": "мкр", "мкрн": "мкр", "микрорайон": "мкр",
+    "кв-л": "кв-л", "квартал": "кв-л",
+}
+_SEPARATOR_RE = re.compile(r"[^\w\-/]+", re.UNICODE)
+_HAS_DIGIT_RE = re.compile(r"\d")
+_ORDINAL_RE = re.compile(r"\d+-?(?:я|й|е|го|ая|ий|ой|ый)$")
+
+
+def _tokenize(part: str) -> List[str]:
+    part = part.lower().replace("ё", "е")
+    return [token.strip("-") for token in _SEPARATOR_RE.split(part) if token.strip("-")]
+
+
+def _add_house(house: str, tokens: List[str]) -> str:
+    marker = ""
+    for token in tokens:
+        if token in _HOUSE_MARKERS:
+            marker = _HOUSE_MARKERS[token]
+            continue
+        value = f"{marker}{token}"
+        # Части "1, 2" не должны склеиваться в "12"
+        if house and house[-1].isdigit() and value[0].isdigit():
+            house += " "
+        house += value
+        marker = ""
+    return house
+
+
+def address_key(address: Optional[str]) -> str:
+    """Канонический ключ адреса: "город|тип улицы название|номер дома"."""
+    city = ""
+    street_type = ""
+    street_words: List[str] = []
+    house = ""
+    parts = [p for p in (address or "").split(",") if p.strip()]
+    for index, part in enumerate(parts):
+        tokens = _tokenize(part)
+        if not tokens:
+            continue
+        if any(token in _CITY_MARKERS for token in tokens):
+            city = " ".join(t for t in tokens if t not in _CITY_MARKERS)
+            continue
+        part_street_type = next((_STREET_TYPES[t] for t in tokens if t in _STREET_TYPES), "")
+        if part_street_type:
+            street_type = part_street_type
+            # Номер дома в той же части: "ул. Ленина 10"
+            words: List[str] = []
+            after_type = False
+            for position, token in enumerate(tokens):
+                if token in _STREET_TYPES:
+                    after_type = True
+                    continue
+                is_house = token in _HOUSE_MARKERS or (_HAS_DIGIT_RE.match(token) and not _ORDINAL_RE.match(token))
+                if after_type and words and is_house:
+                    house = _add_house(house, tokens[position:])
+                    break
+                words.append(token)
+            street_words.extend(words)
+            continue
+        if tokens[0] in _HOUSE_MARKERS or _HAS_DIGIT_RE.match(tokens[0]):
+            house = _add_house(house, tokens)
+            continue
+        if index == 0 and not city and len(parts) > 1:
+            city = " ".join(tokens)
+        else:
+            street_words.extend(tokens)
+    street = f"{street_type} {' '.join(street_words)}".strip()
+    return "|".join((city, street, house))
+
+
+def upgrade() -> None:
+    op.add_column('houses', sa.Column('address_key', sa.String(length=500), nullable=True))
+
+    # Заполняем ключи батчами (нормализация реализована в Python, см. address_key выше)
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, address FROM houses WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(
+            sa.text("UPDATE houses SET address_key = :key WHERE id = :id"),
+            [{"id": row.id, "key": address_key(row.address)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    # Дубли: для каждого ключа оставляем дом с минимальным id
+    op.execute("""
+        CREATE TEMP TABLE house_dedup ON COMMIT DROP AS
+        SELECT id, keep_id FROM (
+            SELECT id, min(id) OVER (PARTITION BY address_key) AS keep_id FROM houses
+        ) t
+        WHERE id <> keep_id
+    """)
+    op.execute("""
+        UPDATE houses h
+        SET floors = COALESCE(h.floors, d.floors),
+            apartments_count = COALESCE(h.apartments_count, d.apartments_count)
+        FROM (
+            SELECT hd.keep_id, max(x.floors) AS floors, max(x.apartments_count) AS apartments_count
+            FROM house_dedup hd JOIN houses x ON x.id = hd.id
+            GROUP BY hd.keep_id
+        ) d
+        WHERE h.id = d.keep_id
+    """)
+    # Привязки, которые после переноса нарушили бы uq_house_housing_complex
+    op.execute("""
+        DELETE FROM bindings b
+        USING (
+            SELECT b2.id, row_number() OVER (
+                PARTITION BY COALESCE(hd.keep_id, b2.house_id), b2.housing_complex_id
+                ORDER BY (hd.id IS NOT NULL), b2.id
+            ) AS rn
+            FROM bindings b2
+            LEFT JOIN house_dedup hd ON hd.id = b2.house_id
+        ) r
+        WHERE b.id = r.id AND r.rn > 1
+    """)
+    op.execute("""
+        UPDATE bindings b SET house_id = hd.keep_id
+        FROM house_dedup hd
+        WHERE b.house_id = hd.id
+    """)
+    op.execute("DELETE FROM houses h USING house_dedup hd WHERE h.id = hd.id")
+
+    op.alter_column('houses', 'address_key', nullable=False)
+    op.create_index('ix_houses_address_key', 'houses', ['address_key'], unique=True)
+    op.drop_index('idx_house_address', table_name='houses')
+    op.drop_index('ix_houses_address', table_name='houses')
+
+
+def downgrade() -> None:
+    op.create_index('ix_houses_address', 'houses', ['address'], unique=True)
+    op.create_index('idx_house_address', 'houses', ['address'])
+    op.drop_index('ix_houses_address_key', table_name='houses')
+    op.drop_column('houses', 'address_key')
@@ -0,0 +1,51 @@
+"""Удаление избыточных индексов и покрывающий индекс для списка привязок
+
+Revision ID: 0003_dedup_indexes
+Revises: 0002_house_address_key
+Create Date: 2026-10-19 12:00:00
+
+Удаляются индексы, дублирующие другие:
+- ix_<table>_id - дублируют первичные ключи
+- idx_housing_complex_data_hash - дублирует ix_housing_complexes_data_hash
+- idx_binding_house - house_id уже ведущая колонка uq_house_housing_complex
+
+idx_binding_housing_complex заменяется покрывающим индексом
+(housing_complex_id, id) INCLUDE (house_id, created_at) для GET /bindings?housing_complex_id=.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_dedup_indexes'
+down_revision = '0002_house_address_key'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_housing_complexes_id', table_name='housing_complexes')
+    op.drop_index('ix_houses_id', table_name='houses')
+    op.drop_index('ix_bindings_id', table_name='bindings')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('idx_housing_complex_data_hash', table_name='housing_complexes')
+    op.drop_index('idx_binding_house', table_name='bindings')
+
+    op.create_index(
+        'idx_binding_housing_complex_id',
+        'bindings',
+        ['housing_complex_id', 'id'],
+        postgresql_include=['house_id', 'created_at'],
+    )
+    op.drop_index('idx_binding_housing_complex', table_name='bindings')
+
+
+def downgrade() -> None:
+    op.create_index('idx_binding_housing_complex', 'bindings', ['housing_complex_id'])
+    op.drop_index('idx_binding_housing_complex_id', table_name='bindings')
+
+    op.create_index('idx_binding_house', 'bindings', ['house_id'])
+    op.create_index('idx_housing_complex_data_hash', 'housing_complexes', ['data_hash'])
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_bindings_id', 'bindings', ['id'])
+    op.create_index('ix_houses_id', 'houses', ['id'])
+    op.create_index('ix_housing_complexes_id', 'housing_complexes', ['id'])
@@ -0,0 +1,41 @@
+"""Таблица запусков актуализации refresh_runs
+
+Revision ID: 0004_refresh_runs
+Revises: 0003_dedup_indexes
+Create Date: 2026-10-19 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_refresh_runs'
+down_revision = '0003_dedup_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'refresh_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, comment='running / success / failed'),
+        sa.Column('city', sa.String(length=200), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('duration_seconds', sa.Float(), nullable=True),
+        sa.Column('fetched_count', sa.Integer(), nullable=False, comment='ЖК получено из источника'),
+        sa.Column('added_count', sa.Integer(), nullable=False),
+        sa.Column('updated_count', sa.Integer(), nullable=False),
+        sa.Column('unchanged_count', sa.Integer(), nullable=False),
+        sa.Column('stages', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_refresh_runs_started_at', 'refresh_runs', ['started_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_refresh_runs_started_at', table_name='refresh_runs')
+    op.drop_table('refresh_runs')
@@ -0,0 +1,35 @@
+"""Контрольные точки запусков актуализации
+
+Revision ID: 0005_refresh_run_checkpoints
+Revises: 0004_refresh_runs
+Create Date: 2026-10-19 14:00:00
+
+Запуск сохраняет offset следующей страницы источника вместе с данными каждой
+страницы; прерванный запуск продолжается с этого offset (resumed_from_id).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_refresh_run_checkpoints'
+down_revision = '0004_refresh_runs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_runs', sa.Column('next_offset', sa.Integer(), nullable=True))
+    op.add_column('refresh_runs', sa.Column('checkpointed_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('refresh_runs', sa.Column('resumed_from_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_refresh_runs_resumed_from_id', 'refresh_runs', 'refresh_runs',
+        ['resumed_from_id'], ['id'], ondelete='SET NULL',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_refresh_runs_resumed_from_id', 'refresh_runs', type_='foreignkey')
+    op.drop_column('refresh_runs', 'resumed_from_id')
+    op.drop_column('refresh_runs', 'checkpointed_at')
+    op.drop_column('refresh_runs', 'next_offset')
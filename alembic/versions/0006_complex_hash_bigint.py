@@ -0,0 +1,83 @@
+"""Статус и координаты ЖК, 64-битный хэш данных
+
+Revision ID: 0006_complex_hash_bigint
+Revises: 0005_refresh_run_checkpoints
+Create Date: 2026-10-19 15:00:00
+
+- Добавляет housing_complexes.status, latitude, longitude
+- data_hash: SHA-256 hex (VARCHAR(64)) → BLAKE2b 8 байт (BIGINT), индекс
+  становится в несколько раз меньше
+- Пересчитывает хэши существующих ЖК батчами (app.utils.hashing); статус
+  и координаты заполнятся при следующей актуализации
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.hashing import calculate_data_hash
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_complex_hash_bigint'
+down_revision = '0005_refresh_run_checkpoints'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    op.add_column('housing_complexes', sa.Column('status', sa.String(length=100), nullable=True))
+    op.add_column('housing_complexes', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('housing_complexes', sa.Column('longitude', sa.Float(), nullable=True))
+    # Значения пересчитываются ниже; индекс перестраивается при смене типа
+    op.alter_column(
+        'housing_complexes', 'data_hash',
+        type_=sa.BigInteger(), existing_type=sa.String(length=64),
+        existing_nullable=False, postgresql_using='0',
+    )
+
+    # Пересчитываем хэши батчами: одно UPDATE ... FROM unnest() на батч
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, name, address, developer FROM housing_complexes "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(
+            sa.text("""
+                UPDATE housing_complexes hc SET data_hash = v.data_hash
+                FROM unnest(CAST(:ids AS integer[]), CAST(:hashes AS bigint[])) AS v(id, data_hash)
+                WHERE hc.id = v.id
+            """),
+            {
+                "ids": [row.id for row in rows],
+                # Описание в хэш не входит (как при актуализации)
+                "hashes": [
+                    calculate_data_hash(row.name, row.address, developer=row.developer)
+                    for row in rows
+                ],
+            },
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    # Прежний формат (SHA-256 от "name|address|description|developer") считается в SQL
+    op.alter_column(
+        'housing_complexes', 'data_hash',
+        type_=sa.String(length=64), existing_type=sa.BigInteger(),
+        existing_nullable=False,
+        postgresql_using=(
+            "encode(sha256(convert_to(name || '|' || COALESCE(address, '') || '|' || "
+            "COALESCE(description, '') || '|' || COALESCE(developer, ''), 'UTF8')), 'hex')"
+        ),
+    )
+    op.drop_column('housing_complexes', 'longitude')
+    op.drop_column('housing_complexes', 'latitude')
+    op.drop_column('housing_complexes', 'status')
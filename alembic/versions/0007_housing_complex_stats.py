@@ -0,0 +1,165 @@
+"""Агрегированная статистика ЖК, поддерживаемая триггерами
+
+Revision ID: 0007_housing_complex_stats
+Revises: 0006_complex_hash_bigint
+Create Date: 2026-10-19 16:00:00
+
+- Таблица housing_complex_stats: число привязанных домов, сумма квартир
+  и максимальная этажность по каждому ЖК
+- Триггеры на bindings (уровня оператора, с таблицами переходов) и houses
+  обновляют счётчики инкрементально в той же транзакции: вставка/удаление
+  пачки привязок - одно обновление на затронутый ЖК. Максимальная этажность
+  пересчитывается по привязкам ЖК, только если уходит дом с максимальной этажностью
+- Заполняет статистику по существующим привязкам
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_housing_complex_stats'
+down_revision = '0006_complex_hash_bigint'
+branch_labels = None
+depends_on = None
+
+# Максимальная этажность привязанных к ЖК домов (для пересчёта при уходе максимума)
+MAX_FLOORS_SQL = """
+    SELECT max(h.floors) FROM bindings b JOIN houses h ON h.id = b.house_id
+    WHERE b.housing_complex_id = s.housing_complex_id
+"""
+
+BINDINGS_FUNCTION = f"""
+CREATE FUNCTION housing_complex_stats_bindings() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        -- Дом удалённой привязки может быть уже удалён (каскад из houses): его вклад
+        -- вычитает триггер на houses, здесь вычитается только число привязок
+        WITH removed AS (
+            SELECT b.housing_complex_id,
+                   count(*) AS bindings_count,
+                   COALESCE(sum(h.apartments_count), 0) AS apartments_total,
+                   max(h.floors) AS max_floors
+            FROM old_rows b LEFT JOIN houses h ON h.id = b.house_id
+            GROUP BY b.housing_complex_id
+        )
+        UPDATE housing_complex_stats s SET
+            bindings_count = s.bindings_count - r.bindings_count,
+            apartments_total = s.apartments_total - r.apartments_total,
+            max_floors = CASE
+                WHEN r.max_floors IS NULL OR r.max_floors < s.max_floors THEN s.max_floors
+                ELSE ({MAX_FLOORS_SQL})
+            END,
+            updated_at = now()
+        FROM removed r
+        WHERE s.housing_complex_id = r.housing_complex_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO housing_complex_stats AS s
+            (housing_complex_id, bindings_count, apartments_total, max_floors, updated_at)
+        SELECT b.housing_complex_id, count(*), COALESCE(sum(h.apartments_count), 0), max(h.floors), now()
+        FROM new_rows b JOIN houses h ON h.id = b.house_id
+        GROUP BY b.housing_complex_id
+        ON CONFLICT (housing_complex_id) DO UPDATE SET
+            bindings_count = s.bindings_count + EXCLUDED.bindings_count,
+            apartments_total = s.apartments_total + EXCLUDED.apartments_total,
+            max_floors = GREATEST(s.max_floors, EXCLUDED.max_floors),
+            updated_at = EXCLUDED.updated_at;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+HOUSES_FUNCTION = f"""
+CREATE FUNCTION housing_complex_stats_houses() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        -- BEFORE DELETE: привязки дома ещё на месте, максимум считается без этого дома
+        UPDATE housing_complex_stats s SET
+            apartments_total = s.apartments_total - COALESCE(OLD.apartments_count, 0),
+            max_floors = CASE
+                WHEN OLD.floors IS NULL OR OLD.floors < s.max_floors THEN s.max_floors
+                ELSE ({MAX_FLOORS_SQL} AND h.id <> OLD.id)
+            END,
+            updated_at = now()
+        WHERE s.housing_complex_id IN (SELECT housing_complex_id FROM bindings WHERE house_id = OLD.id);
+        RETURN OLD;
+    END IF;
+    UPDATE housing_complex_stats s SET
+        apartments_total = s.apartments_total
+            - COALESCE(OLD.apartments_count, 0) + COALESCE(NEW.apartments_count, 0),
+        max_floors = CASE
+            WHEN OLD.floors IS NOT DISTINCT FROM NEW.floors THEN s.max_floors
+            WHEN OLD.floors IS NULL OR OLD.floors < s.max_floors THEN GREATEST(s.max_floors, NEW.floors)
+            ELSE ({MAX_FLOORS_SQL})
+        END,
+        updated_at = now()
+    WHERE s.housing_complex_id IN (SELECT housing_complex_id FROM bindings WHERE house_id = NEW.id);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = (
+    """
+    CREATE TRIGGER trg_bindings_stats_insert AFTER INSERT ON bindings
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION housing_complex_stats_bindings()
+    """,
+    """
+    CREATE TRIGGER trg_bindings_stats_delete AFTER DELETE ON bindings
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION housing_complex_stats_bindings()
+    """,
+    """
+    CREATE TRIGGER trg_bindings_stats_update AFTER UPDATE ON bindings
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION housing_complex_stats_bindings()
+    """,
+    """
+    CREATE TRIGGER trg_houses_stats_update AFTER UPDATE OF floors, apartments_count ON houses
+    FOR EACH ROW
+    WHEN (OLD.floors IS DISTINCT FROM NEW.floors OR OLD.apartments_count IS DISTINCT FROM NEW.apartments_count)
+    EXECUTE FUNCTION housing_complex_stats_houses()
+    """,
+    """
+    CREATE TRIGGER trg_houses_stats_delete BEFORE DELETE ON houses
+    FOR EACH ROW EXECUTE FUNCTION housing_complex_stats_houses()
+    """,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'housing_complex_stats',
+        sa.Column('housing_complex_id', sa.Integer(), nullable=False),
+        sa.Column('bindings_count', sa.Integer(), nullable=False, server_default='0', comment='Привязанных домов'),
+        sa.Column('apartments_total', sa.BigInteger(), nullable=False, server_default='0', comment='Сумма квартир привязанных домов'),
+        sa.Column('max_floors', sa.Integer(), nullable=True, comment='Максимальная этажность привязанных домов'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['housing_complex_id'], ['housing_complexes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('housing_complex_id'),
+    )
+    op.execute(BINDINGS_FUNCTION)
+    op.execute(HOUSES_FUNCTION)
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+
+    # Статистика по существующим привязкам одним запросом
+    op.execute("""
+        INSERT INTO housing_complex_stats (housing_complex_id, bindings_count, apartments_total, max_floors)
+        SELECT b.housing_complex_id, count(*), COALESCE(sum(h.apartments_count), 0), max(h.floors)
+        FROM bindings b JOIN houses h ON h.id = b.house_id
+        GROUP BY b.housing_complex_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER trg_houses_stats_delete ON houses")
+    op.execute("DROP TRIGGER trg_houses_stats_update ON houses")
+    op.execute("DROP TRIGGER trg_bindings_stats_update ON bindings")
+    op.execute("DROP TRIGGER trg_bindings_stats_delete ON bindings")
+    op.execute("DROP TRIGGER trg_bindings_stats_insert ON bindings")
+    op.execute("DROP FUNCTION housing_complex_stats_houses()")
+    op.execute("DROP FUNCTION housing_complex_stats_bindings()")
+    op.drop_table('housing_complex_stats')
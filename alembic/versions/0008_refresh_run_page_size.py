@@ -0,0 +1,26 @@
+"""Размер страницы API в запусках актуализации
+
+Revision ID: 0008_refresh_run_page_size
+Revises: 0007_housing_complex_stats
+Create Date: 2026-10-19 17:00:00
+
+Запуск сохраняет размер страницы, до которого он подстроился
+(PARSER_ADAPTIVE_PAGE_SIZE); следующий запуск города начинает с него.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_refresh_run_page_size'
+down_revision = '0007_housing_complex_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_runs', sa.Column('page_size', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('refresh_runs', 'page_size')
@@ -0,0 +1,37 @@
+"""Отметки об обработке страниц API в БД
+
+Revision ID: 0009_processed_pages
+Revises: 0008_refresh_run_page_size
+Create Date: 2026-10-20 10:00:00
+
+Отметка "страница с этим хэшем уже записана" раньше хранилась в кэше ответов
+на диске и не была связана с БД: после восстановления или пересоздания БД
+неизменившиеся страницы пропускались, и ЖК не записывались. Отметки из кэша
+не переносятся: первый запуск после миграции обрабатывает все страницы.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_processed_pages'
+down_revision = '0008_refresh_run_page_size'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'processed_pages',
+        sa.Column('cache_key', sa.String(length=32), nullable=False, comment='Ключ страницы в кэше ответов'),
+        sa.Column('content_hash', sa.String(length=32), nullable=False),
+        sa.Column('processing_version', sa.Integer(), nullable=False),
+        sa.Column('records', sa.Integer(), nullable=False, comment='Записей на странице до фильтрации'),
+        sa.Column('complexes', sa.Integer(), nullable=False, comment='ЖК города на странице'),
+        sa.Column('processed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('cache_key'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('processed_pages')
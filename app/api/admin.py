@@ -0,0 +1,86 @@
+"""API роуты администрирования."""
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.database import get_db, replica_router
+from app.models.refresh_run import RefreshRun
+from app.schemas.profiling import ProfilingUpdate, ProfilingStateResponse
+from app.schemas.refresh_run import RefreshRunListResponse
+from app.schemas.replica import ReplicaListResponse, ReplicaStatus
+from app.services.auth import get_current_user
+from app.utils import profiling
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/refresh-runs", response_model=RefreshRunListResponse)
+async def get_refresh_runs(
+    skip: int = Query(0, ge=0, description="Пропустить записей"),
+    limit: int = Query(20, ge=1, le=100, description="Лимит записей"),
+    status: str = Query(None, description="Фильтр по статусу (running / success / partial / failed)"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Получить отчёты о запусках актуализации (новые первыми).
+    
+    Каждый отчёт содержит счётчики записей и тайминги этапов: запуск браузера,
+    ожидание антибота, загрузка страниц, извлечение JSON, фильтрация по городу,
+    маппинг и валидация DTO, хэширование, сравнение с БД и запись, коммиты.
+    """
+    db_query = db.query(RefreshRun)
+    if status is not None:
+        db_query = db_query.filter(RefreshRun.status == status)
+    
+    total = db_query.count()
+    runs = db_query.order_by(RefreshRun.id.desc()).offset(skip).limit(limit).all()
+    
+    return RefreshRunListResponse(items=runs, total=total)
+
+
+@router.get("/profiling", response_model=ProfilingStateResponse)
+async def get_profiling_state(current_user: dict = Depends(get_current_user)):
+    """Получить настройки профилирования и список последних артефактов."""
+    return ProfilingStateResponse(**profiling.state.as_dict(), artifacts=profiling.list_artifacts())
+
+
+@router.post("/profiling", response_model=ProfilingStateResponse)
+async def update_profiling_state(
+    update: ProfilingUpdate,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Изменить настройки профилирования процесса.
+    
+    - updater_runs: профилировать N ближайших запусков актуализации
+    - profile_all_updater_runs: профилировать каждый запуск
+    - api_sample_rate: доля профилируемых API запросов (0 - выключено)
+    
+    Артефакты (.pstats, .collapsed, .alloc.txt) пишутся в PROFILING_DIR.
+    """
+    if update.updater_runs is not None:
+        profiling.state.updater_runs_requested = update.updater_runs
+    if update.profile_all_updater_runs is not None:
+        profiling.state.profile_all_updater_runs = update.profile_all_updater_runs
+    if update.api_sample_rate is not None:
+        profiling.state.api_sample_rate = update.api_sample_rate
+    return ProfilingStateResponse(**profiling.state.as_dict(), artifacts=profiling.list_artifacts())
+
+
+@router.get("/replicas", response_model=ReplicaListResponse)
+async def get_replicas(current_user: dict = Depends(get_current_user)):
+    """Получить состояние реплик для чтения (DATABASE_REPLICA_URLS) по последней проверке отставания."""
+    items = [
+        ReplicaStatus(
+            name=replica.name,
+            healthy=replica.healthy,
+            lag_seconds=replica.lag,
+            checked_at=(
+                datetime.fromtimestamp(replica.checked_at, tz=timezone.utc)
+                if replica.checked_at is not None else None
+            ),
+        )
+        for replica in replica_router.replicas
+    ]
+    return ReplicaListResponse(items=items, max_lag_seconds=get_settings().DATABASE_REPLICA_MAX_LAG_SECONDS)
@@ -1,15 +1,130 @@
 """API роуты для привязок домов к ЖК."""
-from typing import List
+from typing import List, Optional, Sequence
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Integer, any_, bindparam, delete, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_db, get_read_db
 from app.models.housing_complex import HousingComplex
 from app.models.house import House
 from app.models.binding import Binding
-from app.schemas.binding import BindingCreate, BindingResponse, BindingListResponse
+from app.schemas.binding import (
+    BindingCreate,
+    BindingResponse,
+    BindingListResponse,
+    BindingBatchGetResponse,
+    BindingBulkDeleteRequest,
+    BindingBulkDeleteResponse,
+    BindingSuggestRequest,
+    BindingSuggestResponse,
+    BindingSuggestion,
+    ComplexCandidate,
+)
+from app.schemas.batch import BatchGetRequest
 from app.services.auth import get_current_user
+from app.services.matcher import get_matcher
+from app.utils.address import address_key
+from app.utils.projection import Projection
 
 router = APIRouter(prefix="/bindings", tags=["bindings"])
+settings = get_settings()
+
+# Поля ответа привязки и их колонки: привязка, дом и ЖК одним запросом, без ORM объектов
+BINDING_PROJECTION = Projection({
+    "house_id": Binding.house_id,
+    "housing_complex_id": Binding.housing_complex_id,
+    "id": Binding.id,
+    "created_at": Binding.created_at,
+    "house.address": House.address,
+    "house.floors": House.floors,
+    "house.apartments_count": House.apartments_count,
+    "house.id": Binding.house_id,
+    "housing_complex.name": HousingComplex.name,
+    "housing_complex.address": HousingComplex.address,
+    "housing_complex.description": HousingComplex.description,
+    "housing_complex.developer": HousingComplex.developer,
+    "housing_complex.status": HousingComplex.status,
+    "housing_complex.latitude": HousingComplex.latitude,
+    "housing_complex.longitude": HousingComplex.longitude,
+    "housing_complex.id": Binding.housing_complex_id,
+    "housing_complex.source_url": HousingComplex.source_url,
+    "housing_complex.created_at": HousingComplex.created_at,
+    "housing_complex.updated_at": HousingComplex.updated_at,
+})
+BINDING_COLUMNS = tuple(BINDING_PROJECTION.columns)
+
+FIELDS_DESCRIPTION = (
+    "Поля ответа через запятую (например, id,house_id,housing_complex.name; "
+    "house - все поля дома). По умолчанию все; id возвращается всегда"
+)
+
+
+def binding_row_to_dict(row: Sequence) -> dict:
+    """Строка BINDING_COLUMNS → словарь в формате BindingResponse."""
+    return BINDING_PROJECTION.to_dict(row)
+
+
+def get_projection(projection: Projection, fields: Optional[str]) -> Projection:
+    """Запрошенные поля ответа (400 при неизвестных полях)."""
+    try:
+        return projection.select(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def query_bindings(db: Session, projection: Projection):
+    """Запрос привязок с колонками projection (дом и ЖК присоединяются, только если нужны их поля)."""
+    db_query = db.query(*projection.columns).select_from(Binding)
+    tables = projection.tables()
+    if House.__table__ in tables:
+        db_query = db_query.join(House, House.id == Binding.house_id)
+    if HousingComplex.__table__ in tables:
+        db_query = db_query.join(HousingComplex, HousingComplex.id == Binding.housing_complex_id)
+    return db_query
+
+
+def id_filter(column, name: str, ids: Sequence[int]):
+    """Условие column = ANY(:name) для списка ID."""
+    return column == any_(bindparam(name, list(ids), type_=ARRAY(Integer)))
+
+
+def bulk_delete_bindings(db: Session, filters: list, dry_run: bool) -> dict:
+    """
+    Удалить привязки по условиям одним оператором DELETE ... RETURNING id.
+    
+    За запрос удаляется не больше BINDINGS_BULK_DELETE_MAX_ROWS привязок (с меньшими ID);
+    has_more показывает, что подходящие привязки остались. При dry_run привязки только
+    считаются. Статистику ЖК обновляют триггеры БД одним обновлением на ЖК.
+    """
+    if not filters:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Укажите хотя бы одно условие удаления"
+        )
+    max_rows = settings.BINDINGS_BULK_DELETE_MAX_ROWS
+    
+    if dry_run:
+        matched = db.query(Binding).filter(*filters).count()
+        return {"dry_run": True, "matched": matched, "deleted": 0, "ids": [], "has_more": matched > max_rows}
+    
+    targets = select(Binding.id).where(*filters).order_by(Binding.id).limit(max_rows)
+    deleted_ids = db.execute(
+        delete(Binding).where(Binding.id.in_(targets)).returning(Binding.id),
+        execution_options={"synchronize_session": False},
+    ).scalars().all()
+    has_more = len(deleted_ids) == max_rows and db.query(Binding.id).filter(*filters).first() is not None
+    db.commit()
+    
+    return {
+        "dry_run": False,
+        "matched": None,
+        "deleted": len(deleted_ids),
+        "ids": sorted(deleted_ids),
+        "has_more": has_more,
+    }
 
 
 @router.post("", response_model=BindingResponse, status_code=status.HTTP_201_CREATED)
@@ -22,7 +137,8 @@ async def create_binding(
     Создать привязку дома к ЖК.
     
     Автоматически создает дом, если его еще нет (по адресу).
-    Если дом с таким адресом уже существует, использует его.
+    Если дом с таким адресом уже существует, использует его. Адреса сравниваются
+    по нормализованному ключу, поэтому разные написания одного адреса дают один дом.
     
     Проверяет:
     - Существование ЖК
@@ -38,8 +154,8 @@ async def create_binding(
             detail=f"ЖК с ID {binding.housing_complex_id} не найден"
         )
     
-    # Ищем или создаем дом по адресу
-    house = db.query(House).filter(House.address == binding.address).first()
+    # Ищем или создаем дом по нормализованному адресу
+    house = db.query(House).filter(House.address_key == address_key(binding.address)).first()
     
     if not house:
         # Создаем новый дом
@@ -89,29 +205,143 @@ async def get_bindings(
     limit: int = Query(100, ge=1, le=1000, description="Лимит записей"),
     house_id: int = Query(None, description="Фильтр по ID дома"),
     housing_complex_id: int = Query(None, description="Фильтр по ID ЖК"),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_read_db),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Получить список привязок.
     
     Поддерживает фильтрацию по house_id и housing_complex_id.
-    """
-    db_query = db.query(Binding)
     
-    # Применяем фильтры
+    Привязки с домом и ЖК выбираются одним запросом в виде строк и сериализуются
+    через orjson напрямую, без ORM объектов и валидации Pydantic (формат ответа
+    соответствует BindingListResponse). С fields запрос выбирает только колонки
+    запрошенных полей, а дом и ЖК присоединяются, только если нужны их поля.
+    """
+    projection = get_projection(BINDING_PROJECTION, fields)
+    filters = []
     if house_id is not None:
-        db_query = db_query.filter(Binding.house_id == house_id)
+        filters.append(Binding.house_id == house_id)
     if housing_complex_id is not None:
-        db_query = db_query.filter(Binding.housing_complex_id == housing_complex_id)
+        filters.append(Binding.housing_complex_id == housing_complex_id)
     
     # Подсчитываем общее количество
-    total = db_query.count()
+    total = db.query(Binding).filter(*filters).count()
+    
+    # Получаем данные с пагинацией (стабильный порядок по id обслуживается индексами)
+    rows = (
+        query_bindings(db, projection)
+        .filter(*filters)
+        .order_by(Binding.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    
+    return ORJSONResponse({"items": [projection.to_dict(row) for row in rows], "total": total})
+
+
+@router.post(":batchGet", response_model=BindingBatchGetResponse)
+async def batch_get_bindings(
+    request: BatchGetRequest,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Получить привязки по списку ID одним запросом (WHERE id = ANY(:ids)).
+    
+    Возвращает найденные привязки в порядке запроса (повторы ID схлопываются)
+    и список ID, для которых привязки не найдены. Поддерживает fields.
+    """
+    projection = get_projection(BINDING_PROJECTION, fields)
+    ids = list(dict.fromkeys(request.ids))
+    rows = (
+        query_bindings(db, projection)
+        .filter(id_filter(Binding.id, "ids", ids))
+        .all()
+    )
+    found = {item["id"]: item for item in map(projection.to_dict, rows)}
+    return ORJSONResponse({
+        "items": [found[binding_id] for binding_id in ids if binding_id in found],
+        "not_found": [binding_id for binding_id in ids if binding_id not in found],
+    })
+
+
+@router.post("/suggestions", response_model=BindingSuggestResponse)
+async def suggest_bindings(
+    request: BindingSuggestRequest,
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Подобрать ЖК для пачки адресов домов.
+    
+    Адреса нормализуются (регистр, пунктуация, сокращения "ул.", "пр-т", "д." и т.п.),
+    кандидаты ранжируются по похожести улицы. Привязки не создаются.
+    Построение индекса и подбор выполняются в потоке, не блокируя цикл событий.
+    """
+    def suggest() -> List[BindingSuggestion]:
+        matcher = get_matcher(db)
+        return [
+            BindingSuggestion(
+                address=address,
+                address_key=address_key(address),
+                candidates=[
+                    ComplexCandidate(**candidate._asdict())
+                    for candidate in matcher.match(address, limit=request.limit)
+                ],
+            )
+            for address in request.addresses
+        ]
+    
+    return BindingSuggestResponse(items=await asyncio.to_thread(suggest))
+
+
+@router.delete("", response_model=BindingBulkDeleteResponse)
+async def delete_bindings(
+    house_id: int = Query(None, description="Фильтр по ID дома"),
+    housing_complex_id: int = Query(None, description="Фильтр по ID ЖК"),
+    dry_run: bool = Query(False, description="Только посчитать подходящие привязки, не удаляя"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Удалить привязки по фильтру одним запросом (например, все привязки ЖК).
+    
+    Нужен хотя бы один фильтр. За запрос удаляется не больше
+    BINDINGS_BULK_DELETE_MAX_ROWS привязок; при has_more запрос повторяется.
+    """
+    filters = []
+    if house_id is not None:
+        filters.append(Binding.house_id == house_id)
+    if housing_complex_id is not None:
+        filters.append(Binding.housing_complex_id == housing_complex_id)
     
-    # Получаем данные с пагинацией
-    bindings = db_query.offset(skip).limit(limit).all()
+    return ORJSONResponse(bulk_delete_bindings(db, filters, dry_run))
+
+
+@router.post("/bulk-delete", response_model=BindingBulkDeleteResponse)
+async def bulk_delete(
+    request: BindingBulkDeleteRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Удалить привязки по спискам ID привязок, домов и/или ЖК одним запросом.
+    
+    Условия объединяются по И; нужен хотя бы один список. Поддерживает dry_run.
+    """
+    filters = []
+    if request.ids:
+        filters.append(id_filter(Binding.id, "ids", request.ids))
+    if request.house_ids:
+        filters.append(id_filter(Binding.house_id, "house_ids", request.house_ids))
+    if request.housing_complex_ids:
+        filters.append(id_filter(Binding.housing_complex_id, "housing_complex_ids", request.housing_complex_ids))
     
-    return BindingListResponse(items=bindings, total=total)
+    return ORJSONResponse(bulk_delete_bindings(db, filters, request.dry_run))
 
 
 @router.delete("/{binding_id}", status_code=status.HTTP_204_NO_CONTENT)
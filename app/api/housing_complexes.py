@@ -0,0 +1,184 @@
+"""API роуты для чтения жилых комплексов."""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Integer, any_, bindparam, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from app.database import get_read_db
+from app.models.housing_complex import HousingComplex
+from app.models.housing_complex_stats import HousingComplexStats
+from app.schemas.batch import BatchGetRequest
+from app.schemas.housing_complex import (
+    HousingComplexResponse,
+    HousingComplexListResponse,
+    HousingComplexBatchGetResponse,
+    HousingComplexStatsResponse,
+    HousingComplexStatsBatchGetResponse,
+)
+from app.services.auth import get_current_user
+from app.api.bindings import get_projection
+from app.utils.projection import Projection
+
+router = APIRouter(prefix="/housing-complexes", tags=["housing-complexes"])
+
+# Поля ответа ЖК и их колонки
+HOUSING_COMPLEX_PROJECTION = Projection({
+    "name": HousingComplex.name,
+    "address": HousingComplex.address,
+    "description": HousingComplex.description,
+    "developer": HousingComplex.developer,
+    "status": HousingComplex.status,
+    "latitude": HousingComplex.latitude,
+    "longitude": HousingComplex.longitude,
+    "id": HousingComplex.id,
+    "source_url": HousingComplex.source_url,
+    "created_at": HousingComplex.created_at,
+    "updated_at": HousingComplex.updated_at,
+})
+
+# Статистика ЖК; у ЖК без привязок строки статистики может не быть
+STATS_COLUMNS = (
+    HousingComplex.id,
+    func.coalesce(HousingComplexStats.bindings_count, 0),
+    func.coalesce(HousingComplexStats.apartments_total, 0),
+    HousingComplexStats.max_floors,
+)
+
+FIELDS_DESCRIPTION = (
+    "Поля ответа через запятую (например, id,name,address). "
+    "По умолчанию все; id возвращается всегда"
+)
+
+
+def stats_row_to_dict(row) -> dict:
+    """Строка STATS_COLUMNS → словарь в формате HousingComplexStatsResponse."""
+    housing_complex_id, bindings_count, apartments_total, max_floors = row
+    return {
+        "housing_complex_id": housing_complex_id,
+        "bindings_count": bindings_count,
+        "apartments_total": apartments_total,
+        "max_floors": max_floors,
+    }
+
+
+def query_stats(db: Session):
+    """Запрос статистики ЖК (по первичному ключу, без обращения к привязкам)."""
+    return db.query(*STATS_COLUMNS).outerjoin(
+        HousingComplexStats, HousingComplexStats.housing_complex_id == HousingComplex.id
+    )
+
+
+@router.get("", response_model=HousingComplexListResponse)
+async def get_housing_complexes(
+    skip: int = Query(0, ge=0, description="Пропустить записей"),
+    limit: int = Query(100, ge=1, le=1000, description="Лимит записей"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Получить список ЖК (по ID).
+    
+    Выбираются только колонки запрошенных полей (fields), строки сериализуются
+    через orjson напрямую (формат ответа соответствует HousingComplexListResponse).
+    """
+    projection = get_projection(HOUSING_COMPLEX_PROJECTION, fields)
+    total = db.query(HousingComplex).count()
+    rows = (
+        db.query(*projection.columns)
+        .order_by(HousingComplex.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    
+    return ORJSONResponse({"items": [projection.to_dict(row) for row in rows], "total": total})
+
+
+@router.get("/{complex_id}", response_model=HousingComplexResponse)
+async def get_housing_complex(
+    complex_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Получить ЖК по ID (поддерживает fields)."""
+    projection = get_projection(HOUSING_COMPLEX_PROJECTION, fields)
+    row = db.query(*projection.columns).filter(HousingComplex.id == complex_id).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ЖК с ID {complex_id} не найден"
+        )
+    
+    return ORJSONResponse(projection.to_dict(row))
+
+
+@router.post(":batchGet", response_model=HousingComplexBatchGetResponse)
+async def batch_get_housing_complexes(
+    request: BatchGetRequest,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Получить ЖК по списку ID одним запросом (WHERE id = ANY(:ids)).
+    
+    Возвращает найденные ЖК в порядке запроса (повторы ID схлопываются)
+    и список ID, для которых ЖК не найдены. Поддерживает fields.
+    """
+    projection = get_projection(HOUSING_COMPLEX_PROJECTION, fields)
+    ids = list(dict.fromkeys(request.ids))
+    rows = (
+        db.query(*projection.columns)
+        .filter(HousingComplex.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))))
+        .all()
+    )
+    found = {item["id"]: item for item in map(projection.to_dict, rows)}
+    return ORJSONResponse({
+        "items": [found[complex_id] for complex_id in ids if complex_id in found],
+        "not_found": [complex_id for complex_id in ids if complex_id not in found],
+    })
+
+
+@router.get("/{complex_id}/stats", response_model=HousingComplexStatsResponse)
+async def get_housing_complex_stats(
+    complex_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Получить статистику привязок ЖК: число домов, сумму квартир и максимальную этажность.
+    
+    Счётчики поддерживаются триггерами БД при изменении привязок и домов, поэтому
+    запрос читает одну строку независимо от числа привязок.
+    """
+    row = query_stats(db).filter(HousingComplex.id == complex_id).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ЖК с ID {complex_id} не найден"
+        )
+    
+    return ORJSONResponse(stats_row_to_dict(row))
+
+
+@router.post("/stats:batchGet", response_model=HousingComplexStatsBatchGetResponse)
+async def batch_get_housing_complex_stats(
+    request: BatchGetRequest,
+    db: Session = Depends(get_read_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Получить статистику привязок по списку ID ЖК одним запросом (WHERE id = ANY(:ids))."""
+    ids = list(dict.fromkeys(request.ids))
+    rows = (
+        query_stats(db)
+        .filter(HousingComplex.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))))
+        .all()
+    )
+    found = {item["housing_complex_id"]: item for item in map(stats_row_to_dict, rows)}
+    return ORJSONResponse({
+        "items": [found[complex_id] for complex_id in ids if complex_id in found],
+        "not_found": [complex_id for complex_id in ids if complex_id not in found],
+    })
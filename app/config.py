@@ -1,6 +1,20 @@
 """Конфигурация приложения."""
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, List, Optional
+
+
+class RegionConfig(BaseModel):
+    """Регион актуализации (элемент PARSER_REGIONS)."""
+    
+    city: str  # Город для фильтрации по shortAddr
+    interval_hours: float = 3  # Интервал актуализации региона в часах
+    priority: int = 0  # Регионы с большим приоритетом запускаются первыми
+    page_size: Optional[int] = None  # Размер страницы (по умолчанию PARSER_PAGE_SIZE)
+    # Параметры фильтрации на стороне источника (например, {"place": "77"});
+    # регион с ними загружается отдельно, а не из общей выгрузки
+    source_params: Dict[str, str] = {}
 
 
 class Settings(BaseSettings):
@@ -8,6 +22,10 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "postgresql://postgres:postgres@db:5432/housing_db"
+    # Реплики для GET эндпоинтов (URL через запятую, пусто - всё читается с основной БД)
+    DATABASE_REPLICA_URLS: str = ""
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0  # Реплика с большим отставанием исключается
+    DATABASE_REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0  # Интервал проверки отставания реплик
     
     # JWT
     SECRET_KEY: str = "secret-key"
@@ -20,10 +38,76 @@ class Settings(BaseSettings):
     PARSER_HEADLESS: bool = True  # Запуск браузера в headless режиме
     PARSER_BROWSER_TIMEOUT: int = 30000  # Таймаут для ожидания элементов (мс)
     PARSER_PAGE_SIZE: int = 1000  # Размер страницы для пагинации (количество записей за один запрос)
+    # Подстройка размера страницы по ходу запуска (AIMD): растёт, пока уменьшается время на запись,
+    # уменьшается вдвое при таймаутах и ошибках; выбранный размер - начальный для следующего запуска города.
+    # Выключена по умолчанию: при смене размера сдвигаются границы страниц, и кэш ответов API
+    # (пропуск неизменившихся страниц по offset/limit) перестаёт срабатывать
+    PARSER_ADAPTIVE_PAGE_SIZE: bool = False
+    PARSER_PAGE_SIZE_MIN: int = 100  # Нижняя граница размера страницы
+    PARSER_PAGE_SIZE_MAX: int = 5000  # Верхняя граница размера страницы
+    PARSER_PAGE_SIZE_STEP: int = 250  # Шаг увеличения размера страницы (размер всегда кратен шагу)
+    PARSER_PAGE_MAX_RESPONSE_MB: float = 20.0  # Размер страницы ограничивается объёмом ответа (0 = без ограничения)
     PARSER_MAX_RESULTS: int = 1500  # Максимальное количество результатов (0 = без лимита, загружать все)
+    # Регионы актуализации (JSON список RegionConfig); пусто = один регион PARSER_CITY
+    # с интервалом PARSER_SCHEDULER_HOURS
+    PARSER_REGIONS: List[RegionConfig] = []
+    PARSER_SCHEDULER_TICK_MINUTES: int = 10  # Как часто планировщик проверяет, какие регионы пора обновить
+    # Повтор региона после неудачного запуска: задержка удваивается с каждой неудачей подряд,
+    # но не превышает интервал региона
+    PARSER_REGION_RETRY_MINUTES: float = 15.0
+    PARSER_MAX_CONCURRENCY: int = 2  # Общий бюджет: одновременных браузеров/запросов к источнику
+    PARSER_FANOUT: bool = True  # Загружать источник один раз и распределять по регионам
+    PARSER_LISTING_TTL_MINUTES: int = 60  # Сколько переиспользовать общую выгрузку источника
+    # Ограничение частоты запросов к API источника (адаптивное, запросов/с)
+    PARSER_RATE_LIMIT: float = 0.5  # Начальная скорость
+    PARSER_RATE_LIMIT_MIN: float = 0.05  # Нижняя граница при замедлении (429/5xx/антибот)
+    PARSER_RATE_LIMIT_MAX: float = 2.0  # Верхняя граница при ускорении
+    PARSER_RATE_BURST: int = 2  # Запросов подряд без ожидания
+    PARSER_RETRY_ATTEMPTS: int = 5  # Попыток загрузки одной страницы
+    PARSER_RETRY_BASE_DELAY: float = 2.0  # Базовая задержка экспоненциального backoff (с)
+    PARSER_RETRY_MAX_DELAY: float = 60.0  # Максимальная задержка между попытками (с)
+    PARSER_MAX_FAILED_PAGES: int = 3  # Подряд незагруженных страниц, после которых загрузка прекращается
+    PARSER_RESUME_WINDOW_MINUTES: int = 360  # Продолжать прерванный запуск не старше N минут (0 = не продолжать)
+    PARSER_PAGE_CACHE_DIR: str = "page_cache"  # Каталог кэша сырых ответов API
+    PARSER_PAGE_CACHE_MAX_MB: int = 512  # Лимит размера кэша ответов (0 = кэш выключен)
+    PARSER_DETAILS: bool = True  # Загружать описания новых и изменившихся ЖК из API деталей
+    PARSER_DETAIL_CONCURRENCY: int = 4  # Одновременных запросов деталей
+    PARSER_DETAIL_CACHE_SIZE: int = 50000  # Описаний в кэше (hobjId, data_hash) в памяти процесса
+    # Прохождение антибота: браузер загружает только документы, скрипты и XHR/fetch с разрешённых доменов
+    # (картинки, шрифты, стили, тайлы карт и аналитика отклоняются), готовность - по cookie проверки
+    PARSER_BLOCK_RESOURCES: bool = True
+    PARSER_ALLOWED_DOMAINS: str = "xn--80az8a.xn--d1aqf.xn--p1ai,servicepipe.ru"  # Домены и их поддомены
+    # Cookie, которые антибот (ServicePipe) выставляет после проверки; пусто - фиксированная пауза.
+    # Если они не появляются, каждая проверка ждёт не дольше, чем фиксированная пауза
+    PARSER_ANTIBOT_COOKIES: str = "spid,spsc"
+    PARSER_ANTIBOT_TIMEOUT: float = 6.0  # Максимальное ожидание cookie проверки и фиксированная пауза (с)
+    
+    # Profiling
+    PROFILING_UPDATER: bool = False  # Профилировать каждый запуск актуализации
+    PROFILING_API_SAMPLE_RATE: float = 0.0  # Доля профилируемых API запросов (0 = выключено)
+    PROFILING_DIR: str = "profiles"  # Каталог для артефактов профилирования
+    PROFILING_SAMPLE_INTERVAL: float = 0.005  # Интервал сэмплирования стеков (с)
+    PROFILING_TOP_ALLOCATIONS: int = 25  # Количество мест выделения памяти в отчёте tracemalloc
+    PROFILING_TRACEMALLOC_FRAMES: int = 1  # Глубина стека, сохраняемая tracemalloc
     
     # API
     API_V1_PREFIX: str = "/api/v1"
+    # Только API: не импортировать парсер, не запускать планировщик и миграции
+    # (для горизонтально масштабируемых воркеров; актуализацию выполняет отдельный процесс)
+    API_ONLY: bool = False
+    # Сжатие ответов (brotli, если установлен, иначе gzip) по Accept-Encoding
+    COMPRESSION_MIN_SIZE: int = 1024  # Минимальный размер сжимаемого ответа в байтах (0 = не сжимать)
+    COMPRESSION_GZIP_LEVEL: int = 6  # Уровень сжатия gzip (1-9)
+    COMPRESSION_BROTLI_QUALITY: int = 4  # Качество сжатия brotli (0-11)
+    BINDINGS_BULK_DELETE_MAX_ROWS: int = 10000  # Максимум привязок, удаляемых одним запросом массового удаления
+    # Ограничение нагрузки: одновременные запросы по группам маршрутов и очередь ожидания;
+    # при переполнении очереди или ожидании дольше бюджета - быстрый 503 с Retry-After
+    ADMISSION_CONTROL: bool = True
+    ADMISSION_AUTH_CONCURRENCY: int = 4  # /auth (хэширование паролей bcrypt)
+    ADMISSION_READ_CONCURRENCY: int = 16  # Чтение привязок и ЖК
+    ADMISSION_WRITE_CONCURRENCY: int = 4  # Изменение привязок
+    ADMISSION_QUEUE_SIZE: int = 64  # Максимум ожидающих запросов в группе
+    ADMISSION_MAX_WAIT_SECONDS: float = 1.0  # Бюджет ожидания в очереди
     
     class Config:
         env_file = ".env"
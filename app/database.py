@@ -1,9 +1,27 @@
 """Подключение к базе данных."""
-from sqlalchemy import create_engine
+from itertools import count
+from pathlib import Path
+from typing import List, Optional
+import logging
+import threading
+import time
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import get_settings
+from app.utils.metrics import (
+    REGISTRY,
+    DB_QUERY_DURATION,
+    DB_POOL_SIZE,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    DB_REPLICA_LAG,
+    DB_REPLICA_HEALTHY,
+    DB_READ_SESSIONS,
+)
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
 engine = create_engine(
@@ -14,14 +32,236 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Ключ pg_advisory_xact_lock, под которым применяются миграции (один процесс за раз)
+MIGRATION_LOCK_KEY = 7_403_911
+
+# Позиция WAL основной БД; читается перед проверкой реплик
+PRIMARY_LSN_SQL = "SELECT pg_current_wal_lsn()::text"
+# Состояние реплики: в режиме восстановления ли она, применён ли WAL до позиции основной БД,
+# сколько секунд назад применена последняя транзакция и принимает ли WAL receiver поток.
+# Сравнение с позицией основной БД, а не с полученным WAL: реплика с остановленным receiver
+# применила всё полученное, но отстаёт от основной БД
+REPLICA_STATE_SQL = """
+    SELECT
+        pg_is_in_recovery(),
+        pg_last_wal_replay_lsn() >= CAST(:primary_lsn AS pg_lsn),
+        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()),
+        EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming')
+"""
+# Таймаут подключения к реплике (недоступная реплика не должна задерживать проверку надолго)
+REPLICA_CONNECT_TIMEOUT = 3
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Запомнить время начала SQL запроса."""
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Учесть длительность SQL запроса в метриках."""
+    started = conn.info["query_start_time"].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+    DB_QUERY_DURATION.observe(time.perf_counter() - started, operation=operation)
+
+
+def _handle_error(exception_context):
+    """Сбросить время начала запроса, завершившегося ошибкой."""
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def _instrument(target_engine):
+    """Подключить учёт длительности SQL запросов engine в метриках."""
+    event.listen(target_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(target_engine, "handle_error", _handle_error)
+    return target_engine
+
+
+_instrument(engine)
+
+
+def _collect_pool_metrics():
+    """Обновить метрики заполненности пула соединений."""
+    pool = engine.pool
+    if hasattr(pool, "checkedout"):
+        DB_POOL_SIZE.set(pool.size())
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+
+REGISTRY.add_collector(_collect_pool_metrics)
+
+
+class Replica:
+    """Реплика для чтения: engine, фабрика сессий и результат последней проверки отставания."""
+    
+    def __init__(self, url: str):
+        parsed = make_url(url)
+        self.name = f"{parsed.host}:{parsed.port or 5432}/{parsed.database}"
+        self.engine = _instrument(create_engine(
+            url,
+            pool_pre_ping=True,
+            echo=False,
+            connect_args={"connect_timeout": REPLICA_CONNECT_TIMEOUT},
+        ))
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        # До первой проверки реплика не используется
+        self.healthy = False
+        self.lag: Optional[float] = None
+        self.checked_at: Optional[float] = None
+    
+    def check(self, primary_lsn: Optional[str] = None):
+        """
+        Проверить отставание; реплика с отставанием больше порога, без потока WAL или недоступная исключается.
+        
+        primary_lsn - позиция WAL основной БД перед проверкой. Реплика, применившая WAL
+        до неё, не отстаёт (0 с), иначе отставание - время с последней применённой транзакции.
+        Если позиция основной БД неизвестна, отставание всегда считается по времени.
+        """
+        # Причина исключения реплики (None - реплика используется)
+        reason = None
+        try:
+            with self.engine.connect() as conn:
+                in_recovery, caught_up, replay_age, streaming = conn.execute(
+                    text(REPLICA_STATE_SQL), {"primary_lsn": primary_lsn}
+                ).one()
+            if not in_recovery or caught_up:
+                # Не реплика (например, повышена до основной) или применила всё, что есть на основной БД
+                self.lag = 0.0
+            else:
+                # Транзакции ещё не применялись - отставание неизвестно
+                self.lag = float(replay_age) if replay_age is not None else None
+            if in_recovery and not streaming:
+                reason = "WAL receiver не принимает поток от основной БД"
+            elif self.lag is None:
+                reason = "отставание неизвестно"
+            elif self.lag > settings.DATABASE_REPLICA_MAX_LAG_SECONDS:
+                reason = f"отставание {self.lag:.1f} с"
+        except Exception as e:
+            self.lag = None
+            reason = f"недоступна: {e}"
+        healthy = reason is None
+        if self.healthy and not healthy:
+            logger.warning(f"Реплика {self.name} исключена: {reason}")
+        elif healthy and not self.healthy:
+            logger.info(f"Реплика {self.name} используется для чтения (отставание {self.lag:.1f} с)")
+        self.healthy = healthy
+        self.checked_at = time.time()
+        DB_REPLICA_LAG.set(self.lag if self.lag is not None else -1, replica=self.name)
+        DB_REPLICA_HEALTHY.set(1 if healthy else 0, replica=self.name)
+
+
+class ReplicaRouter:
+    """
+    Выбор сессии для чтения: реплики с допустимым отставанием по кругу,
+    основная БД - если реплик нет или все исключены.
+    
+    Отставание проверяется в фоновом потоке каждые DATABASE_REPLICA_CHECK_INTERVAL_SECONDS;
+    поток запускается при первом запросе сессии для чтения.
+    """
+    
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._counter = count()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _primary_lsn(self) -> Optional[str]:
+        try:
+            with engine.connect() as conn:
+                return conn.execute(text(PRIMARY_LSN_SQL)).scalar()
+        except Exception as e:
+            logger.warning(f"Не удалось получить позицию WAL основной БД: {e}")
+            return None
+    
+    def _check_loop(self):
+        while True:
+            primary_lsn = self._primary_lsn()
+            for replica in self.replicas:
+                replica.check(primary_lsn)
+            time.sleep(settings.DATABASE_REPLICA_CHECK_INTERVAL_SECONDS)
+    
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._check_loop, name="replica-lag-check", daemon=True)
+                self._thread.start()
+    
+    def session(self):
+        """Сессия для чтения."""
+        if self.replicas:
+            self._ensure_started()
+            healthy = [replica for replica in self.replicas if replica.healthy]
+            if healthy:
+                replica = healthy[next(self._counter) % len(healthy)]
+                DB_READ_SESSIONS.inc(target="replica")
+                return replica.session_factory()
+        DB_READ_SESSIONS.inc(target="primary")
+        return SessionLocal()
+
+
+replica_router = ReplicaRouter(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+)
+
 Base = declarative_base()
 
 
 def get_db():
-    """Dependency для получения сессии БД."""
+    """Dependency для получения сессии БД (основная БД: запись и чтение своих записей)."""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+
+def get_read_db():
+    """
+    Dependency для получения сессии только для чтения.
+    
+    При заданных DATABASE_REPLICA_URLS сессия открывается на реплике с отставанием
+    не больше DATABASE_REPLICA_MAX_LAG_SECONDS, иначе - на основной БД.
+    """
+    db = replica_router.session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def upgrade_schema():
+    """
+    Применить миграции Alembic до последней версии.
+    
+    БД, созданная до перехода на миграции (через Base.metadata.create_all),
+    сначала отмечается начальной ревизией.
+    
+    Воркеры uvicorn/gunicorn стартуют одновременно: отметка и миграции выполняются
+    в одной транзакции под pg_advisory_xact_lock, остальные процессы ждут блокировку
+    и затем видят уже применённые миграции. Ошибка миграции пробрасывается,
+    транзакция откатывается целиком.
+    """
+    from alembic import command
+    from alembic.config import Config
+    
+    project_root = Path(__file__).resolve().parents[1]
+    config = Config(str(project_root / "alembic.ini"))
+    config.set_main_option("script_location", str(project_root / "alembic"))
+    # Не перенастраиваем логирование приложения из alembic.ini
+    config.attributes["configure_logger"] = False
+    
+    with engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        # Alembic выполняет миграции в этом соединении (см. alembic/env.py)
+        config.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        if "alembic_version" not in tables and "housing_complexes" in tables:
+            command.stamp(config, "0001_initial")
+        command.upgrade(config, "head")
+        connection.commit()
+
@@ -1,17 +1,18 @@
 """Главный файл приложения FastAPI."""
 from contextlib import asynccontextmanager
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
 
 from app.config import get_settings
-from app.database import engine, SessionLocal
-from app.models import HousingComplex, House, Binding, User  # Импортируем модели для создания таблиц
-from app.api import auth, bindings
-from app.services.updater import DataUpdater
+from app.database import upgrade_schema
+from app.api import admin, auth, bindings, housing_complexes
+from app.middleware.admission import AdmissionMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.utils.metrics import REGISTRY, CONTENT_TYPE
 
 # Настройка логирования
 logging.basicConfig(
@@ -21,24 +22,19 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
-scheduler = AsyncIOScheduler()
+# Планировщик и планировщик регионов создаются в lifespan только вне режима API_ONLY
+scheduler = None
+crawler = None
 
 
 async def update_housing_complexes_task():
-    """Асинхронная задача для выполнения периодической актуализации данных."""
-    logger.info("Запуск периодической актуализации данных")
-    db = SessionLocal()
-    updater = None
+    """Асинхронная задача периодической актуализации: обновляет регионы, которые пора обновить."""
     try:
-        updater = DataUpdater(db)
-        result = await updater.update_housing_complexes()
-        logger.info(f"Результат актуализации: {result}")
+        results = await crawler.run_due()
+        if results:
+            logger.info(f"Результат актуализации: {results}")
     except Exception as e:
         logger.error(f"Ошибка при актуализации данных: {e}")
-    finally:
-        if updater:
-            await updater.close()
-        db.close()
 
 
 def update_housing_complexes():
@@ -61,29 +57,50 @@ def update_housing_complexes():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Управление жизненным циклом приложения."""
+    global scheduler, crawler
+    
     # Startup
     logger.info("Запуск приложения")
     
-    # Создаем таблицы в БД (если еще не созданы)
+    if settings.API_ONLY:
+        # Только API: без миграций, планировщика и парсера (быстрый старт воркеров)
+        logger.info("Режим API_ONLY: миграции и планировщик актуализации отключены")
+        yield
+        logger.info("Остановка приложения")
+        return
+    
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.interval import IntervalTrigger
+    # Импорт здесь, чтобы API-процессы не загружали Playwright и парсер
+    from app.services.crawler import RegionCrawler
+    
+    # Применяем миграции БД (схема управляется через Alembic). Если миграции не применились,
+    # приложение не запускается: работать на частично обновлённой схеме нельзя
     try:
-        from app.database import Base
-        Base.metadata.create_all(bind=engine)
-        logger.info("Таблицы БД проверены/созданы")
+        upgrade_schema()
+        logger.info("Миграции БД применены")
     except Exception as e:
-        logger.error(f"Ошибка при создании таблиц: {e}")
+        logger.error(f"Ошибка при применении миграций, запуск прерван: {e}")
+        raise
     
-    # Запускаем периодическую задачу актуализации
+    # Запускаем периодическую задачу актуализации: на каждом срабатывании
+    # обновляются регионы, у которых истёк их интервал
+    crawler = RegionCrawler()
+    scheduler = AsyncIOScheduler()
     scheduler.add_job(
         update_housing_complexes,
-        trigger=IntervalTrigger(hours=settings.PARSER_SCHEDULER_HOURS),
+        trigger=IntervalTrigger(minutes=settings.PARSER_SCHEDULER_TICK_MINUTES),
         id="update_housing_complexes",
         name="Актуализация данных о ЖК",
         replace_existing=True
     )
     scheduler.start()
-    logger.info(f"Планировщик запущен (интервал: {settings.PARSER_SCHEDULER_HOURS} часов)")
+    logger.info(
+        f"Планировщик запущен (регионов: {len(crawler.regions)}, "
+        f"проверка каждые {settings.PARSER_SCHEDULER_TICK_MINUTES} минут)"
+    )
     
-    # Выполняем первую актуализацию при старте
+    # Выполняем первую проверку при старте
     import asyncio
     asyncio.create_task(update_housing_complexes_task())
     
@@ -99,7 +116,9 @@ app = FastAPI(
     title="Housing Complex Service",
     description="Микросервис для сбора данных о жилых комплексах и привязке домов",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # JSON ответы сериализуются через orjson
+    default_response_class=ORJSONResponse,
 )
 
 # Настройка CORS
@@ -110,10 +129,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+# Ограничение нагрузки: внутри MetricsMiddleware, чтобы отклонённые запросы попадали в метрики
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 # Подключаем роуты
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(bindings.router, prefix=settings.API_V1_PREFIX)
+app.include_router(housing_complexes.router, prefix=settings.API_V1_PREFIX)
+app.include_router(admin.router, prefix=settings.API_V1_PREFIX)
 
 
 @app.get("/")
@@ -131,3 +157,9 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "ok"}
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Метрики процесса в текстовом формате Prometheus."""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
@@ -0,0 +1,201 @@
+"""Middleware ограничения нагрузки (admission control) по группам маршрутов."""
+from collections import deque
+from typing import Deque, Dict, Optional
+import asyncio
+import math
+import time
+
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import get_settings
+from app.utils.metrics import (
+    REGISTRY,
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_WAIT,
+    ADMISSION_SHED,
+)
+
+settings = get_settings()
+
+# Группы маршрутов
+AUTH = "auth"
+BINDINGS_READ = "bindings_read"
+BINDINGS_WRITE = "bindings_write"
+
+# POST маршруты, которые только читают данные
+READ_ONLY_POST_SUFFIXES = (":batchGet", "/suggestions")
+
+# Вес нового измерения в сглаженной длительности обработки запроса
+SERVICE_TIME_ALPHA = 0.2
+
+
+class Overloaded(Exception):
+    """Запрос не допущен: группа перегружена."""
+    
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    Лимит одновременных запросов группы с ограниченной очередью ожидания.
+    
+    Ожидаемое время ожидания оценивается по длине очереди и сглаженной
+    длительности обработки запроса группы. Запрос отклоняется сразу, если
+    очередь заполнена или ожидание дольше бюджета, и после бюджета ожидания,
+    если место так и не освободилось. Освободившееся место передаётся первому
+    ожидающему (FIFO).
+    """
+    
+    def __init__(self, name: str, concurrency: int, queue_size: int, max_wait: float):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.active = 0
+        self.service_time = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+    
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+    
+    def expected_wait(self) -> float:
+        """Ожидаемое время ожидания нового запроса в секундах."""
+        if self.active < self.concurrency and not self._waiters:
+            return 0.0
+        return (len(self._waiters) + 1) / self.concurrency * self.service_time
+    
+    def retry_after(self) -> int:
+        """Значение Retry-After в секундах."""
+        return max(1, math.ceil(self.expected_wait()))
+    
+    async def acquire(self):
+        """
+        Занять место в группе.
+        
+        Raises:
+            Overloaded: Очередь заполнена, ожидание дольше бюджета или истекло
+        """
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            raise Overloaded("queue_full", self.retry_after())
+        if self.expected_wait() > self.max_wait:
+            raise Overloaded("over_budget", self.retry_after())
+        
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, timeout=self.max_wait)
+        except BaseException as e:
+            # Место могло быть передано одновременно с таймаутом или отменой запроса
+            if future.done() and not future.cancelled():
+                self.release()
+            if isinstance(e, asyncio.TimeoutError):
+                raise Overloaded("timeout", self.retry_after())
+            raise
+        finally:
+            if future in self._waiters:
+                self._waiters.remove(future)
+            ADMISSION_WAIT.observe(time.perf_counter() - started, group=self.name)
+    
+    def release(self):
+        """Освободить место: передать его первому ожидающему или вернуть в группу."""
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+    
+    def record(self, duration: float):
+        """Учесть длительность обработки запроса в оценке времени ожидания."""
+        if self.service_time == 0.0:
+            self.service_time = duration
+        else:
+            self.service_time += SERVICE_TIME_ALPHA * (duration - self.service_time)
+
+
+LIMITERS: Dict[str, AdmissionLimiter] = {
+    AUTH: AdmissionLimiter(
+        AUTH, settings.ADMISSION_AUTH_CONCURRENCY, settings.ADMISSION_QUEUE_SIZE, settings.ADMISSION_MAX_WAIT_SECONDS
+    ),
+    BINDINGS_READ: AdmissionLimiter(
+        BINDINGS_READ, settings.ADMISSION_READ_CONCURRENCY, settings.ADMISSION_QUEUE_SIZE,
+        settings.ADMISSION_MAX_WAIT_SECONDS,
+    ),
+    BINDINGS_WRITE: AdmissionLimiter(
+        BINDINGS_WRITE, settings.ADMISSION_WRITE_CONCURRENCY, settings.ADMISSION_QUEUE_SIZE,
+        settings.ADMISSION_MAX_WAIT_SECONDS,
+    ),
+}
+
+
+def _collect_admission_metrics():
+    """Обновить метрики занятости групп и длины очередей."""
+    for limiter in LIMITERS.values():
+        ADMISSION_IN_FLIGHT.set(limiter.active, group=limiter.name)
+        ADMISSION_QUEUE_DEPTH.set(limiter.queued, group=limiter.name)
+
+
+REGISTRY.add_collector(_collect_admission_metrics)
+
+
+def get_route_group(scope: Scope) -> Optional[str]:
+    """Группа маршрута запроса (None - запрос не ограничивается)."""
+    path = scope["path"]
+    prefix = settings.API_V1_PREFIX
+    if path.startswith(f"{prefix}/auth"):
+        return AUTH
+    if path.startswith((f"{prefix}/bindings", f"{prefix}/housing-complexes")):
+        if scope["method"] in ("GET", "HEAD") or path.endswith(READ_ONLY_POST_SUFFIXES):
+            return BINDINGS_READ
+        return BINDINGS_WRITE
+    return None
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware: ограничение одновременных запросов по группам маршрутов
+    (auth, чтение и изменение привязок) с ограниченной очередью ожидания.
+    
+    При перегрузке запрос сразу получает 503 с Retry-After вместо ожидания
+    в неограниченной очереди, поэтому задержка допущенных запросов остаётся
+    ограниченной. Служебные маршруты (/health, /metrics, /admin) не ограничиваются.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        group = get_route_group(scope) if scope["type"] == "http" and settings.ADMISSION_CONTROL else None
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+        
+        limiter = LIMITERS[group]
+        try:
+            await limiter.acquire()
+        except Overloaded as e:
+            ADMISSION_SHED.inc(group=group, reason=e.reason)
+            response = ORJSONResponse(
+                {"detail": "Сервис перегружен, повторите запрос позже"},
+                status_code=503,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.record(time.perf_counter() - started)
+            limiter.release()
@@ -0,0 +1,118 @@
+"""Middleware сжатия ответов (brotli/gzip по Accept-Encoding)."""
+from typing import Optional
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+
+try:
+    import brotli
+except ImportError:  # brotli не установлен: сжатие только gzip
+    brotli = None
+
+settings = get_settings()
+
+# Типы содержимого, которые имеет смысл сжимать
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Выбрать кодировку сжатия по заголовку Accept-Encoding.
+
+    Учитываются q-значения (q=0 - кодировка запрещена); при равных
+    предпочтениях brotli выбирается раньше gzip.
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip()] = quality
+
+    candidates = []
+    if brotli is not None:
+        candidates.append("br")
+    candidates.append("gzip")
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Сжать тело ответа."""
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware: сжатие ответов brotli или gzip.
+
+    Сжимаются ответы целиком (не потоковые) с JSON/текстом и размером не меньше
+    COMPRESSION_MIN_SIZE байт, если клиент указал кодировку в Accept-Encoding.
+    Потоковые и уже сжатые ответы передаются как есть.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or settings.COMPRESSION_MIN_SIZE <= 0:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                # Заголовки отправляются вместе с первой частью тела
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            content_type = headers.get("content-type", "")
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or len(body) < settings.COMPRESSION_MIN_SIZE
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
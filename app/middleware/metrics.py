@@ -0,0 +1,54 @@
+"""Middleware сбора метрик HTTP запросов."""
+import time
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+
+
+def get_route_template(scope: Scope) -> str:
+    """
+    Получить шаблон маршрута запроса (например, /api/v1/bindings/{binding_id}).
+    
+    Метрики группируются по шаблону, а не по фактическому пути, чтобы ID
+    в пути не порождали неограниченное количество наборов меток.
+    """
+    app = scope.get("app")
+    for route in getattr(getattr(app, "router", None), "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware: гистограмма длительности запросов по маршрутам."""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=get_route_template(scope),
+                status=str(status_code),
+            )
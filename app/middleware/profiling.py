@@ -0,0 +1,29 @@
+"""Middleware профилирования выборки API запросов."""
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.middleware.metrics import get_route_template
+from app.utils import profiling
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware: профилирует долю запросов (PROFILING_API_SAMPLE_RATE).
+    
+    Профиль снимается в потоке event loop, поэтому в него попадают и
+    конкурентные запросы; для чистых профилей используйте низкую нагрузку.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not profiling.state.sample_api_request():
+            await self.app(scope, receive, send)
+            return
+        
+        profiler = profiling.Profiler(f"api-{scope['method']}-{get_route_template(scope)}")
+        profiler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.stop()
@@ -1,8 +1,11 @@
 """Модели базы данных."""
 from app.models.housing_complex import HousingComplex
+from app.models.housing_complex_stats import HousingComplexStats
 from app.models.house import House
 from app.models.binding import Binding
 from app.models.user import User
+from app.models.refresh_run import RefreshRun
+from app.models.processed_page import ProcessedPage
 
-__all__ = ["HousingComplex", "House", "Binding", "User"]
+__all__ = ["HousingComplex", "HousingComplexStats", "House", "Binding", "User", "RefreshRun", "ProcessedPage"]
 
@@ -10,7 +10,7 @@ class Binding(Base):
     
     __tablename__ = "bindings"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     house_id = Column(Integer, ForeignKey("houses.id", ondelete="CASCADE"), nullable=False)
     housing_complex_id = Column(Integer, ForeignKey("housing_complexes.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -21,8 +21,13 @@ class Binding(Base):
     
     __table_args__ = (
         UniqueConstraint('house_id', 'housing_complex_id', name='uq_house_housing_complex'),
-        Index('idx_binding_house', 'house_id'),
-        Index('idx_binding_housing_complex', 'housing_complex_id'),
+        # Фильтр по house_id обслуживает uq_house_housing_complex (house_id - ведущая колонка).
+        # Покрывающий индекс для списка привязок ЖК: фильтр + сортировка по id без обращения к таблице
+        Index(
+            'idx_binding_housing_complex_id',
+            'housing_complex_id', 'id',
+            postgresql_include=['house_id', 'created_at'],
+        ),
     )
     
     def __repr__(self):
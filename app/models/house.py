@@ -1,7 +1,8 @@
 """Модель дома."""
-from sqlalchemy import Column, Integer, String, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.orm import relationship, validates
 from app.database import Base
+from app.utils.address import address_key
 
 
 class House(Base):
@@ -9,18 +10,21 @@ class House(Base):
     
     __tablename__ = "houses"
     
-    id = Column(Integer, primary_key=True, index=True)
-    address = Column(String(500), nullable=False, unique=True, index=True)
+    id = Column(Integer, primary_key=True)
+    address = Column(String(500), nullable=False)
+    # Нормализованный адрес: один дом на разные написания одного адреса
+    address_key = Column(String(500), nullable=False, unique=True, index=True)
     floors = Column(Integer, nullable=True, comment="Этажность дома")
     apartments_count = Column(Integer, nullable=True, comment="Количество квартир")
     
     # Связи
     bindings = relationship("Binding", back_populates="house", cascade="all, delete-orphan")
     
-    __table_args__ = (
-        Index('idx_house_address', 'address'),
-    )
+    @validates("address")
+    def _update_address_key(self, key, value):
+        """Пересчитать address_key при изменении адреса."""
+        self.address_key = address_key(value)
+        return value
     
     def __repr__(self):
         return f"<House(id={self.id}, address='{self.address}', floors={self.floors}, apartments={self.apartments_count})>"
-
@@ -1,9 +1,9 @@
 """Модель жилого комплекса."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy import BigInteger, Column, Float, Integer, String, Text, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
-import hashlib
+from app.utils.hashing import calculate_data_hash
 
 
 class HousingComplex(Base):
@@ -11,15 +11,18 @@ class HousingComplex(Base):
     
     __tablename__ = "housing_complexes"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(500), nullable=False, index=True)
     address = Column(String(500), nullable=True, index=True)
     description = Column(Text)
     developer = Column(String(300))
+    status = Column(String(100))
+    latitude = Column(Float)
+    longitude = Column(Float)
     # URL источника для отслеживания изменений
     source_url = Column(String(1000), unique=True, nullable=False, index=True)
     # Хэш значимых полей для отслеживания изменений
-    data_hash = Column(String(64), nullable=False, index=True)
+    data_hash = Column(BigInteger, nullable=False, index=True)
     # Метаданные
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -27,15 +30,21 @@ class HousingComplex(Base):
     # Связи
     bindings = relationship("Binding", back_populates="housing_complex", cascade="all, delete-orphan")
     
-    __table_args__ = (
-        Index('idx_housing_complex_data_hash', 'data_hash'),
-    )
-    
-    @classmethod
-    def calculate_hash(cls, name: str, address: str = None, description: str = None, developer: str = None) -> str:
-        """Вычислить хэш значимых полей."""
-        data_str = f"{name}|{address or ''}|{description or ''}|{developer or ''}"
-        return hashlib.sha256(data_str.encode('utf-8')).hexdigest()
+    def calculate_hash(self) -> int:
+        """
+        Вычислить хэш значимых полей (см. app/utils/hashing.py).
+        
+        Описание в хэш не входит (как при актуализации и в миграции 0006): оно
+        загружается отдельно из API деталей и не должно менять data_hash.
+        """
+        return calculate_data_hash(
+            name=self.name,
+            address=self.address,
+            developer=self.developer,
+            status=self.status,
+            latitude=self.latitude,
+            longitude=self.longitude,
+        )
     
     def __repr__(self):
         return f"<HousingComplex(id={self.id}, name='{self.name}')>"
@@ -0,0 +1,30 @@
+"""Модель агрегированной статистики жилого комплекса."""
+from sqlalchemy import Column, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class HousingComplexStats(Base):
+    """
+    Статистика привязок ЖК: число домов, сумма квартир и максимальная этажность.
+    
+    Счётчики обновляются инкрементально триггерами БД на bindings и houses
+    (миграция 0007_housing_complex_stats) в той же транзакции, что и изменение
+    привязок, поэтому чтение статистики не зависит от числа привязок.
+    """
+    
+    __tablename__ = "housing_complex_stats"
+    
+    housing_complex_id = Column(
+        Integer, ForeignKey("housing_complexes.id", ondelete="CASCADE"), primary_key=True
+    )
+    bindings_count = Column(Integer, nullable=False, default=0, comment="Привязанных домов")
+    apartments_total = Column(BigInteger, nullable=False, default=0, comment="Сумма квартир привязанных домов")
+    max_floors = Column(Integer, nullable=True, comment="Максимальная этажность привязанных домов")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return (
+            f"<HousingComplexStats(housing_complex_id={self.housing_complex_id}, "
+            f"bindings={self.bindings_count}, apartments={self.apartments_total}, max_floors={self.max_floors})>"
+        )
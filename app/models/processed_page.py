@@ -0,0 +1,26 @@
+"""Модель отметки об обработке страницы API."""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ProcessedPage(Base):
+    """
+    Отметка об обработке страницы API: ответ с этим хэшем записан в БД.
+    
+    Коммитится вместе с данными страницы и контрольной точкой запуска, поэтому
+    соответствует данным БД и после её восстановления из резервной копии или
+    пересоздания (см. app/services/page_cache.py).
+    """
+    
+    __tablename__ = "processed_pages"
+    
+    cache_key = Column(String(32), primary_key=True, comment="Ключ страницы в кэше ответов")
+    content_hash = Column(String(32), nullable=False)
+    processing_version = Column(Integer, nullable=False)
+    records = Column(Integer, nullable=False, comment="Записей на странице до фильтрации")
+    complexes = Column(Integer, nullable=False, comment="ЖК города на странице")
+    processed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<ProcessedPage(cache_key='{self.cache_key}', content_hash='{self.content_hash}')>"
@@ -0,0 +1,39 @@
+"""Модель запуска актуализации данных."""
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, JSON, ForeignKey
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class RefreshRun(Base):
+    """Модель запуска актуализации данных о ЖК (отчёт с таймингами этапов)."""
+    
+    __tablename__ = "refresh_runs"
+    
+    id = Column(Integer, primary_key=True)
+    status = Column(String(20), nullable=False, default="running", comment="running / success / failed")  # partial - часть страниц не загружена
+    city = Column(String(200), nullable=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    duration_seconds = Column(Float, nullable=True)
+    # Счётчики записей
+    fetched_count = Column(Integer, nullable=False, default=0, comment="ЖК получено из источника")
+    added_count = Column(Integer, nullable=False, default=0)
+    updated_count = Column(Integer, nullable=False, default=0)
+    unchanged_count = Column(Integer, nullable=False, default=0)
+    # Контрольная точка: offset следующей страницы источника и время её записи
+    next_offset = Column(Integer, nullable=True)
+    checkpointed_at = Column(DateTime(timezone=True), nullable=True)
+    # Размер страницы API в конце запуска: начальный для следующего запуска города
+    page_size = Column(Integer, nullable=True)
+    # Прерванный запуск, который продолжает этот
+    resumed_from_id = Column(
+        Integer,
+        ForeignKey("refresh_runs.id", ondelete="SET NULL", name="fk_refresh_runs_resumed_from_id"),
+        nullable=True,
+    )
+    # Отчёт трассировки: агрегаты по этапам и интервалы (см. app/utils/tracing.py)
+    stages = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    
+    def __repr__(self):
+        return f"<RefreshRun(id={self.id}, status='{self.status}', started_at={self.started_at})>"
@@ -1,14 +1,40 @@
 """Pydantic схемы для валидации."""
-from app.schemas.housing_complex import HousingComplexBase, HousingComplexCreate, HousingComplexResponse
+from app.schemas.housing_complex import (
+    HousingComplexBase,
+    HousingComplexCreate,
+    HousingComplexResponse,
+    HousingComplexListResponse,
+    HousingComplexBatchGetResponse,
+    HousingComplexStatsResponse,
+    HousingComplexStatsBatchGetResponse,
+)
 from app.schemas.house import HouseBase, HouseCreate, HouseResponse
-from app.schemas.binding import BindingBase, BindingCreate, BindingResponse, BindingListResponse
+from app.schemas.binding import (
+    BindingBase,
+    BindingCreate,
+    BindingResponse,
+    BindingListResponse,
+    BindingBatchGetResponse,
+    BindingBulkDeleteRequest,
+    BindingBulkDeleteResponse,
+    BindingSuggestRequest,
+    BindingSuggestResponse,
+)
+from app.schemas.batch import BatchGetRequest
 from app.schemas.auth import Token, TokenData, UserLogin
 from app.schemas.parser import ComplexParsedDTO
+from app.schemas.refresh_run import RefreshRunResponse, RefreshRunListResponse
+from app.schemas.profiling import ProfilingUpdate, ProfilingStateResponse
+from app.schemas.replica import ReplicaStatus, ReplicaListResponse
 
 __all__ = [
     "HousingComplexBase",
     "HousingComplexCreate",
     "HousingComplexResponse",
+    "HousingComplexListResponse",
+    "HousingComplexBatchGetResponse",
+    "HousingComplexStatsResponse",
+    "HousingComplexStatsBatchGetResponse",
     "HouseBase",
     "HouseCreate",
     "HouseResponse",
@@ -16,9 +42,21 @@ __all__ = [
     "BindingCreate",
     "BindingResponse",
     "BindingListResponse",
+    "BindingBatchGetResponse",
+    "BindingBulkDeleteRequest",
+    "BindingBulkDeleteResponse",
+    "BatchGetRequest",
+    "BindingSuggestRequest",
+    "BindingSuggestResponse",
     "Token",
     "TokenData",
     "UserLogin",
     "ComplexParsedDTO",
+    "RefreshRunResponse",
+    "RefreshRunListResponse",
+    "ProfilingUpdate",
+    "ProfilingStateResponse",
+    "ReplicaStatus",
+    "ReplicaListResponse",
 ]
 
@@ -0,0 +1,8 @@
+"""Pydantic схемы пакетного получения записей по ID."""
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class BatchGetRequest(BaseModel):
+    """Схема запроса пакетного получения по ID."""
+    ids: List[int] = Field(..., min_length=1, max_length=1000, description="ID записей (до 1000)")
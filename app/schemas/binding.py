@@ -36,3 +36,54 @@ class BindingListResponse(BaseModel):
     items: List[BindingResponse]
     total: int
 
+
+class BindingBatchGetResponse(BaseModel):
+    """Схема ответа пакетного получения привязок."""
+    items: List[BindingResponse] = Field(..., description="Найденные привязки в порядке запроса")
+    not_found: List[int] = Field(..., description="ID, для которых привязки не найдены")
+
+
+
+class BindingSuggestRequest(BaseModel):
+    """Схема запроса подбора ЖК для адресов домов."""
+    addresses: List[str] = Field(..., min_length=1, max_length=1000, description="Адреса домов")
+    limit: int = Field(5, ge=1, le=50, description="Максимум кандидатов на адрес")
+
+
+class ComplexCandidate(BaseModel):
+    """Кандидат ЖК для дома."""
+    housing_complex_id: int
+    name: str
+    address: Optional[str] = None
+    score: float = Field(..., description="Оценка совпадения (0..1)")
+
+
+class BindingSuggestion(BaseModel):
+    """Кандидаты ЖК для одного адреса."""
+    address: str
+    address_key: str = Field(..., description="Нормализованный ключ адреса")
+    candidates: List[ComplexCandidate]
+
+
+class BindingSuggestResponse(BaseModel):
+    """Схема ответа подбора ЖК."""
+    items: List[BindingSuggestion]
+
+
+class BindingBulkDeleteRequest(BaseModel):
+    """Схема запроса массового удаления привязок (условия объединяются по И)."""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=1000, description="ID привязок")
+    house_ids: Optional[List[int]] = Field(None, min_length=1, max_length=1000, description="ID домов")
+    housing_complex_ids: Optional[List[int]] = Field(
+        None, min_length=1, max_length=1000, description="ID жилых комплексов"
+    )
+    dry_run: bool = Field(False, description="Только посчитать подходящие привязки, не удаляя")
+
+
+class BindingBulkDeleteResponse(BaseModel):
+    """Схема ответа массового удаления привязок."""
+    dry_run: bool
+    matched: Optional[int] = Field(None, description="Подходящих привязок (только при dry_run)")
+    deleted: int = Field(..., description="Удалено привязок")
+    ids: List[int] = Field(..., description="ID удалённых привязок")
+    has_more: bool = Field(..., description="Остались подходящие привязки сверх лимита запроса")
@@ -1,7 +1,7 @@
 """Pydantic схемы для жилых комплексов."""
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class HousingComplexBase(BaseModel):
@@ -10,6 +10,9 @@ class HousingComplexBase(BaseModel):
     address: Optional[str] = Field(None, max_length=500, description="Адрес ЖК")
     description: Optional[str] = Field(None, description="Описание ЖК")
     developer: Optional[str] = Field(None, max_length=300, description="Застройщик")
+    status: Optional[str] = Field(None, max_length=100, description="Статус ЖК")
+    latitude: Optional[float] = Field(None, description="Широта")
+    longitude: Optional[float] = Field(None, description="Долгота")
 
 
 class HousingComplexCreate(HousingComplexBase):
@@ -27,3 +30,28 @@ class HousingComplexResponse(HousingComplexBase):
     class Config:
         from_attributes = True
 
+
+class HousingComplexListResponse(BaseModel):
+    """Схема списка ЖК."""
+    items: List[HousingComplexResponse]
+    total: int
+
+
+class HousingComplexBatchGetResponse(BaseModel):
+    """Схема ответа пакетного получения ЖК."""
+    items: List[HousingComplexResponse] = Field(..., description="Найденные ЖК в порядке запроса")
+    not_found: List[int] = Field(..., description="ID, для которых ЖК не найдены")
+
+
+class HousingComplexStatsResponse(BaseModel):
+    """Схема статистики привязок ЖК."""
+    housing_complex_id: int
+    bindings_count: int = Field(..., description="Привязанных домов")
+    apartments_total: int = Field(..., description="Сумма квартир привязанных домов")
+    max_floors: Optional[int] = Field(None, description="Максимальная этажность привязанных домов")
+
+
+class HousingComplexStatsBatchGetResponse(BaseModel):
+    """Схема ответа пакетного получения статистики ЖК."""
+    items: List[HousingComplexStatsResponse] = Field(..., description="Статистика в порядке запроса")
+    not_found: List[int] = Field(..., description="ID, для которых ЖК не найдены")
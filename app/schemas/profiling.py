@@ -0,0 +1,19 @@
+"""Pydantic схемы для управления профилированием."""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class ProfilingUpdate(BaseModel):
+    """Схема изменения настроек профилирования."""
+    updater_runs: Optional[int] = Field(None, ge=0, le=10, description="Профилировать N ближайших запусков актуализации")
+    profile_all_updater_runs: Optional[bool] = Field(None, description="Профилировать каждый запуск актуализации")
+    api_sample_rate: Optional[float] = Field(None, ge=0, le=1, description="Доля профилируемых API запросов")
+
+
+class ProfilingStateResponse(BaseModel):
+    """Схема ответа с состоянием профилирования."""
+    profile_all_updater_runs: bool
+    updater_runs_requested: int
+    api_sample_rate: float
+    directory: str
+    artifacts: List[str] = Field(default_factory=list, description="Последние артефакты (новые первыми)")
@@ -0,0 +1,33 @@
+"""Pydantic схемы для запусков актуализации."""
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class RefreshRunResponse(BaseModel):
+    """Схема ответа с отчётом о запуске актуализации."""
+    id: int
+    status: str = Field(..., description="running / success / partial / failed")
+    city: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    fetched_count: int
+    added_count: int
+    updated_count: int
+    unchanged_count: int
+    next_offset: Optional[int] = Field(None, description="Контрольная точка: offset следующей страницы источника")
+    checkpointed_at: Optional[datetime] = None
+    page_size: Optional[int] = Field(None, description="Размер страницы API, выбранный в запуске")
+    resumed_from_id: Optional[int] = Field(None, description="Прерванный запуск, который продолжает этот")
+    stages: Optional[Dict[str, Any]] = Field(None, description="Тайминги этапов и интервалы трассировки")
+    error: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class RefreshRunListResponse(BaseModel):
+    """Схема списка запусков актуализации."""
+    items: List[RefreshRunResponse]
+    total: int
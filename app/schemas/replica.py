@@ -0,0 +1,18 @@
+"""Pydantic схемы состояния реплик БД."""
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List, Optional
+
+
+class ReplicaStatus(BaseModel):
+    """Состояние реплики по последней проверке."""
+    name: str = Field(..., description="host:port/база")
+    healthy: bool = Field(..., description="Используется для чтения")
+    lag_seconds: Optional[float] = Field(None, description="Отставание (None - недоступна или не проверялась)")
+    checked_at: Optional[datetime] = None
+
+
+class ReplicaListResponse(BaseModel):
+    """Схема ответа с состоянием реплик."""
+    items: List[ReplicaStatus]
+    max_lag_seconds: float
@@ -103,7 +103,13 @@ async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> User:
-    """Получить текущего пользователя из токена."""
+    """
+    Получить текущего пользователя из токена.
+    
+    Пользователь всегда читается с основной БД: только что зарегистрированный
+    пользователь может ещё не дойти до реплики, а запросы на запись не должны
+    зависеть от её доступности.
+    """
     settings = get_settings()
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
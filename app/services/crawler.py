@@ -0,0 +1,285 @@
+"""Планирование актуализации по регионам."""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+import time
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.config import RegionConfig, get_settings
+from app.database import SessionLocal
+from app.models.refresh_run import RefreshRun
+from app.utils.metrics import PARSER_FAILED_PAGES
+from app.services.parser import NashDomParser
+from app.services.rate_limit import SourceRequestError
+from app.services.updater import DataUpdater, SharedListing
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def get_regions() -> List[RegionConfig]:
+    """Регионы актуализации в порядке убывания приоритета."""
+    regions = settings.PARSER_REGIONS or [
+        RegionConfig(city=settings.PARSER_CITY, interval_hours=settings.PARSER_SCHEDULER_HOURS)
+    ]
+    return sorted(regions, key=lambda region: -region.priority)
+
+
+class RegionCrawler:
+    """
+    Планировщик актуализации регионов.
+
+    Вызывается периодически (PARSER_SCHEDULER_TICK_MINUTES) и запускает регионы,
+    у которых с последнего успешного (в том числе частичного) запуска прошло interval_hours:
+    - после неудачных запусков регион повторяется с backoff: через
+      PARSER_REGION_RETRY_MINUTES * 2^(неудач подряд - 1), но не позже чем через interval_hours
+      после последней попытки
+    - регионы без успешных запусков распределяются по интервалу, чтобы не стартовать
+      все сразу (смещение index * min(interval_hours) / количество регионов)
+    - регионы с source_params (фильтр на стороне источника) загружаются отдельно
+    - если пора обновить несколько остальных регионов и включён PARSER_FANOUT,
+      источник загружается один раз без фильтра, и каждая страница за один проход
+      раскладывается по городам всех таких регионов; выгрузка переиспользуется
+      PARSER_LISTING_TTL_MINUTES
+    - иначе регионы загружаются отдельно (API запросы с search), не более
+      PARSER_MAX_CONCURRENCY одновременно
+
+    PARSER_MAX_CONCURRENCY - общий бюджет на браузеры/запросы к источнику.
+    """
+
+    def __init__(self, regions: Optional[List[RegionConfig]] = None):
+        self.regions = regions or get_regions()
+        self.started_at = datetime.now(timezone.utc)
+        self._semaphore = asyncio.Semaphore(settings.PARSER_MAX_CONCURRENCY)
+        self._running: Set[str] = set()
+        self._listing: Optional[SharedListing] = None
+
+    def due_regions(self, db: Session, now: Optional[datetime] = None) -> List[RegionConfig]:
+        """Регионы, которые пора обновить (по приоритету)."""
+        now = now or datetime.now(timezone.utc)
+        last_success = (
+            db.query(RefreshRun.city, func.max(RefreshRun.started_at).label("started_at"))
+            .filter(RefreshRun.status.in_(("success", "partial")))
+            .group_by(RefreshRun.city)
+            .subquery()
+        )
+        last_runs = dict(db.query(last_success.c.city, last_success.c.started_at).all())
+        # Неудачные запуски после последнего успешного: время последнего и их количество
+        failures = {
+            city: (last_failure, count)
+            for city, last_failure, count in (
+                db.query(RefreshRun.city, func.max(RefreshRun.started_at), func.count(RefreshRun.id))
+                .outerjoin(last_success, last_success.c.city == RefreshRun.city)
+                .filter(
+                    RefreshRun.status == "failed",
+                    or_(last_success.c.started_at.is_(None), RefreshRun.started_at > last_success.c.started_at),
+                )
+                .group_by(RefreshRun.city)
+                .all()
+            )
+        }
+        spread_hours = min(region.interval_hours for region in self.regions) / len(self.regions)
+
+        due = []
+        for index, region in enumerate(self.regions):
+            if region.city in self._running:
+                continue
+            last_run = last_runs.get(region.city)
+            if region.city in failures:
+                last_failure, count = failures[region.city]
+                due_at = last_failure + self._retry_delay(region, count)
+            elif last_run is None:
+                due_at = self.started_at + timedelta(hours=spread_hours * index)
+            else:
+                due_at = last_run + timedelta(hours=region.interval_hours)
+            if due_at <= now:
+                due.append(region)
+        return due
+
+    @staticmethod
+    def _retry_delay(region: RegionConfig, failures: int) -> timedelta:
+        """Задержка повтора региона после failures неудачных запусков подряд."""
+        minutes = settings.PARSER_REGION_RETRY_MINUTES * 2 ** min(failures - 1, 16)
+        return min(timedelta(minutes=minutes), timedelta(hours=region.interval_hours))
+
+    async def run_due(self) -> Dict[str, dict]:
+        """Обновить регионы, которые пора обновить. Возвращает результаты по городам."""
+        db = SessionLocal()
+        try:
+            due = self.due_regions(db)
+        finally:
+            db.close()
+        if not due:
+            logger.debug("Нет регионов для актуализации")
+            return {}
+
+        logger.info(f"Актуализация регионов: {', '.join(region.city for region in due)}")
+        self._running.update(region.city for region in due)
+        try:
+            shared, separate = [], []
+            for region in due:
+                (separate if region.source_params or not settings.PARSER_FANOUT else shared).append(region)
+            # Один регион выгоднее загрузить с search, если нет готовой общей выгрузки
+            if len(shared) == 1 and not self._listing_valid():
+                separate, shared = separate + shared, []
+            
+            results = {}
+            for group in await asyncio.gather(self._run_fanout(shared), self._run_separately(separate)):
+                results.update(group)
+            return results
+        finally:
+            self._running.difference_update(region.city for region in due)
+
+    async def _run_separately(self, regions: List[RegionConfig]) -> Dict[str, dict]:
+        """Загрузить регионы по отдельности, каждый своим парсером."""
+        if not regions:
+            return {}
+
+        async def run_region(region: RegionConfig):
+            async with self._semaphore:
+                return region.city, await self._update_region(region)
+
+        return dict(await asyncio.gather(*(run_region(region) for region in regions)))
+
+    async def _run_fanout(self, regions: List[RegionConfig]) -> Dict[str, dict]:
+        """Загрузить источник один раз и обновить регионы из общей выгрузки."""
+        if not regions:
+            return {}
+        parser = NashDomParser()
+        try:
+            page_size = max(region.page_size or settings.PARSER_PAGE_SIZE for region in regions)
+            listing = await self._get_listing(parser, page_size)
+            # Запись в БД синхронная: регионы обрабатываются по очереди в порядке приоритета
+            results = {}
+            for region in regions:
+                results[region.city] = await self._update_region(region, parser=parser, listing=listing)
+            return results
+        finally:
+            await parser.close()
+
+    async def _update_region(
+        self,
+        region: RegionConfig,
+        parser: Optional[NashDomParser] = None,
+        listing: Optional[SharedListing] = None,
+    ) -> dict:
+        """Запустить актуализацию одного региона в собственной сессии БД."""
+        db = SessionLocal()
+        updater = DataUpdater(db, parser=parser)
+        try:
+            return await updater.update_housing_complexes(
+                city=region.city,
+                page_size=region.page_size,
+                listing=listing,
+                source_params=region.source_params or None,
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при актуализации региона {region.city}: {e}")
+            return {"error": str(e)}
+        finally:
+            # Общий парсер закрывает вызывающий код
+            if parser is None:
+                await updater.close()
+            db.close()
+
+    def _listing_cities(self) -> List[str]:
+        """Города, которые обслуживаются общей выгрузкой."""
+        return [region.city for region in self.regions if not region.source_params]
+
+    def _listing_valid(self) -> bool:
+        """Есть ли неустаревшая общая выгрузка."""
+        ttl = settings.PARSER_LISTING_TTL_MINUTES * 60
+        return self._listing is not None and time.monotonic() - self._listing.fetched_at < ttl
+
+    async def _get_listing(self, parser: NashDomParser, page_size: int) -> SharedListing:
+        """Общая выгрузка источника (из кэша, если ещё не устарела)."""
+        if self._listing_valid():
+            logger.info("Используется общая выгрузка источника из предыдущего запуска")
+            return self._listing._replace(reused=True)
+        self._listing = await self._fetch_listing(parser, page_size)
+        return self._listing
+
+    async def _fetch_listing(self, parser: NashDomParser, page_size: int) -> SharedListing:
+        """
+        Загрузить источник целиком без фильтра по городу.
+
+        Страницы запрашиваются волнами по PARSER_MAX_CONCURRENCY; загрузка
+        останавливается на первой неполной странице или, если задан PARSER_MAX_RESULTS,
+        когда у каждого города набралось столько записей (как при загрузке города
+        отдельно; записи сверх лимита не хранятся). Каждая страница сразу
+        раскладывается по городам всех регионов общей выгрузки (а не только
+        тех, что обновляются сейчас), остальные записи не хранятся.
+        """
+        started = time.perf_counter()
+        concurrency = max(1, settings.PARSER_MAX_CONCURRENCY)
+        cities = self._listing_cities()
+        partitions: Dict[str, List[dict]] = {city: [] for city in cities}
+        max_results = settings.PARSER_MAX_RESULTS if settings.PARSER_MAX_RESULTS > 0 else None
+        pages = 0
+        records = 0
+        offset = 0
+
+        failed_offsets: List[int] = []
+        consecutive_failures = 0
+
+        async def fetch(page_offset: int) -> Optional[Tuple[int, Dict[str, List[dict]]]]:
+            async with self._semaphore:
+                try:
+                    # Страница разбирается потоково, элементы других городов не накапливаются
+                    return await parser.fetch_page_partitions(offset=page_offset, limit=page_size, cities=cities)
+                except SourceRequestError as e:
+                    # Страница пропускается, остальные загруженные страницы сохраняются
+                    PARSER_FAILED_PAGES.inc()
+                    logger.error(f"Страница offset={page_offset} не загружена, пропускаем: {e}")
+                    return None
+
+        while True:
+            offsets = [offset + i * page_size for i in range(concurrency)]
+            wave = await asyncio.gather(*(fetch(page_offset) for page_offset in offsets))
+            last_page = False
+            for page_offset, page in zip(offsets, wave):
+                if page is None:
+                    failed_offsets.append(page_offset)
+                    consecutive_failures += 1
+                    if consecutive_failures >= settings.PARSER_MAX_FAILED_PAGES:
+                        logger.error(f"Подряд не загружено {consecutive_failures} страниц, загрузка прекращена")
+                        last_page = True
+                        break
+                    continue
+                consecutive_failures = 0
+                page_records, page_partitions = page
+                if page_records:
+                    pages += 1
+                    records += page_records
+                    for city, city_items in page_partitions.items():
+                        if max_results:
+                            city_items = city_items[:max(0, max_results - len(partitions[city]))]
+                        partitions[city].extend(city_items)
+                if page_records < page_size:
+                    last_page = True
+                    break
+                if max_results and all(len(items) >= max_results for items in partitions.values()):
+                    logger.info(f"У всех городов общей выгрузки набралось {max_results} записей, загрузка прекращена")
+                    last_page = True
+                    break
+            if last_page:
+                break
+            offset += concurrency * page_size
+
+        seconds = time.perf_counter() - started
+        kept = sum(len(items) for items in partitions.values())
+        logger.info(
+            f"Общая выгрузка источника: {records} записей, {pages} страниц за {seconds:.1f} c; "
+            f"в регионы попало {kept} записей"
+        )
+        return SharedListing(
+            partitions=partitions,
+            pages=pages,
+            records=records,
+            fetched_at=time.monotonic(),
+            seconds=seconds,
+            failed_offsets=tuple(failed_offsets),
+        )
@@ -0,0 +1,171 @@
+"""Сервис подбора ЖК для домов по адресу."""
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import logging
+import threading
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.housing_complex import HousingComplex
+from app.utils.address import normalize_address, trigrams, trigram_similarity
+
+logger = logging.getLogger(__name__)
+
+
+class MatchCandidate(NamedTuple):
+    """Кандидат ЖК для дома."""
+    housing_complex_id: int
+    name: str
+    address: Optional[str]
+    score: float
+
+
+class _IndexedComplex(NamedTuple):
+    """ЖК в индексе матчера."""
+    id: int
+    name: str
+    address: Optional[str]
+    city: str
+    street_key: str
+    street_trigrams: Set[str]
+
+
+class AddressMatcher:
+    """
+    Подбор ЖК для домов по нормализованному адресу.
+
+    Строит в памяти инвертированный индекс "токен улицы → ЖК" и ранжирует
+    кандидатов по похожести триграмм названия улицы. Индекс строится один раз,
+    после чего сопоставление пачки адресов не требует запросов к БД.
+    """
+
+    # Доля ЖК, выше которой токен считается слишком частым для индекса
+    MAX_TOKEN_SHARE = 0.05
+    # Но не меньше этого количества ЖК: на небольших данных доля - единицы ЖК,
+    # и из индекса ушли бы почти все общие токены улиц
+    MIN_TOKEN_POSTINGS = 50
+    # Минимальная похожесть улиц для попадания в кандидаты
+    MIN_SCORE = 0.3
+
+    def __init__(self, complexes: Iterable[Tuple[int, str, Optional[str]]]):
+        """
+        Построить индекс.
+
+        Args:
+            complexes: Кортежи (id, name, address) жилых комплексов
+        """
+        self._complexes: Dict[int, _IndexedComplex] = {}
+        self._by_street: Dict[str, List[int]] = defaultdict(list)
+        self._by_token: Dict[str, List[int]] = defaultdict(list)
+
+        for complex_id, name, address in complexes:
+            normalized = normalize_address(address)
+            street_key = normalized.street_key
+            self._complexes[complex_id] = _IndexedComplex(
+                id=complex_id,
+                name=name,
+                address=address,
+                city=normalized.city,
+                street_key=street_key,
+                street_trigrams=trigrams(normalized.street),
+            )
+            if not normalized.street:
+                continue
+            self._by_street[street_key].append(complex_id)
+            for token in set(normalized.street.split()):
+                self._by_token[token].append(complex_id)
+
+        # Убираем слишком частые токены - они не помогают отличать ЖК
+        max_postings = max(self.MIN_TOKEN_POSTINGS, int(len(self._complexes) * self.MAX_TOKEN_SHARE))
+        for token in [t for t, ids in self._by_token.items() if len(ids) > max_postings]:
+            del self._by_token[token]
+
+        logger.info(
+            f"Индекс матчера построен: {len(self._complexes)} ЖК, "
+            f"{len(self._by_street)} улиц, {len(self._by_token)} токенов"
+        )
+
+    @classmethod
+    def from_db(cls, db: Session) -> "AddressMatcher":
+        """Построить индекс по всем ЖК из БД."""
+        rows = db.query(
+            HousingComplex.id, HousingComplex.name, HousingComplex.address
+        ).yield_per(5000)
+        return cls(rows)
+
+    def __len__(self) -> int:
+        return len(self._complexes)
+
+    def match(self, address: str, limit: int = 5) -> List[MatchCandidate]:
+        """
+        Подобрать ЖК для одного адреса.
+
+        Args:
+            address: Адрес дома в свободной форме
+            limit: Максимальное количество кандидатов
+
+        Returns:
+            Кандидаты, отсортированные по убыванию score
+        """
+        normalized = normalize_address(address)
+        if not normalized.street:
+            return []
+
+        candidate_ids: Set[int] = set(self._by_street.get(normalized.street_key, ()))
+        for token in normalized.street.split():
+            candidate_ids.update(self._by_token.get(token, ()))
+        if not candidate_ids:
+            return []
+
+        house_trigrams = trigrams(normalized.street)
+        scored = []
+        for complex_id in candidate_ids:
+            indexed = self._complexes[complex_id]
+            score = trigram_similarity(house_trigrams, indexed.street_trigrams)
+            if indexed.street_key == normalized.street_key:
+                score = max(score, 0.9)
+            # Совпадение/расхождение города уточняет оценку
+            if normalized.city and indexed.city:
+                score = min(1.0, score + 0.1) if indexed.city == normalized.city else score * 0.5
+            if score >= self.MIN_SCORE:
+                scored.append(MatchCandidate(
+                    housing_complex_id=indexed.id,
+                    name=indexed.name,
+                    address=indexed.address,
+                    score=round(score, 4),
+                ))
+
+        scored.sort(key=lambda c: (-c.score, c.housing_complex_id))
+        return scored[:limit]
+
+    def match_batch(self, addresses: Iterable[str], limit: int = 5) -> Dict[str, List[MatchCandidate]]:
+        """Подобрать ЖК для пачки адресов."""
+        return {address: self.match(address, limit=limit) for address in addresses}
+
+
+_cached_matcher: Optional[AddressMatcher] = None
+_cached_version: Optional[tuple] = None
+_build_lock = threading.Lock()
+
+
+def get_matcher(db: Session) -> AddressMatcher:
+    """
+    Получить индекс матчера, перестраивая его только при изменении ЖК.
+
+    Версия индекса - (количество ЖК, max(updated_at)); её проверка - один
+    дешёвый запрос вместо полной перестройки индекса на каждый вызов.
+    Блокирующая: из async обработчиков вызывается в потоке (asyncio.to_thread).
+    Индекс перестраивается одним потоком, остальные ждут и получают готовый.
+    """
+    global _cached_matcher, _cached_version
+    version = tuple(db.query(
+        func.count(HousingComplex.id), func.max(HousingComplex.updated_at)
+    ).one())
+    if _cached_matcher is not None and version == _cached_version:
+        return _cached_matcher
+    with _build_lock:
+        if _cached_matcher is None or version != _cached_version:
+            _cached_matcher = AddressMatcher.from_db(db)
+            _cached_version = version
+        return _cached_matcher
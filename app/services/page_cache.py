@@ -0,0 +1,154 @@
+"""Дисковый кэш сырых ответов API источника."""
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Версия обработки страниц: увеличивается, когда актуализация начинает сохранять
+# новые поля, чтобы все страницы были обработаны заново
+PROCESSING_VERSION = 2
+
+
+class ProcessedMarker(NamedTuple):
+    """Отметка об обработке страницы (хранится в БД, см. app/models/processed_page.py)."""
+    content_hash: str  # Хэш ответа, с которым страница записана в БД
+    records: int  # Записей на странице до фильтрации
+    complexes: int  # ЖК города на странице
+
+
+def content_hash(text: str) -> str:
+    """Хэш содержимого ответа."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class PageCache:
+    """
+    Кэш сырых страниц API на диске с вытеснением давно не использованных (LRU).
+
+    Для каждой страницы (endpoint, offset, limit, search, параметры) хранятся:
+    - <key>.json.gz - последний ответ API (gzip), он же журнал сырых данных
+    - <key>.meta.json - хэш содержимого, время загрузки и параметры запроса
+
+    Отметка об обработке (хэш, с которым страница последний раз записана в БД)
+    хранится не здесь, а в БД (processed_pages): она коммитится вместе с данными
+    страницы и не переживает восстановление или пересоздание БД. Если хэш новой
+    страницы совпадает с отметкой, страница не изменилась и её можно не разбирать
+    и не сравнивать с БД.
+    Общий размер сжатых ответов ограничен max_bytes (0 - кэш выключен).
+    Методы с файловым вводом-выводом блокирующие: парсер вызывает их в потоке
+    (asyncio.to_thread), поэтому изменения состава кэша выполняются под блокировкой.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # Ключ → размер сжатого ответа, от давно использованных к недавним
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(endpoint: str, offset: int, limit: int, search: str = "", params: Optional[Dict[str, str]] = None) -> str:
+        """Ключ страницы в кэше."""
+        raw = json.dumps([endpoint, offset, limit, search or "", sorted((params or {}).items())], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def _payload_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json.gz"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.meta.json"
+
+    def _load_index(self):
+        """Прочитать состав кэша с диска (один раз)."""
+        if self._entries is not None:
+            return
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        if not self.directory.exists():
+            return
+        payloads = sorted(self.directory.glob("*.json.gz"), key=lambda path: path.stat().st_mtime)
+        for path in payloads:
+            size = path.stat().st_size
+            self._entries[path.name[:-len(".json.gz")]] = size
+            self._total_bytes += size
+
+    def _read_meta(self, key: str) -> Optional[dict]:
+        try:
+            return json.loads(self._meta_path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, key: str, meta: dict):
+        self._meta_path(key).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+    def _touch(self, key: str):
+        """Отметить использование записи (для LRU)."""
+        self._entries.move_to_end(key)
+        try:
+            os.utime(self._payload_path(key))
+        except OSError:
+            pass
+
+    def put(self, key: str, text: str, page_hash: str, records: int, request: dict):
+        """Сохранить ответ API (ответ перезаписывается, только если содержимое изменилось)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._load_index()
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                meta = self._read_meta(key) or {}
+                if meta.get("content_hash") != page_hash:
+                    payload_path = self._payload_path(key)
+                    payload_path.write_bytes(gzip.compress(text.encode("utf-8"), compresslevel=6))
+                    self._total_bytes += payload_path.stat().st_size - self._entries.get(key, 0)
+                    self._entries[key] = payload_path.stat().st_size
+                    meta = {"content_hash": page_hash}
+                meta.update(
+                    fetched_at=datetime.now(timezone.utc).isoformat(),
+                    records=records,
+                    request=request,
+                )
+                self._write_meta(key, meta)
+                self._touch(key)
+                self._evict()
+            except OSError as e:
+                logger.warning(f"Не удалось сохранить страницу в кэш ответов: {e}")
+
+    def _evict(self):
+        """Удалить давно не использованные страницы сверх лимита размера."""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            for path in (self._payload_path(key), self._meta_path(key)):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+
+_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> PageCache:
+    """Общий для процесса кэш ответов API."""
+    global _cache
+    if _cache is None:
+        _cache = PageCache(settings.PARSER_PAGE_CACHE_DIR, settings.PARSER_PAGE_CACHE_MAX_MB * 1024 * 1024)
+    return _cache
@@ -1,25 +1,134 @@
 """Парсер данных о жилых комплексах с наш.дом.рф через API с использованием Playwright и Stealth."""
-from typing import List, Optional, NamedTuple
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, NamedTuple, Sequence, Tuple
 from pydantic import ValidationError
-from playwright.async_api import async_playwright, Browser, Page, BrowserContext
+from playwright.async_api import async_playwright, Browser, Page, BrowserContext, Error as PlaywrightError, Route
 from playwright_stealth import Stealth
+import asyncio
 import logging
-from urllib.parse import quote
+from urllib.parse import quote, urlsplit
 import json
 import re
+import time
+import weakref
 
 from app.schemas.parser import ComplexParsedDTO
 from app.config import get_settings
+from app.services.page_cache import ProcessedMarker, content_hash, get_page_cache
+from app.services.rate_limit import (
+    CHALLENGE,
+    NETWORK_ERROR,
+    RETRYABLE,
+    SourceRequestError,
+    backoff_delay,
+    classify_error,
+    get_rate_limiter,
+    parse_retry_after,
+)
+from app.utils.metrics import (
+    PARSER_ANTIBOT_WAIT,
+    PARSER_BLOCKED_REQUESTS,
+    PARSER_DETAIL_FETCHES,
+    PARSER_PAGE_FETCH_DURATION,
+    PARSER_PAGE_RECORDS,
+    PARSER_REQUEST_ERRORS,
+    PARSER_RETRIES,
+    PARSER_UNCHANGED_PAGES,
+    PARSER_VALIDATION_FAILURES,
+)
+from app.utils.json_stream import iter_list_items
+from app.utils.tracing import NullTracer, Tracer
+
+
+class CityMatcher:
+    """
+    Поиск города в адресе (shortAddr) сразу для нескольких городов.
+    
+    Все города объединены в одно регулярное выражение с альтернативами
+    (более длинные названия первыми), поэтому адрес проверяется один раз
+    независимо от количества городов. Ищется "г. {город}" или "{город}",
+    за которым следует пробел, запятая или конец строки.
+    
+    match_all() возвращает все города, которые нашёл бы фильтр каждого города
+    по отдельности: адрес может упоминать несколько городов.
+    """
+    
+    def __init__(self, cities: Sequence[str]):
+        # Нормализованное название → название как в настройках
+        self.cities = {city.strip().lower(): city for city in cities if city and city.strip()}
+        alternatives = sorted(self.cities, key=len, reverse=True)
+        self.pattern = re.compile(
+            r'(?<!\w)(?:г\.\s*)?(' + '|'.join(re.escape(city) for city in alternatives) + r')(?:\s|$|,)',
+            re.IGNORECASE
+        )
+        # Выражения отдельных городов: проверяются, только если общее нашло совпадение
+        self._city_patterns = (
+            {city: self._city_pattern(city) for city in self.cities} if len(self.cities) > 1 else {}
+        )
+    
+    @staticmethod
+    def _city_pattern(city: str) -> "re.Pattern":
+        return re.compile(r'(?<!\w)(?:г\.\s*)?(' + re.escape(city) + r')(?:\s|$|,)', re.IGNORECASE)
+    
+    def match(self, address) -> Optional[str]:
+        """Город из адреса (как в настройках) или None."""
+        if not self.cities or not isinstance(address, str) or not address:
+            return None
+        found = self.pattern.search(address)
+        return self.cities.get(found.group(1).lower()) if found else None
+    
+    def match_all(self, address) -> List[str]:
+        """Все города из адреса (как в настройках)."""
+        city = self.match(address)
+        if city is None or not self._city_patterns:
+            return [] if city is None else [city]
+        return [self.cities[name] for name, pattern in self._city_patterns.items() if pattern.search(address)]
+
+
+@lru_cache(maxsize=32)
+def get_city_matcher(cities: Tuple[str, ...]) -> CityMatcher:
+    """Скомпилированный CityMatcher для набора городов."""
+    return CityMatcher(cities)
 
 
 class FetchResult(NamedTuple):
     """Результат запроса парсера с метаинформацией."""
     complexes: List[ComplexParsedDTO]  # Отфильтрованные результаты
     total_requested: int  # Количество записей, запрошенных у API (до фильтрации)
+    cache_key: Optional[str] = None  # Ключ страницы в кэше ответов
+    content_hash: Optional[str] = None  # Хэш содержимого ответа API
+    unchanged: bool = False  # Страница не изменилась с последней обработки (complexes пуст)
+    unchanged_records: int = 0  # ЖК города на странице при последней обработке
+    response_size: int = 0  # Длина ответа API (символов)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Описания ЖК по (hobjId, data_hash): пока данные ЖК не изменились, детали повторно не загружаются
+_detail_cache: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+
+# Типы запросов, нужные для прохождения антибота и запросов к API; остальные
+# (картинки, шрифты, стили, медиа, websocket и т.п.) браузер не загружает
+ALLOWED_RESOURCE_TYPES = frozenset({"document", "script", "xhr", "fetch"})
+# Интервал проверки признаков прохождения антибота (мс)
+ANTIBOT_POLL_INTERVAL_MS = 250
+# Ожидание исчезновения индикатора загрузки, если признаки прохождения не появились (мс)
+ANTIBOT_SPINNER_TIMEOUT_MS = 8000
+
+
+def _split_setting(value: str) -> FrozenSet[str]:
+    """Значения настройки через запятую."""
+    return frozenset(item.strip().lower() for item in value.split(",") if item.strip())
+
+
+def is_request_allowed(resource_type: str, url: str, allowed_domains: FrozenSet[str]) -> bool:
+    """Разрешён ли запрос браузера: нужный тип и домен из списка (или его поддомен)."""
+    if resource_type not in ALLOWED_RESOURCE_TYPES:
+        return False
+    host = (urlsplit(url).hostname or "").lower()
+    return any(host == domain or host.endswith(f".{domain}") for domain in allowed_domains)
+
 
 class NashDomParser:
     """
@@ -39,6 +148,10 @@ class NashDomParser:
     
     # Известный API endpoint для получения ЖК
     API_ENDPOINT = f"{BASE_URL}/сервисы/api/kn/object"
+    # API endpoint деталей ЖК: {DETAIL_API_ENDPOINT}/{hobjId}
+    DETAIL_API_ENDPOINT = f"{BASE_URL}/сервисы/api/object"
+    # Поля описания в ответе деталей (первое непустое)
+    DESCRIPTION_FIELDS = ("objDescription", "objDesc", "description", "descr")
     
     def __init__(self, headless: Optional[bool] = None):
         """
@@ -52,20 +165,49 @@ class NashDomParser:
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
+        # Трассировщик этапов; DataUpdater подставляет свой на время запуска
+        self.tracer: Tracer = NullTracer()
+        # Кэш сырых ответов API (общий для процесса)
+        self.page_cache = get_page_cache()
+        # Отметки об обработке страниц (ключ в кэше ответов → отметка): DataUpdater
+        # загружает их из БД на время запуска, без них страницы не пропускаются
+        self.processed_pages: Dict[str, ProcessedMarker] = {}
+        # Страницы могут загружаться параллельно: браузер запускается один раз
+        self._init_lock = asyncio.Lock()
+        # Прогретая страница для запросов деталей ЖК (открывается при первом запросе)
+        self._detail_page: Optional[Page] = None
+        self._detail_lock = asyncio.Lock()
+        # Повторное прохождение антибота на странице (навигация) - одно на все её запросы:
+        # блокировка и количество прохождений по страницам
+        self._antibot_locks: "weakref.WeakKeyDictionary[Page, asyncio.Lock]" = weakref.WeakKeyDictionary()
+        self._antibot_passes: "weakref.WeakKeyDictionary[Page, int]" = weakref.WeakKeyDictionary()
+        self.allowed_domains = _split_setting(settings.PARSER_ALLOWED_DOMAINS)
+        self.antibot_cookies = _split_setting(settings.PARSER_ANTIBOT_COOKIES)
+        # Cookie проверки ни разу не появились (имена не совпадают): ожидание - фиксированная пауза
+        self._antibot_cookies_missing = False
+        # Неудачных попыток запросов к API (таймауты, 429/5xx, антибот): по приросту
+        # DataUpdater уменьшает размер страницы
+        self.request_errors = 0
     
     async def _init_browser(self):
         """Инициализировать браузер Playwright с Stealth."""
+        async with self._init_lock:
+            await self._launch_browser()
+    
+    async def _launch_browser(self):
+        """Запустить браузер и создать контекст, если они ещё не созданы."""
         if self.browser is None:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                ]
-            )
+            with self.tracer.span("browser_launch"):
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(
+                    headless=self.headless,
+                    args=[
+                        '--disable-blink-features=AutomationControlled',
+                        '--disable-dev-shm-usage',
+                        '--no-sandbox',
+                        '--disable-setuid-sandbox',
+                    ]
+                )
             
             # Создаём контекст с реалистичными параметрами браузера
             self.context = await self.browser.new_context(
@@ -74,6 +216,9 @@ class NashDomParser:
                 viewport={"width": 1400, "height": 900},
                 timezone_id='Europe/Moscow',
             )
+            if settings.PARSER_BLOCK_RESOURCES:
+                # Перехват на уровне контекста: действует на все страницы, включая страницу деталей
+                await self.context.route("**/*", self._route_request)
             
             logger.info(f"Браузер Playwright инициализирован (headless={self.headless})")
     
@@ -83,27 +228,104 @@ class NashDomParser:
         await stealth.apply_stealth_async(page)
         logger.debug("Stealth применён к странице")
     
-    async def _wait_for_antibot(self, page: Page):
-        """Дождаться обхода антибот-системы."""
-        # Ждём загрузки страницы
-        await page.goto(self.SEARCH_URL, wait_until="networkidle", timeout=60000)
+    async def _route_request(self, route: Route):
+        """Пропустить запрос браузера из списка разрешённых, остальные отклонить."""
+        request = route.request
+        if is_request_allowed(request.resource_type, request.url, self.allowed_domains):
+            await route.continue_()
+            return
+        PARSER_BLOCKED_REQUESTS.inc(resource_type=request.resource_type)
+        await route.abort()
+    
+    async def _antibot_cookie_values(self) -> Dict[str, str]:
+        """Текущие значения cookie проверки (PARSER_ANTIBOT_COOKIES)."""
+        if not self.antibot_cookies:
+            return {}
+        cookies = await self.context.cookies(self.BASE_URL)
+        return {
+            cookie["name"].lower(): cookie["value"]
+            for cookie in cookies
+            if cookie["name"].lower() in self.antibot_cookies
+        }
+    
+    async def _antibot_passed(self, page: Page, before: Optional[Dict[str, str]]) -> bool:
+        """
+        Признак прохождения антибота: есть cookie проверки и нет индикатора загрузки.
         
-        # Ждём 6 секунд для работы антибота (как в примере)
-        await page.wait_for_timeout(6000)
+        before - значения cookie до повторной проверки (источник ответил проверкой
+        вместо данных): прежние cookie уже не принимаются, поэтому cookie должна
+        появиться или изменить значение. Cookie общие для страниц контекста: cookie,
+        выставленная параллельной проверкой, тоже засчитывается - запросы этой
+        страницы отправляются с ней.
+        """
+        current = await self._antibot_cookie_values()
+        if before is None:
+            if not current:
+                return False
+        elif not any(before.get(name) != value for name, value in current.items()):
+            return False
+        try:
+            return await page.query_selector(".spinner, #id_spinner") is None
+        except Exception:
+            # Страница проверки перезагружается (контекст выполнения пересоздан)
+            return False
+    
+    async def _wait_for_antibot(self, page: Page, repeat: bool = False):
+        """
+        Дождаться обхода антибот-системы.
         
-        # Пробуем дождаться исчезновения спиннера
+        Страница загружается до DOMContentLoaded (без ожидания тяжёлых ресурсов SPA,
+        которые и так отклоняются), затем ожидается cookie проверки (PARSER_ANTIBOT_COOKIES)
+        и отсутствие индикатора загрузки, но не дольше PARSER_ANTIBOT_TIMEOUT. При обычном
+        открытии страницы достаточно cookie, уже выставленной в контексте; при повторной
+        проверке (repeat) cookie должна обновиться (см. _antibot_passed).
+        
+        Если cookie не заданы или ни разу не появились (имена не совпадают - об этом
+        один раз пишется предупреждение), ожидание - фиксированная пауза PARSER_ANTIBOT_TIMEOUT
+        и исчезновение индикатора загрузки. Запросы выполняются в любом случае:
+        при проверке вместо данных запрос повторится с повторным прохождением антибота.
+        """
+        before = await self._antibot_cookie_values() if repeat else None
+        await page.goto(self.SEARCH_URL, wait_until="domcontentloaded", timeout=60000)
+        
+        if self.antibot_cookies and not self._antibot_cookies_missing:
+            deadline = asyncio.get_running_loop().time() + settings.PARSER_ANTIBOT_TIMEOUT
+            while asyncio.get_running_loop().time() < deadline:
+                if await self._antibot_passed(page, before):
+                    logger.debug("Антибот пройден")
+                    return
+                await page.wait_for_timeout(ANTIBOT_POLL_INTERVAL_MS)
+            if not await self._antibot_cookie_values():
+                self._antibot_cookies_missing = True
+                logger.warning(
+                    f"Cookie проверки ({', '.join(sorted(self.antibot_cookies))}) не появились за "
+                    f"{settings.PARSER_ANTIBOT_TIMEOUT:.0f} с - проверьте PARSER_ANTIBOT_COOKIES; "
+                    f"до конца работы парсера используется фиксированная пауза"
+                )
+            else:
+                logger.warning(
+                    f"Признаки прохождения антибота не появились за {settings.PARSER_ANTIBOT_TIMEOUT:.0f} с"
+                )
+        else:
+            await page.wait_for_timeout(settings.PARSER_ANTIBOT_TIMEOUT * 1000)
+        
+        # Признаков нет: как при фиксированной паузе, ждём исчезновения индикатора загрузки
         try:
             await page.wait_for_selector(
-                ".spinner, #id_spinner",
-                state="detached",
-                timeout=8000
+                ".spinner, #id_spinner", state="detached", timeout=ANTIBOT_SPINNER_TIMEOUT_MS
             )
-            logger.debug("Индикатор загрузки антибота исчез")
         except Exception as e:
             logger.debug(f"Индикатор загрузки антибота не исчез или уже исчез: {e}")
     
-    def _build_api_url(self, offset: int = 0, limit: int = 100, search: str = "") -> str:
-        """Построить URL API запроса с параметрами."""
+    def _build_api_url(
+        self, offset: int = 0, limit: int = 100, search: str = "", extra_params: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Построить URL API запроса с параметрами.
+        
+        extra_params - дополнительные параметры фильтрации на стороне источника
+        (например, код региона), передаются как есть.
+        """
         params = []
         
         if offset is not None:
@@ -113,91 +335,50 @@ class NashDomParser:
         if search:
             params.append(f"search={quote(search)}")
             params.append(f"searchValue={quote(search)}")
+        for name, value in (extra_params or {}).items():
+            params.append(f"{quote(str(name))}={quote(str(value))}")
         
         query_string = "&".join(params)
         return f"{self.API_ENDPOINT}?{query_string}" if params else self.API_ENDPOINT
     
-    def _extract_complexes_from_json(self, json_data) -> List[dict]:
+    def partition_items(self, complexes_list: List[dict], cities: Sequence[str]) -> Dict[str, List[dict]]:
         """
-        Извлечь список ЖК из JSON ответа API.
-        
-        Структура ответа: {"data": {"list": [...]}}
+        Разложить элементы по городам за один проход.
         
-        Args:
-            json_data: Распарсенный JSON ответ
-            
-        Returns:
-            Список словарей с данными ЖК
-        """
-        complexes_list = []
-        
-        # Структура согласно примеру: result['data']['list']
-        if isinstance(json_data, dict):
-            if 'data' in json_data and isinstance(json_data['data'], dict):
-                if 'list' in json_data['data']:
-                    complexes_list = json_data['data']['list']
-                    logger.debug("JSON ответ - объект с полем data.list")
-                else:
-                    # Если нет 'list', но есть 'data' как список
-                    if isinstance(json_data['data'], list):
-                        complexes_list = json_data['data']
-                        logger.debug("JSON ответ - объект с полем data (список)")
-            elif 'data' in json_data and isinstance(json_data['data'], list):
-                complexes_list = json_data['data']
-                logger.debug("JSON ответ - объект с полем data (список)")
-            elif 'list' in json_data and isinstance(json_data['list'], list):
-                complexes_list = json_data['list']
-                logger.debug("JSON ответ - объект с полем list")
-            # Если JSON - прямой массив
-            elif isinstance(json_data, list):
-                complexes_list = json_data
-                logger.debug("JSON ответ - прямой массив объектов")
-        
-        if not complexes_list:
-            logger.warning(f"Не удалось извлечь список ЖК из JSON. Структура: {type(json_data)}")
-            if isinstance(json_data, dict):
-                logger.debug(f"Ключи в JSON: {list(json_data.keys())}")
-                if 'data' in json_data:
-                    logger.debug(f"Тип data: {type(json_data['data'])}, ключи: {list(json_data['data'].keys()) if isinstance(json_data['data'], dict) else 'list'}")
-        
-        return complexes_list
-    
-    def _filter_by_city(self, complexes_list: List[dict], city: str) -> List[dict]:
-        """
-        Фильтровать список ЖК по городу, используя поле shortAddr и регулярное выражение.
-        
-        Ищет паттерн "г. {город}" или "{город}" в поле shortAddr.
+        Каждый shortAddr проверяется одним регулярным выражением сразу для всех
+        городов, поэтому одна страница общей выгрузки обслуживает все регионы.
+        Элемент, адрес которого упоминает несколько городов, попадает в каждый из них
+        (как при фильтрации по каждому городу отдельно). Элементы других городов
+        и элементы без адреса отбрасываются.
         
         Args:
             complexes_list: Список сырых JSON объектов ЖК
-            city: Название города для фильтрации (например, "Москва")
+            cities: Названия городов
             
         Returns:
-            Отфильтрованный список ЖК
+            Словарь город → список ЖК (ключи - названия городов как в cities)
         """
-        if not city or not complexes_list:
-            return complexes_list
-        
-        # Нормализуем название города (убираем лишние пробелы, приводим к нижнему регистру для поиска)
-        city_normalized = city.strip().lower()
-        
-        # Создаём паттерн для поиска: "г. {город}" или просто "{город}"
-        # Используем \b для границ слов, чтобы не находить подстроки
-        city_escaped = re.escape(city_normalized)
-        pattern = re.compile(
-            r'(?:г\.\s*)?' + city_escaped + r'(?:\s|$|,)',
-            re.IGNORECASE
-        )
-        
-        filtered = []
+        return self._partition(complexes_list, cities)[1]
+    
+    def _partition(self, complexes_list: Iterable[dict], cities: Sequence[str]) -> Tuple[int, Dict[str, List[dict]]]:
+        """partition_items() за один проход по итератору: (всего элементов, словарь город → ЖК)."""
+        matcher = get_city_matcher(tuple(cities))
+        buckets: Dict[str, List[dict]] = {city: [] for city in matcher.cities.values()}
+        total = 0
+        skipped = 0
         for item in complexes_list:
-            short_addr = item.get('shortAddr', '')
-            if short_addr and pattern.search(short_addr):
-                filtered.append(item)
-            else:
-                logger.debug(f"ЖК исключён из фильтрации по городу '{city}': shortAddr='{short_addr}'")
+            total += 1
+            if not isinstance(item, dict):
+                continue
+            cities_found = matcher.match_all(item.get('shortAddr'))
+            for city in cities_found:
+                buckets[city].append(item)
+            if not cities_found:
+                skipped += 1
         
-        return filtered
+        if skipped:
+            logger.debug(f"Исключено при фильтрации по городам: {skipped} ЖК")
+        return total, buckets
     
     def _map_json_to_dto(self, item: dict) -> dict:
         """
@@ -282,7 +463,8 @@ class NashDomParser:
         offset: int = 0,
         limit: int = 100,
         search: str = "",
-        return_metadata: bool = False
+        return_metadata: bool = False,
+        params: Optional[Dict[str, str]] = None,
     ) -> List[ComplexParsedDTO] | FetchResult:
         """
         Получить список жилых комплексов через API с использованием Playwright и Stealth.
@@ -302,13 +484,21 @@ class NashDomParser:
             return_metadata: Если True, возвращает FetchResult с метаинформацией о количестве
                            запрошенных записей (до фильтрации). Если False, возвращает только
                            список ComplexParsedDTO (по умолчанию False)
+            params: Параметры фильтрации на стороне источника (например, код региона);
+                    фильтрация по городу через shortAddr выполняется в любом случае
             
         Returns:
             Если return_metadata=False: Список объектов ComplexParsedDTO с данными о жилых комплексах
             Если return_metadata=True: FetchResult(complexes, total_requested) с отфильтрованными
                                       результатами и количеством запрошенных у API (до фильтрации)
             
+            Если ответ API совпадает с уже обработанным (отметка в processed_pages,
+            см. app/services/page_cache.py),
+            разбор страницы пропускается: возвращается FetchResult с unchanged=True,
+            пустым complexes и total_requested из кэша.
+            
         Raises:
+            SourceRequestError: Если страницу не удалось загрузить после повторов
             ValidationError: При ошибках валидации данных
             Exception: При других неожиданных ошибках
             
@@ -326,123 +516,495 @@ class NashDomParser:
             
             await parser.close()
         """
-        page: Optional[Page] = None
         try:
-            # Инициализируем браузер
-            await self._init_browser()
-            
-            # Создаём новую страницу
-            page = await self.context.new_page()
-            
+            attempt = 0
+            while True:
+                attempt += 1
+                text, cache_key, page_hash = await self._fetch_page(offset, limit, search, params)
+                marker = self.processed_pages.get(cache_key) if text and self.page_cache.enabled else None
+                if marker is not None and marker.content_hash == page_hash:
+                    # Ответ не изменился с последней обработки: разбирать и сравнивать с БД нечего
+                    PARSER_UNCHANGED_PAGES.inc()
+                    logger.info(f"Страница offset={offset} не изменилась, обработка пропущена")
+                    await self._cache_page(offset, limit, search, params, text, cache_key, page_hash, marker.records)
+                    fetch_result = FetchResult(
+                        complexes=[],
+                        total_requested=marker.records,
+                        cache_key=cache_key,
+                        content_hash=page_hash,
+                        unchanged=True,
+                        unchanged_records=marker.complexes,
+                        response_size=len(text),
+                    )
+                    break
+                try:
+                    # Элементы разбираются из ответа по одному и сразу фильтруются и валидируются
+                    fetch_result = self.parse_items(self._iter_page_items(text), search=search)._replace(
+                        cache_key=cache_key, content_hash=page_hash, response_size=len(text or "")
+                    )
+                except SourceRequestError as e:
+                    # Оборванный ответ в кэш не сохраняется
+                    await self._retry_broken_page(e, attempt, offset)
+                    continue
+                await self._cache_page(
+                    offset, limit, search, params, text, cache_key, page_hash, fetch_result.total_requested
+                )
+                break
+        except Exception as e:
+            logger.error(f"Неожиданная ошибка при парсинге ЖК: {e}", exc_info=True)
+            raise
+        
+        if return_metadata:
+            return fetch_result
+        return fetch_result.complexes
+    
+    async def _open_warm_page(self) -> Page:
+        """Открыть страницу браузера с применением Stealth и пройденным антиботом."""
+        # Инициализируем браузер
+        await self._init_browser()
+        
+        # Создаём новую страницу
+        page = await self.context.new_page()
+        try:
             # Применяем Stealth для обхода детекции
             await self._apply_stealth(page)
             
             # Ждём обхода антибот-системы
-            await self._wait_for_antibot(page)
+            with self.tracer.span("antibot_wait"), PARSER_ANTIBOT_WAIT.time():
+                await self._wait_for_antibot(page)
+        except Exception:
+            await page.close()
+            raise
+        return page
+    
+    async def _fetch_page_text(
+        self, offset: int, limit: int, search: str, params: Optional[Dict[str, str]] = None
+    ) -> Optional[str]:
+        """
+        Загрузить сырой ответ (текст JSON) одной страницы API через браузер.
+        
+        Открывает страницу с применением Stealth, ждёт обхода антибот-системы
+        и выполняет API запрос (см. _request_text).
+        
+        Raises:
+            SourceRequestError: Если страницу не удалось загрузить
+        """
+        page: Optional[Page] = None
+        try:
+            page = await self._open_warm_page()
             
             # Формируем URL API запроса
-            api_url = self._build_api_url(offset=offset, limit=limit, search=search)
+            api_url = self._build_api_url(offset=offset, limit=limit, search=search, extra_params=params)
             logger.info(f"Выполнение API запроса: {api_url}")
-            
-            # Выполняем API запрос через JavaScript fetch в браузере
-            js_code = f"""
-                async () => {{
-                    try {{
-                        const response = await fetch("{api_url}", {{
-                            method: "GET",
-                            credentials: "include"
-                        }});
-                        
-                        if (!response.ok) {{
-                            return {{ error: `HTTP ${{response.status}}: ${{response.statusText}}` }};
-                        }}
-                        
-                        const json = await response.json().catch(() => null);
-                        if (!json) {{
-                            return {{ error: "Failed to parse JSON" }};
-                        }}
-                        
-                        return json;
-                    }} catch (error) {{
-                        return {{ error: error.message }};
+            return await self._request_text(page, api_url, "page_fetch", offset=offset, limit=limit)
+        finally:
+            if page:
+                await page.close()
+    
+    async def _request_text(self, page: Page, api_url: str, span: str, **span_attrs) -> Optional[str]:
+        """
+        Выполнить API запрос через page.evaluate() с JavaScript fetch и вернуть тело ответа.
+        
+        span - имя этапа в отчёте трассировки (page_fetch, detail_fetch).
+        
+        Запросы проходят через общий адаптивный ограничитель частоты. Ошибки
+        классифицируются (см. app/services/rate_limit.py): при антиботе, 429, 5xx
+        и сетевых ошибках запрос повторяется с экспоненциальной задержкой и
+        джиттером (до PARSER_RETRY_ATTEMPTS попыток), при антиботе перед повтором
+        заново проходится проверка (см. _repeat_antibot). Исключения Playwright
+        (навигация, уничтоженный контекст, закрытая страница, падение браузера)
+        считаются сетевыми ошибками и тоже повторяются.
+        
+        Raises:
+            SourceRequestError: Если запрос не удался
+        """
+        limiter = get_rate_limiter()
+        antibot_lock = self._antibot_locks.setdefault(page, asyncio.Lock())
+        
+        # Выполняем API запрос через JavaScript fetch в браузере.
+        # Ответ оборачивается, чтобы передать статус и заголовки для классификации ошибок.
+        # Тело передаётся текстом: по нему считается хэш для кэша ответов
+        js_code = f"""
+            async () => {{
+                try {{
+                    const response = await fetch("{api_url}", {{
+                        method: "GET",
+                        credentials: "include"
+                    }});
+                    const meta = {{
+                        status: response.status,
+                        contentType: response.headers.get("Content-Type") || "",
+                        retryAfter: response.headers.get("Retry-After"),
+                    }};
+                    
+                    if (!response.ok) {{
+                        return {{ ...meta, error: `HTTP ${{response.status}}: ${{response.statusText}}` }};
                     }}
+                    
+                    const text = await response.text();
+                    const start = text.trimStart().charAt(0);
+                    if (start !== "{{" && start !== "[") {{
+                        return {{ ...meta, error: "Failed to parse JSON" }};
+                    }}
+                    
+                    return {{ ...meta, text }};
+                }} catch (error) {{
+                    return {{ status: 0, error: error.message }};
                 }}
-            """
-            
-            result = await page.evaluate(js_code)
-            
-            if not result:
-                logger.error("JSON не удалось получить - результат пустой")
-                return []
-            
-            if 'error' in result:
-                logger.error(f"Ошибка при выполнении запроса: {result['error']}")
-                raise Exception(f"API запрос не удался: {result['error']}")
-            
-            logger.info(f"Получен JSON ответ от API")
+            }}
+        """
+        
+        attempt = 0
+        while True:
+            attempt += 1
+            await limiter.acquire()
+            if antibot_lock.locked():
+                # На странице заново проходится антибот: навигация прервала бы запрос
+                async with antibot_lock:
+                    pass
+            passes = self._antibot_passes.get(page, 0)
+            with self.tracer.span(
+                span, attempt=attempt, **span_attrs
+            ), PARSER_PAGE_FETCH_DURATION.time():
+                try:
+                    response = await page.evaluate(js_code)
+                except PlaywrightError as e:
+                    response = {"status": 0, "error": str(e)}
             
-            # Сохраняем JSON для отладки
-            # try:
-            #     with open("debug_api_response.json", "w", encoding="utf-8") as f:
-            #         json.dump(result, f, ensure_ascii=False, indent=2)
-            #     logger.debug("JSON ответ сохранён в debug_api_response.json")
-            # except Exception as e:
-            #     logger.debug(f"Не удалось сохранить JSON: {e}")
+            if response and 'error' not in response:
+                limiter.on_success()
+                return response.get('text')
             
-            # Извлекаем список ЖК из JSON
-            complexes_list = self._extract_complexes_from_json(result)
+            response = response or {"status": 0, "error": "Пустой ответ"}
+            retry_after = parse_retry_after(response.get('retryAfter'))
+            kind = classify_error(response.get('status'), response.get('contentType', ''), retry_after)
+            PARSER_REQUEST_ERRORS.inc(kind=kind)
+            self.request_errors += 1
+            message = f"API запрос не удался ({kind}): {response['error']}"
             
-            if not complexes_list:
-                logger.warning("Список ЖК пуст в JSON ответе")
-                if return_metadata:
-                    return FetchResult(complexes=[], total_requested=0)
-                return []
+            if kind not in RETRYABLE or attempt >= settings.PARSER_RETRY_ATTEMPTS:
+                logger.error(f"{message} ({api_url}, попытка {attempt})")
+                raise SourceRequestError(message, kind=kind, status=response.get('status'))
             
-            # Сохраняем количество запрошенных у API (до фильтрации)
-            total_requested = len(complexes_list)
-            logger.info(f"Найдено {total_requested} ЖК в JSON ответе")
+            if kind != NETWORK_ERROR:
+                limiter.on_throttle()
+            delay = max(backoff_delay(attempt), retry_after or 0)
+            logger.warning(f"{message}; повтор через {delay:.1f} c ({api_url}, попытка {attempt})")
+            PARSER_RETRIES.inc()
+            await asyncio.sleep(delay)
             
-            # Фильтруем по городу, если указан параметр search
-            if search:
-                complexes_list = self._filter_by_city(complexes_list, search)
-                logger.info(f"После фильтрации по городу '{search}': {len(complexes_list)} ЖК")
+            if kind == CHALLENGE:
+                await self._repeat_antibot(page, passes)
+    
+    async def _repeat_antibot(self, page: Page, passes: int):
+        """
+        Заново пройти антибот на странице после ответа-проверки.
+        
+        passes - количество прохождений на странице на момент запроса. Запросы,
+        одновременно получившие проверку на общей странице (детали ЖК), проходят
+        её один раз: остальные ждут и повторяют запрос. Ошибка навигации не
+        прерывает запрос - следующая попытка классифицирует её ответ.
+        """
+        async with self._antibot_locks.setdefault(page, asyncio.Lock()):
+            if self._antibot_passes.get(page, 0) != passes:
+                return
+            try:
+                with self.tracer.span("antibot_wait", retry=True), PARSER_ANTIBOT_WAIT.time():
+                    await self._wait_for_antibot(page, repeat=True)
+            except PlaywrightError as e:
+                logger.warning(f"Повторное прохождение антибота не удалось: {e}")
+                return
+            self._antibot_passes[page] = passes + 1
+    
+    async def _fetch_page(
+        self, offset: int, limit: int, search: str, params: Optional[Dict[str, str]] = None
+    ) -> Tuple[Optional[str], str, Optional[str]]:
+        """Загрузить страницу API. Возвращает (текст ответа, ключ в кэше ответов, хэш содержимого)."""
+        text = await self._fetch_page_text(offset=offset, limit=limit, search=search, params=params)
+        cache_key = self.page_cache.key(self.API_ENDPOINT, offset, limit, search, params)
+        return text, cache_key, content_hash(text) if text else None
+    
+    async def _cache_page(
+        self,
+        offset: int,
+        limit: int,
+        search: str,
+        params: Optional[Dict[str, str]],
+        text: Optional[str],
+        cache_key: str,
+        page_hash: Optional[str],
+        records: int,
+    ):
+        """Сохранить ответ API в кэш ответов (сжатие и запись на диск - в потоке, не в цикле событий)."""
+        if not text or not self.page_cache.enabled:
+            return
+        request = {"offset": offset, "limit": limit, "search": search, "params": params or {}}
+        await asyncio.to_thread(self.page_cache.put, cache_key, text, page_hash, records, request)
+    
+    def _iter_page_items(self, text: Optional[str]) -> Iterator[dict]:
+        """
+        Сырые элементы data.list из ответа API по одному (потоковый разбор).
+        
+        Ответ не превращается в объекты Python целиком (см. app/utils/json_stream.py):
+        одновременно в памяти только текущий элемент, поэтому память на разбор не растёт
+        с размером страницы. Время разбора учитывается как этап json_extraction.
+        
+        Raises:
+            SourceRequestError: Если ответ оборван или не является корректным JSON
+                                (после того, как часть элементов уже выдана)
+        """
+        if not text:
+            logger.error("JSON не удалось получить - результат пустой")
+            return
+        
+        logger.info(f"Получен JSON ответ от API")
+        
+        started = time.perf_counter()
+        spent = 0.0
+        records = 0
+        items = iter_list_items(text)
+        try:
+            while True:
+                step = time.perf_counter()
+                try:
+                    item = next(items)
+                except StopIteration:
+                    break
+                except ValueError as e:
+                    # Неполная страница считалась бы последней и остаток источника был бы потерян
+                    raise SourceRequestError(
+                        f"Ответ API оборван или повреждён (после {records} элементов): {e}", kind=NETWORK_ERROR
+                    ) from e
+                finally:
+                    spent += time.perf_counter() - step
+                records += 1
+                yield item
+        finally:
+            self.tracer.record("json_extraction", started, spent, {"records": records})
+            # Количество записей, полученных у API (до фильтрации)
+            PARSER_PAGE_RECORDS.observe(records)
+        
+        if not records:
+            logger.warning("Не удалось извлечь список ЖК из JSON ответа")
+    
+    async def fetch_page_partitions(
+        self,
+        offset: int,
+        limit: int,
+        cities: Sequence[str],
+        search: str = "",
+        params: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, Dict[str, List[dict]]]:
+        """
+        Загрузить страницу API и разложить её сырые элементы по городам (см. partition_items()).
+        
+        Используется для общей выгрузки источника. Элементы разбираются из ответа
+        по одному, элементы других городов сразу отбрасываются. Ответ сохраняется
+        в кэш ответов, но не пропускается: отметок об обработке у общей выгрузки нет.
+        
+        Returns:
+            (количество элементов на странице до фильтрации, словарь город → элементы)
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            text, cache_key, page_hash = await self._fetch_page(offset, limit, search, params)
+            try:
+                records, partitions = self._partition(self._iter_page_items(text), cities)
+            except SourceRequestError as e:
+                await self._retry_broken_page(e, attempt, offset)
+                continue
+            await self._cache_page(offset, limit, search, params, text, cache_key, page_hash, records)
+            return records, partitions
+    
+    async def _retry_broken_page(self, error: SourceRequestError, attempt: int, offset: int):
+        """
+        Ответ страницы оборван или повреждён: подождать перед повторной загрузкой
+        (как при ошибках запроса, до PARSER_RETRY_ATTEMPTS попыток).
+        
+        Raises:
+            SourceRequestError: Если попытки исчерпаны (страница считается незагруженной)
+        """
+        PARSER_REQUEST_ERRORS.inc(kind=error.kind)
+        self.request_errors += 1
+        if attempt >= settings.PARSER_RETRY_ATTEMPTS:
+            logger.error(f"{error} (offset={offset}, попытка {attempt})")
+            raise error
+        delay = backoff_delay(attempt)
+        logger.warning(f"{error}; повтор через {delay:.1f} c (offset={offset}, попытка {attempt})")
+        PARSER_RETRIES.inc()
+        await asyncio.sleep(delay)
+    
+    def _build_detail_url(self, hobj_id: str) -> str:
+        """URL API запроса деталей ЖК."""
+        return f"{self.DETAIL_API_ENDPOINT}/{quote(str(hobj_id))}"
+    
+    def _extract_description(self, text: Optional[str]) -> Optional[str]:
+        """
+        Извлечь описание из ответа API деталей.
+        
+        Структура ответа: {"data": {...}} или сам объект. Возвращает ""
+        если описания нет, None если ответ не удалось разобрать.
+        """
+        if not text:
+            return ""
+        try:
+            json_data = json.loads(text)
+        except ValueError as e:
+            logger.warning(f"Не удалось разобрать JSON ответ деталей ЖК: {e}")
+            return None
+        
+        obj = json_data.get('data', json_data) if isinstance(json_data, dict) else None
+        if isinstance(obj, list):
+            obj = obj[0] if obj else None
+        if not isinstance(obj, dict):
+            return ""
+        for field in self.DESCRIPTION_FIELDS:
+            value = obj.get(field)
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+        return ""
+    
+    async def _get_detail_page(self) -> Page:
+        """Прогретая страница для запросов деталей (одна на парсер, антибот проходится один раз)."""
+        async with self._detail_lock:
+            if self._detail_page is None or self._detail_page.is_closed():
+                self._detail_page = await self._open_warm_page()
+            return self._detail_page
+    
+    async def _fetch_detail_text(self, page: Page, hobj_id: str) -> Optional[str]:
+        """Загрузить сырой ответ API деталей ЖК."""
+        return await self._request_text(page, self._build_detail_url(hobj_id), "detail_fetch", hobj_id=hobj_id)
+    
+    async def fetch_descriptions(self, complexes: Sequence[Tuple[str, int]]) -> Dict[str, str]:
+        """
+        Загрузить описания ЖК из API деталей.
+        
+        Запросы выполняются конкурентно (не более PARSER_DETAIL_CONCURRENCY)
+        на одной прогретой странице браузера и проходят через общий ограничитель
+        частоты. Результаты кэшируются в памяти процесса по (hobjId, data_hash)
+        (не более PARSER_DETAIL_CACHE_SIZE записей).
+        
+        Args:
+            complexes: Пары (hobjId, data_hash)
             
-            # Преобразуем в ComplexParsedDTO
-            complexes = []
-            for item in complexes_list:
+        Returns:
+            Словарь hobjId → описание ("" - описания нет). ЖК, детали которых
+            не удалось загрузить, в результат не попадают.
+        """
+        descriptions: Dict[str, str] = {}
+        pending = []
+        for hobj_id, data_hash in complexes:
+            cached = _detail_cache.get((hobj_id, data_hash))
+            if cached is None:
+                pending.append((hobj_id, data_hash))
+                continue
+            _detail_cache.move_to_end((hobj_id, data_hash))
+            descriptions[hobj_id] = cached
+            PARSER_DETAIL_FETCHES.inc(result="cached")
+        if not pending:
+            return descriptions
+        
+        page = await self._get_detail_page()
+        semaphore = asyncio.Semaphore(max(1, settings.PARSER_DETAIL_CONCURRENCY))
+        
+        async def fetch(hobj_id: str, data_hash: int):
+            async with semaphore:
                 try:
-                    # Маппим поля JSON в формат DTO
-                    mapped_item = self._map_json_to_dto(item)
-                    
-                    # Валидация через Pydantic модель
-                    complex_dto = ComplexParsedDTO(**mapped_item)
-                    complexes.append(complex_dto)
-                    
-                except ValidationError as e:
-                    logger.warning(f"Ошибка валидации данных ЖК: {e}. Пропускаем элемент.")
-                    logger.debug(f"Проблемные данные: {mapped_item if 'mapped_item' in locals() else item}")
-                    continue
+                    text = await self._fetch_detail_text(page, hobj_id)
+                except SourceRequestError as e:
+                    if e.status != 404:
+                        PARSER_DETAIL_FETCHES.inc(result="failed")
+                        logger.warning(f"Детали ЖК {hobj_id} не загружены: {e}")
+                        return
+                    # У объекта нет деталей
+                    text = None
                 except Exception as e:
-                    logger.error(f"Ошибка при обработке элемента ЖК: {e}")
-                    logger.debug(f"Проблемные данные: {item}")
-                    continue
-            
-            logger.info(f"Успешно обработано {len(complexes)} ЖК из {len(complexes_list)} полученных")
+                    PARSER_DETAIL_FETCHES.inc(result="failed")
+                    logger.warning(f"Ошибка при загрузке деталей ЖК {hobj_id}: {e}")
+                    return
+            description = self._extract_description(text)
+            if description is None:
+                PARSER_DETAIL_FETCHES.inc(result="failed")
+                return
+            PARSER_DETAIL_FETCHES.inc(result="loaded")
+            descriptions[hobj_id] = description
+            _detail_cache[(hobj_id, data_hash)] = description
+            while len(_detail_cache) > settings.PARSER_DETAIL_CACHE_SIZE:
+                _detail_cache.popitem(last=False)
+        
+        await asyncio.gather(*(fetch(hobj_id, data_hash) for hobj_id, data_hash in pending))
+        return descriptions
+    
+    def parse_items(self, complexes_list: Iterable[dict], search: str = "") -> FetchResult:
+        """
+        Преобразовать сырые элементы API в DTO.
+        
+        Фильтрует по городу (если указан search) и валидирует элементы
+        через ComplexParsedDTO. Невалидные элементы пропускаются.
+        
+        Элементы обрабатываются по одному за один проход, поэтому complexes_list
+        может быть потоковым итератором (_iter_page_items): в памяти остаются только
+        DTO нужного города. Время этапов city_filtering и dto_mapping суммируется по элементам.
+        """
+        matcher = get_city_matcher((search,)) if search else None
+        started = time.perf_counter()
+        filtering_seconds = 0.0
+        mapping_seconds = 0.0
+        # Количество запрошенных у API (до фильтрации) и прошедших фильтр по городу
+        total_requested = 0
+        matched = 0
+        complexes = []
+        for item in complexes_list:
+            total_requested += 1
             
-            if return_metadata:
-                return FetchResult(complexes=complexes, total_requested=total_requested)
-            return complexes
+            # Фильтруем по городу, если указан параметр search
+            if matcher is not None:
+                step = time.perf_counter()
+                in_city = isinstance(item, dict) and matcher.match(item.get('shortAddr')) is not None
+                filtering_seconds += time.perf_counter() - step
+                if not in_city:
+                    continue
+            matched += 1
             
-        except Exception as e:
-            logger.error(f"Неожиданная ошибка при парсинге ЖК: {e}", exc_info=True)
-            raise
-        finally:
-            if page:
-                await page.close()
+            # Преобразуем в ComplexParsedDTO
+            step = time.perf_counter()
+            mapped_item = None
+            try:
+                # Маппим поля JSON в формат DTO
+                mapped_item = self._map_json_to_dto(item)
+                
+                # Валидация через Pydantic модель
+                complexes.append(ComplexParsedDTO(**mapped_item))
+                
+            except ValidationError as e:
+                PARSER_VALIDATION_FAILURES.inc()
+                logger.warning(f"Ошибка валидации данных ЖК: {e}. Пропускаем элемент.")
+                logger.debug(f"Проблемные данные: {mapped_item if mapped_item is not None else item}")
+            except Exception as e:
+                logger.error(f"Ошибка при обработке элемента ЖК: {e}")
+                logger.debug(f"Проблемные данные: {item}")
+            finally:
+                mapping_seconds += time.perf_counter() - step
+        
+        if not total_requested:
+            logger.warning("Список ЖК пуст в JSON ответе")
+            return FetchResult(complexes=[], total_requested=0)
+        
+        logger.info(f"Найдено {total_requested} ЖК в JSON ответе")
+        if matcher is not None:
+            self.tracer.record("city_filtering", started, filtering_seconds)
+            logger.info(f"После фильтрации по городу '{search}': {matched} ЖК")
+        self.tracer.record("dto_mapping", started, mapping_seconds, {"records": len(complexes)})
+        logger.info(f"Успешно обработано {len(complexes)} ЖК из {matched} полученных")
+        
+        return FetchResult(complexes=complexes, total_requested=total_requested)
     
     async def _close_browser(self):
         """Закрыть браузер Playwright."""
         try:
+            # Страница деталей закрывается вместе с контекстом
+            self._detail_page = None
             if self.context:
                 await self.context.close()
                 self.context = None
@@ -0,0 +1,246 @@
+"""Ограничение частоты, повторы и размер страницы запросов к API источника."""
+from typing import Optional
+import asyncio
+import logging
+import random
+import time
+
+from app.config import get_settings
+from app.utils.metrics import PARSER_PAGE_SIZE, PARSER_RATE_LIMIT
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Классы ошибок запроса к источнику
+CHALLENGE = "challenge"  # Антибот (ServicePipe) вернул проверку вместо данных
+THROTTLED = "throttled"  # Источник просит снизить частоту (429)
+SERVER_ERROR = "server_error"  # Ошибка на стороне источника (5xx)
+NETWORK_ERROR = "network_error"  # Запрос не выполнен (сеть, таймаут)
+CLIENT_ERROR = "client_error"  # Ошибка запроса (4xx), повтор не поможет
+
+RETRYABLE = {CHALLENGE, THROTTLED, SERVER_ERROR, NETWORK_ERROR}
+
+
+class SourceRequestError(Exception):
+    """Запрос к API источника не удался (после всех повторов или без права на повтор)."""
+
+    def __init__(self, message: str, kind: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.kind = kind
+        self.status = status
+
+
+def classify_error(status: Optional[int], content_type: str = "", retry_after: Optional[float] = None) -> str:
+    """
+    Определить класс ошибки по ответу источника.
+
+    Args:
+        status: HTTP статус (None/0 - ответа нет)
+        content_type: Content-Type ответа (HTML вместо JSON - страница антибота)
+        retry_after: Значение заголовка Retry-After, если есть
+    """
+    if not status:
+        return NETWORK_ERROR
+    if status == 429 or (status == 503 and retry_after is not None):
+        return THROTTLED
+    if status in (401, 403) or (200 <= status < 300 and "html" in (content_type or "")):
+        return CHALLENGE
+    if status >= 500:
+        return SERVER_ERROR
+    return CLIENT_ERROR
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Значение Retry-After в секундах (поддерживается только числовая форма)."""
+    try:
+        return max(0.0, float(value)) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: Optional[float] = None, cap: Optional[float] = None) -> float:
+    """
+    Задержка перед повтором: экспоненциальная с полным джиттером.
+
+    attempt - номер неудачной попытки, начиная с 1.
+    """
+    base = settings.PARSER_RETRY_BASE_DELAY if base is None else base
+    cap = settings.PARSER_RETRY_MAX_DELAY if cap is None else cap
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket с адаптивной скоростью (AIMD).
+
+    - acquire() ждёт токен; токены пополняются со скоростью rate запросов/с,
+      в запасе не больше burst
+    - on_success(): после increase_after подряд успешных ответов скорость
+      увеличивается на шаг (аддитивно), но не выше max_rate
+    - on_throttle(): при 429/5xx/антиботе скорость уменьшается вдвое, но не ниже min_rate
+
+    Работает в одном event loop без блокировок: токен резервируется до ожидания,
+    поэтому конкурентные запросы выстраиваются в очередь по времени.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        burst: int = 1,
+        increase_after: int = 10,
+    ):
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+        self.burst = max(1, burst)
+        self.increase_after = increase_after
+        self.step = (self.max_rate - self.min_rate) / 20 or self.min_rate
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._clean_responses = 0
+        PARSER_RATE_LIMIT.set(self.rate)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Дождаться разрешения на запрос."""
+        self._refill()
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+    def on_success(self):
+        """Ответ без ошибок: после серии успешных ответов ускориться."""
+        self._clean_responses += 1
+        if self._clean_responses >= self.increase_after and self.rate < self.max_rate:
+            self._clean_responses = 0
+            self._set_rate(min(self.max_rate, self.rate + self.step))
+
+    def on_throttle(self):
+        """Источник перегружен или ограничивает нас: замедлиться."""
+        self._clean_responses = 0
+        if self.rate > self.min_rate:
+            self._set_rate(max(self.min_rate, self.rate / 2))
+
+    def _set_rate(self, rate: float):
+        self._refill()
+        logger.info(f"Скорость запросов к источнику: {self.rate:.3f} → {rate:.3f} запросов/с")
+        self.rate = rate
+        PARSER_RATE_LIMIT.set(rate)
+
+
+class AdaptivePageSize:
+    """
+    Размер страницы API, подстраиваемый по ходу запуска (AIMD).
+
+    - on_page(): полная страница загружена без ошибок. Пока время на запись
+      (время загрузки и разбора страницы / записей) снижается больше чем на tolerance
+      относительно лучшего, размер увеличивается на step (аддитивно). Если после
+      увеличения время на запись выросло, размер возвращается к лучшему и в этом
+      запуске больше не растёт
+    - on_error(): таймаут, 429/5xx/антибот при загрузке страницы (в том числе
+      загруженной после повтора): размер уменьшается вдвое, расти он может только
+      до размера ниже того, на котором была ошибка
+    - Размер ограничен объёмом ответа: при среднем размере записи последней
+      страницы ответ не длиннее max_response_size символов
+
+    Размер всегда кратен step (но не меньше min_size): после подстройки запуски
+    повторяют одни и те же размеры, а не дрейфуют на произвольные значения.
+    При min_size == max_size размер фиксирован.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        min_size: int,
+        max_size: int,
+        step: int = 1,
+        max_response_size: int = 0,
+        tolerance: float = 0.05,
+    ):
+        self.min_size = max(1, min_size)
+        self.max_size = max(max_size, self.min_size)
+        self.step = max(1, step)
+        self.max_response_size = max_response_size
+        self.tolerance = tolerance
+        self.size = self._clamp(size)
+        # Верхняя граница роста в этом запуске (снижается после ошибок)
+        self._ceiling = self.max_size
+        self._best_size = self.size
+        self._best_cost: Optional[float] = None
+        self._growing = True
+        PARSER_PAGE_SIZE.set(self.size)
+
+    @property
+    def fixed(self) -> bool:
+        return self.min_size == self.max_size
+
+    def _clamp(self, size: int) -> int:
+        size = int(size) // self.step * self.step
+        return min(max(size, self.min_size), self.max_size)
+
+    def on_page(self, limit: int, records: int, seconds: float, response_size: int = 0):
+        """
+        Страница загружена без ошибок.
+
+        Args:
+            limit: Запрошенный размер страницы
+            records: Записей в ответе (до фильтрации)
+            seconds: Время загрузки и разбора страницы
+            response_size: Длина ответа (символов)
+        """
+        if self.fixed or records <= 0:
+            return
+        size = self.size
+        # Неполная страница - последняя: время на запись по ней не показательно
+        if records >= limit:
+            cost = seconds / records
+            if self._best_cost is None or cost < self._best_cost * (1 - self.tolerance):
+                self._best_cost, self._best_size = cost, limit
+                if self._growing:
+                    size = limit + self.step
+            elif cost > self._best_cost * (1 + self.tolerance) and limit > self._best_size:
+                # Увеличение не окупилось
+                self._growing = False
+                size = self._best_size
+        if self.max_response_size and response_size:
+            size = min(size, max(1, self.max_response_size * records // response_size))
+        self._set_size(min(size, self._ceiling))
+
+    def on_error(self):
+        """Таймаут или ошибка при загрузке страницы: уменьшить размер."""
+        if self.fixed:
+            return
+        self._ceiling = max(self.min_size, self.size - self.step)
+        # Условия изменились: лучшее время на запись измеряется заново
+        self._best_cost = None
+        self._growing = True
+        self._set_size(self.size // 2)
+
+    def _set_size(self, size: int):
+        size = self._clamp(size)
+        if size != self.size:
+            logger.info(f"Размер страницы API: {self.size} → {size}")
+            self.size = size
+            PARSER_PAGE_SIZE.set(size)
+
+
+_limiter: Optional[AdaptiveRateLimiter] = None
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Общий для процесса ограничитель частоты запросов к источнику."""
+    global _limiter
+    if _limiter is None:
+        _limiter = AdaptiveRateLimiter(
+            rate=settings.PARSER_RATE_LIMIT,
+            min_rate=settings.PARSER_RATE_LIMIT_MIN,
+            max_rate=settings.PARSER_RATE_LIMIT_MAX,
+            burst=settings.PARSER_RATE_BURST,
+        )
+    return _limiter
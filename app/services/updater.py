@@ -1,182 +1,563 @@
 """Сервис актуализации данных о жилых комплексах."""
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
 from sqlalchemy.orm import Session
 from app.models.housing_complex import HousingComplex
-from app.services.parser import NashDomParser
+from app.models.processed_page import ProcessedPage
+from app.models.refresh_run import RefreshRun
+from app.schemas.parser import ComplexParsedDTO
+from app.services.page_cache import PROCESSING_VERSION, ProcessedMarker
+from app.services.parser import FetchResult, NashDomParser
+from app.services.rate_limit import AdaptivePageSize, SourceRequestError
 from app.utils.hashing import calculate_data_hash
 from app.config import get_settings
+from app.utils.metrics import PARSER_FAILED_PAGES, UPDATER_COMPLEXES, UPDATER_RUN_DURATION, UPDATER_RUNS
+from app.utils.tracing import Tracer
+from app.utils import profiling
 import logging
 import asyncio
+import time
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+class SharedListing(NamedTuple):
+    """Общая выгрузка источника (без фильтра по городу), разложенная по городам регионов."""
+    partitions: Dict[str, List[dict]]  # Город → сырые элементы data.list
+    pages: int  # Загружено страниц
+    records: int  # Получено записей (до разбиения по городам)
+    fetched_at: float  # time.monotonic() окончания загрузки
+    seconds: float  # Длительность загрузки
+    reused: bool = False  # Выгрузка взята из кэша предыдущего запуска
+    failed_offsets: Tuple[int, ...] = ()  # Offset страниц, не загруженных после всех повторов
+
+
 class DataUpdater:
     """Сервис для актуализации данных о ЖК."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, parser: Optional[NashDomParser] = None):
+        """
+        Args:
+            db: Сессия БД
+            parser: Парсер источника (по умолчанию NashDomParser; для нагрузочных
+                    тестов подставляется парсер с синтетическими данными)
+        """
         self.db = db
-        self.parser = NashDomParser()
+        self.parser = parser or NashDomParser()
+        # Offset страниц, не загруженных в текущем запуске
+        self.failed_offsets: List[int] = []
     
-    async def update_housing_complexes(self, city: str = None):
+    async def update_housing_complexes(
+        self,
+        city: str = None,
+        page_size: Optional[int] = None,
+        listing: Optional[SharedListing] = None,
+        source_params: Optional[Dict[str, str]] = None,
+    ):
         """
         Актуализировать данные о жилых комплексах.
         
+        Args:
+            city: Город (по умолчанию PARSER_CITY)
+            page_size: Размер страницы API (фиксированный). По умолчанию размер подстраивается
+                       по ходу запуска (PARSER_ADAPTIVE_PAGE_SIZE, см. _page_sizer)
+            listing: Общая выгрузка источника (см. app/services/crawler.py); если передана,
+                     ЖК города берутся из неё без запросов к источнику
+            source_params: Параметры фильтрации на стороне источника (например, код региона)
+        
         Логика:
-        1. Парсим данные из источника (async)
-        2. Для каждого ЖК:
+        1. Парсим данные из источника постранично (async)
+        2. Для каждого ЖК страницы:
            - Если нет в БД по source_url → добавляем
            - Если есть в БД → сравниваем хэш:
              * Хэш изменился → обновляем данные
              * Хэш не изменился → пропускаем
+        3. Изменения страницы коммитятся вместе с контрольной точкой запуска
+           (следующий offset и счётчики в refresh_runs)
+        4. Для новых и изменившихся ЖК (и ЖК без загруженного описания) описание
+           загружается из API деталей конкурентно (PARSER_DETAILS)
+        5. Если ответ API страницы совпадает с уже записанным в БД (отметка в
+           processed_pages, коммитится вместе со страницей), маппинг, валидация,
+           хэширование и сравнение с БД пропускаются: ЖК страницы считаются неизменившимися
+        
+        Если предыдущий запуск города прервался (статус running/failed) не раньше
+        PARSER_RESUME_WINDOW_MINUTES назад, загрузка продолжается с его контрольной точки.
+        
+        Размер страницы в конце запуска сохраняется в refresh_runs.page_size и становится
+        начальным для следующего запуска города.
+        
+        Тайминги этапов и счётчики сохраняются в таблицу refresh_runs.
         """
         logger.info("Начало актуализации данных о ЖК")
+        started = time.perf_counter()
+        
+        # Используем город из настроек, если не указан явно
+        search_city = city or settings.PARSER_CITY
+        tracer = Tracer()
+        self.parser.tracer = tracer
+        self.failed_offsets = []
+        # Из общей выгрузки продолжать нечего: она уже загружена целиком
+        resume_from = self._find_resumable_run(search_city) if listing is None else None
+        run = self._start_run(search_city, resume_from)
+        
+        profiler = None
+        if profiling.state.take_updater_run():
+            profiler = profiling.Profiler(f"updater-run-{run.id}")
+            profiler.start()
         
         try:
-            # Используем город из настроек, если не указан явно
-            search_city = city or settings.PARSER_CITY
             logger.info(f"Поиск ЖК для города: {search_city}")
             
-            # Получаем данные из парсера с пагинацией (async)
-            # Парсер сам фильтрует по городу через shortAddr регуляркой
-            page_size = settings.PARSER_PAGE_SIZE
             max_results = settings.PARSER_MAX_RESULTS if settings.PARSER_MAX_RESULTS > 0 else None
+            page_sizer = None
+            if listing is not None:
+                # Общая выгрузка источника: только валидация ЖК города
+                pages = self._listing_pages(listing, search_city, tracer)
+            else:
+                page_sizer = self._page_sizer(search_city, page_size)
+                self.parser.processed_pages = self._processed_pages()
+                pages = self._fetch_city(search_city, page_sizer, run.next_offset or 0, source_params)
             
-            all_complex_dtos = []
-            offset = 0
-            
-            while True:
-                # Получаем страницу данных с метаинформацией
-                fetch_result = await self.parser.fetch_complexes(
-                    offset=offset,
-                    limit=page_size,
-                    search=search_city,
-                    return_metadata=True
-                )
-                
-                page_complexes = fetch_result.complexes
-                total_requested = fetch_result.total_requested
-                
-                if not page_complexes:
-                    logger.debug(f"Больше нет данных, остановка пагинации на offset={offset}")
-                    break
-                
-                all_complex_dtos.extend(page_complexes)
-                logger.info(
-                    f"Загружено страница: {len(page_complexes)} ЖК (запрошено у API: {total_requested}) "
-                    f"(offset={offset}, всего: {len(all_complex_dtos)})"
-                )
-                
-                # Проверяем лимит максимального количества результатов
-                if max_results and len(all_complex_dtos) >= max_results:
-                    all_complex_dtos = all_complex_dtos[:max_results]
-                    logger.info(f"Достигнут лимит максимального количества результатов: {max_results}")
-                    break
-                
-                # Если API вернул меньше, чем запрашивали - это последняя страница
-                # Важно: проверяем total_requested (до фильтрации), а не len(page_complexes) (после фильтрации)
-                if total_requested < page_size:
-                    logger.debug(f"API вернул меньше запрошенного ({total_requested} < {page_size}), последняя страница")
-                    break
-                
-                offset += page_size
+            # Счётчики этого запуска (в run - с учётом продолженного запуска)
+            counts = {"added": 0, "updated": 0, "unchanged": 0}
+            # Время хэширования и сравнения с БД копится по всем записям и пишется
+            # одним интервалом на этап (интервал на каждую запись раздул бы отчёт)
+            timings = {"hash": 0.0, "db": 0.0}
+            loop_started = time.perf_counter()
+            fetched = 0
+            skipped_pages = 0
             
-            complex_dtos = all_complex_dtos
-            logger.info(f"Всего получено {len(complex_dtos)} ЖК из источника")
-            
-            added_count = 0
-            updated_count = 0
-            unchanged_count = 0
-            
-            # Размер батча для коммитов (чтобы не создавать огромные SQL запросы)
-            batch_size = 100
-            
-            for idx, complex_dto in enumerate(complex_dtos, 1):
-                # Формируем source_url для отслеживания изменений
-                # Приоритет у уникального идентификатора hobjId, а не у URL изображения
-                # hobjRenderPhotoUrl может быть одинаковым для разных ЖК
-                if complex_dto.id:
-                    # Используем уникальный идентификатор hobjId для формирования source_url
-                    source_url = f"{NashDomParser.BASE_URL}/сервисы/kn/{complex_dto.id}"
-                elif complex_dto.url:
-                    # Fallback на URL только если нет ID
-                    source_url = complex_dto.url
-                else:
-                    logger.warning(f"Не удалось сформировать source_url для ЖК: {complex_dto.name}")
-                    continue  # Пропускаем, если нет ID
-                
-                new_hash = calculate_data_hash(
-                    name=complex_dto.name,
-                    address=complex_dto.address,
-                    description=None,  # Описание не входит в ComplexParsedDTO
-                    developer=complex_dto.developer
-                )
-                
-                # Ищем существующий ЖК по source_url
-                existing = self.db.query(HousingComplex).filter(
-                    HousingComplex.source_url == source_url
-                ).first()
-                
-                if existing is None:
-                    # Новый ЖК - добавляем
-                    new_complex = HousingComplex(
-                        name=complex_dto.name,
-                        address=complex_dto.address,
-                        description=None,  # Описание не входит в ComplexParsedDTO
-                        developer=complex_dto.developer,
-                        source_url=source_url,
-                        data_hash=new_hash
-                    )
-                    self.db.add(new_complex)
-                    added_count += 1
-                    logger.debug(f"Добавлен новый ЖК: {complex_dto.name}")
-                else:
-                    # Существующий ЖК - проверяем хэш
-                    if existing.data_hash != new_hash:
-                        # Данные изменились - обновляем
-                        existing.name = complex_dto.name
-                        existing.address = complex_dto.address
-                        existing.developer = complex_dto.developer
-                        existing.data_hash = new_hash
-                        updated_count += 1
-                        logger.debug(f"Обновлен ЖК: {complex_dto.name}")
+            async with aclosing(pages):
+                async for next_offset, page in pages:
+                    page_dtos = page.complexes
+                    # ЖК страницы, описания которых не удалось загрузить
+                    missing_details = 0
+                    if page.unchanged:
+                        skipped_pages += 1
+                        page_records = page.unchanged_records
+                        page_counts = {"added": 0, "updated": 0, "unchanged": page_records}
                     else:
-                        # Данные не изменились - пропускаем
-                        unchanged_count += 1
-                
-                # Коммитим батчами, чтобы не создавать огромные SQL запросы
-                if idx % batch_size == 0:
+                        if max_results:
+                            page_dtos = page_dtos[:max(0, max_results - run.fetched_count)]
+                        page_records = len(page_dtos)
+                        enrich = [] if settings.PARSER_DETAILS else None
+                        page_counts = self._sync_page(page_dtos, timings, enrich)
+                        if enrich:
+                            missing_details = await self._enrich_descriptions(enrich, tracer)
+                    for key, value in page_counts.items():
+                        counts[key] += value
+                    fetched += page_records
+                    
+                    # Контрольная точка коммитится в одной транзакции с данными страницы
+                    run.fetched_count += page_records
+                    run.added_count += page_counts["added"]
+                    run.updated_count += page_counts["updated"]
+                    run.unchanged_count += page_counts["unchanged"]
+                    run.next_offset = next_offset
+                    run.checkpointed_at = datetime.now(timezone.utc)
+                    if page_sizer is not None:
+                        run.page_size = page_sizer.size
+                    # Страница записана целиком: в следующий раз её можно пропустить, если ответ
+                    # не изменится. Отметка коммитится вместе с данными страницы
+                    if (
+                        page.cache_key
+                        and self.parser.page_cache.enabled
+                        and not page.unchanged
+                        and not missing_details
+                        and len(page_dtos) == len(page.complexes)
+                    ):
+                        self.db.merge(ProcessedPage(
+                            cache_key=page.cache_key,
+                            content_hash=page.content_hash,
+                            processing_version=PROCESSING_VERSION,
+                            records=page.total_requested,
+                            complexes=len(page_dtos),
+                        ))
                     try:
-                        self.db.commit()
-                        logger.debug(f"Закоммичен батч: {idx}/{len(complex_dtos)} записей")
+                        with tracer.span("commit", records=page_records, next_offset=next_offset):
+                            self.db.commit()
+                        logger.debug(f"Закоммичена страница, следующий offset={next_offset}")
                     except Exception as e:
-                        logger.error(f"Ошибка при коммите батча на записи {idx}: {e}")
+                        logger.error(f"Ошибка при коммите страницы (следующий offset={next_offset}): {e}")
                         self.db.rollback()
                         raise
+                    
+                    if max_results and run.fetched_count >= max_results:
+                        logger.info(f"Достигнут лимит максимального количества результатов: {max_results}")
+                        break
             
-            # Сохраняем оставшиеся изменения
-            try:
-                self.db.commit()
-                logger.debug(f"Закоммичены оставшиеся изменения")
-            except Exception as e:
-                logger.error(f"Ошибка при финальном коммите: {e}")
-                self.db.rollback()
-                raise
+            tracer.record("hash_computation", loop_started, timings["hash"], {"records": fetched})
+            tracer.record("db_diff_write", loop_started, timings["db"], {"records": fetched})
+            
+            logger.info(f"Всего получено {fetched} ЖК из источника")
+            if skipped_pages:
+                logger.info(f"Страниц без изменений (обработка пропущена): {skipped_pages}")
             logger.info(
                 f"Актуализация завершена. "
-                f"Добавлено: {added_count}, Обновлено: {updated_count}, Без изменений: {unchanged_count}"
+                f"Добавлено: {counts['added']}, Обновлено: {counts['updated']}, "
+                f"Без изменений: {counts['unchanged']}"
             )
             
+            UPDATER_COMPLEXES.inc(counts["added"], result="added")
+            UPDATER_COMPLEXES.inc(counts["updated"], result="updated")
+            UPDATER_COMPLEXES.inc(counts["unchanged"], result="unchanged")
+            # Часть страниц не загружена: сохранённые данные остаются, запуск помечается partial
+            status = "partial" if self.failed_offsets else "success"
+            UPDATER_RUNS.inc(status=status)
+            UPDATER_RUN_DURATION.observe(time.perf_counter() - started)
+            
+            error = None
+            if self.failed_offsets:
+                error = f"Не загружены страницы: offset={', '.join(map(str, self.failed_offsets))}"
+            self._finish_run(run, tracer, status=status, error=error)
+            
             return {
-                "added": added_count,
-                "updated": updated_count,
-                "unchanged": unchanged_count
+                "added": run.added_count,
+                "updated": run.updated_count,
+                "unchanged": run.unchanged_count,
+                "failed_pages": len(self.failed_offsets),
+                "skipped_pages": skipped_pages,
+                "run_id": run.id,
+                "resumed_from": run.resumed_from_id,
             }
             
         except Exception as e:
             logger.error(f"Ошибка при актуализации данных: {e}")
+            UPDATER_RUNS.inc(status="error")
+            UPDATER_RUN_DURATION.observe(time.perf_counter() - started)
+            # Откат до последней контрольной точки: следующий запуск продолжит с неё
             self.db.rollback()
+            self._finish_run(run, tracer, status="failed", error=str(e))
             raise
+        finally:
+            if profiler:
+                profiler.stop()
+    
+    def _sync_page(
+        self,
+        complex_dtos: List[ComplexParsedDTO],
+        timings: Dict[str, float],
+        enrich: Optional[List[Tuple[str, int, HousingComplex]]] = None,
+    ) -> Dict[str, int]:
+        """
+        Сравнить ЖК страницы с БД: добавить новые, обновить изменившиеся.
+        
+        Изменения не коммитятся (коммит выполняется вместе с контрольной точкой).
+        Если передан enrich, в него добавляются (hobjId, data_hash, ЖК) для загрузки
+        описания: новые и изменившиеся ЖК, а также ЖК, описание которых ещё не загружено.
+        Возвращает счётчики added/updated/unchanged.
+        """
+        counts = {"added": 0, "updated": 0, "unchanged": 0}
+        for complex_dto in complex_dtos:
+            # Формируем source_url для отслеживания изменений
+            # Приоритет у уникального идентификатора hobjId, а не у URL изображения
+            # hobjRenderPhotoUrl может быть одинаковым для разных ЖК
+            if complex_dto.id:
+                # Используем уникальный идентификатор hobjId для формирования source_url
+                source_url = f"{NashDomParser.BASE_URL}/сервисы/kn/{complex_dto.id}"
+            elif complex_dto.url:
+                # Fallback на URL только если нет ID
+                source_url = complex_dto.url
+            else:
+                logger.warning(f"Не удалось сформировать source_url для ЖК: {complex_dto.name}")
+                continue  # Пропускаем, если нет ID
+            
+            step_started = time.perf_counter()
+            new_hash = calculate_data_hash(
+                name=complex_dto.name,
+                address=complex_dto.address,
+                description=None,  # Описание загружается отдельно (API деталей) и в хэш не входит
+                developer=complex_dto.developer,
+                status=complex_dto.status,
+                latitude=complex_dto.latitude,
+                longitude=complex_dto.longitude,
+            )
+            hash_finished = time.perf_counter()
+            timings["hash"] += hash_finished - step_started
+            
+            # Ищем существующий ЖК по source_url
+            existing = self.db.query(HousingComplex).filter(
+                HousingComplex.source_url == source_url
+            ).first()
+            
+            if existing is None:
+                # Новый ЖК - добавляем
+                new_complex = HousingComplex(
+                    name=complex_dto.name,
+                    address=complex_dto.address,
+                    description=None,  # Описание не входит в ComplexParsedDTO
+                    developer=complex_dto.developer,
+                    status=complex_dto.status,
+                    latitude=complex_dto.latitude,
+                    longitude=complex_dto.longitude,
+                    source_url=source_url,
+                    data_hash=new_hash
+                )
+                self.db.add(new_complex)
+                counts["added"] += 1
+                if enrich is not None and complex_dto.id:
+                    enrich.append((complex_dto.id, new_hash, new_complex))
+                logger.debug(f"Добавлен новый ЖК: {complex_dto.name}")
+            else:
+                old_hash = existing.data_hash
+                # Существующий ЖК - проверяем хэш
+                if existing.data_hash != new_hash:
+                    # Данные изменились - обновляем
+                    existing.name = complex_dto.name
+                    existing.address = complex_dto.address
+                    existing.developer = complex_dto.developer
+                    existing.status = complex_dto.status
+                    existing.latitude = complex_dto.latitude
+                    existing.longitude = complex_dto.longitude
+                    existing.data_hash = new_hash
+                    counts["updated"] += 1
+                    logger.debug(f"Обновлен ЖК: {complex_dto.name}")
+                else:
+                    # Данные не изменились - пропускаем
+                    counts["unchanged"] += 1
+                # Описание загружается для изменившихся ЖК и ЖК, у которых его ещё нет
+                if enrich is not None and complex_dto.id and (
+                    existing.data_hash != old_hash or existing.description is None
+                ):
+                    enrich.append((complex_dto.id, new_hash, existing))
+            timings["db"] += time.perf_counter() - hash_finished
+        return counts
+    
+    async def _enrich_descriptions(self, enrich: List[Tuple[str, int, HousingComplex]], tracer: Tracer) -> int:
+        """
+        Загрузить описания ЖК страницы из API деталей (см. NashDomParser.fetch_descriptions).
+        
+        Описание "" означает, что детали загружены, но описания нет. ЖК, детали которых
+        не удалось загрузить, остаются без описания (NULL) и загружаются при следующем запуске.
+        Возвращает количество таких ЖК.
+        """
+        with tracer.span("detail_enrichment", records=len(enrich)) as span_attrs:
+            descriptions = await self.parser.fetch_descriptions(
+                [(hobj_id, data_hash) for hobj_id, data_hash, _ in enrich]
+            )
+            missing = 0
+            for hobj_id, _, housing_complex in enrich:
+                if hobj_id in descriptions:
+                    housing_complex.description = descriptions[hobj_id]
+                else:
+                    missing += 1
+            span_attrs["missing"] = missing
+        if missing:
+            logger.warning(f"Не загружены описания {missing} ЖК из {len(enrich)}")
+        return missing
+    
+    async def _fetch_city(
+        self,
+        search_city: str,
+        page_sizer: AdaptivePageSize,
+        start_offset: int = 0,
+        source_params: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[Tuple[int, FetchResult]]:
+        """
+        Загружать ЖК города постранично (API запросы с search и параметрами фильтрации источника).
+        
+        Отдаёт пары (offset следующей страницы, FetchResult страницы), начиная со start_offset.
+        Размер каждой следующей страницы выбирает page_sizer по времени загрузки и разбора
+        предыдущей, размеру ответа и ошибкам запросов (offset источника от размера не зависит).
+        Страница, которую не удалось загрузить после всех повторов парсера, пропускается
+        (её offset попадает в self.failed_offsets), загруженные данные сохраняются.
+        После PARSER_MAX_FAILED_PAGES подряд незагруженных страниц загрузка прекращается.
+        """
+        # Парсер сам фильтрует по городу через shortAddr регуляркой
+        offset = start_offset
+        total = 0
+        consecutive_failures = 0
+        if start_offset:
+            logger.info(f"Продолжение загрузки с offset={start_offset}")
+        
+        while True:
+            page_size = page_sizer.size
+            request_errors = self.parser.request_errors
+            page_started = time.perf_counter()
+            # Получаем страницу данных с метаинформацией
+            try:
+                fetch_result = await self.parser.fetch_complexes(
+                    offset=offset,
+                    limit=page_size,
+                    search=search_city,
+                    return_metadata=True,
+                    params=source_params,
+                )
+            except SourceRequestError as e:
+                PARSER_FAILED_PAGES.inc()
+                page_sizer.on_error()
+                self.failed_offsets.append(offset)
+                consecutive_failures += 1
+                logger.error(f"Страница offset={offset} не загружена, пропускаем: {e}")
+                if consecutive_failures >= settings.PARSER_MAX_FAILED_PAGES:
+                    logger.error(f"Подряд не загружено {consecutive_failures} страниц, загрузка прекращена")
+                    return
+                offset += page_size
+                continue
+            consecutive_failures = 0
+            
+            # Страница загружена после повторов: уменьшаем размер следующих страниц
+            if self.parser.request_errors > request_errors:
+                page_sizer.on_error()
+            else:
+                page_sizer.on_page(
+                    page_size,
+                    fetch_result.total_requested,
+                    time.perf_counter() - page_started,
+                    fetch_result.response_size,
+                )
+            
+            page_complexes = fetch_result.complexes
+            total_requested = fetch_result.total_requested
+            
+            # Страница может не содержать ЖК города, но не быть последней
+            if total_requested == 0:
+                logger.debug(f"Больше нет данных, остановка пагинации на offset={offset}")
+                return
+            
+            page_records = fetch_result.unchanged_records if fetch_result.unchanged else len(page_complexes)
+            total += page_records
+            logger.info(
+                f"Загружено страница: {page_records} ЖК (запрошено у API: {total_requested}) "
+                f"(offset={offset}, всего: {total})"
+            )
+            offset += page_size
+            yield offset, fetch_result
+            
+            # Если API вернул меньше, чем запрашивали - это последняя страница
+            # Важно: проверяем total_requested (до фильтрации), а не len(page_complexes) (после фильтрации)
+            if total_requested < page_size:
+                logger.debug(f"API вернул меньше запрошенного ({total_requested} < {page_size}), последняя страница")
+                return
+    
+    async def _listing_pages(
+        self, listing: SharedListing, search_city: str, tracer: Tracer
+    ) -> AsyncIterator[Tuple[Optional[int], FetchResult]]:
+        """Отдавать ЖК города из общей выгрузки источника частями по PARSER_PAGE_SIZE."""
+        # Загрузка выгрузки разделена между регионами: в отчёт попадает её длительность
+        tracer.record(
+            "shared_listing_fetch", tracer.started, listing.seconds,
+            {"pages": listing.pages, "records": listing.records, "reused": listing.reused},
+        )
+        self.failed_offsets.extend(listing.failed_offsets)
+        items = listing.partitions.get(search_city, [])
+        # Элементы уже отфильтрованы по городу при разбиении выгрузки.
+        # Offset источника для них не определён: контрольная точка без next_offset
+        for start in range(0, len(items), settings.PARSER_PAGE_SIZE):
+            yield None, self.parser.parse_items(items[start:start + settings.PARSER_PAGE_SIZE])
+    
+    def _processed_pages(self) -> Dict[str, ProcessedMarker]:
+        """Отметки об обработке страниц текущей версии обработки (ключ в кэше ответов → отметка)."""
+        if not self.parser.page_cache.enabled:
+            return {}
+        rows = (
+            self.db.query(
+                ProcessedPage.cache_key, ProcessedPage.content_hash, ProcessedPage.records, ProcessedPage.complexes
+            )
+            .filter(ProcessedPage.processing_version == PROCESSING_VERSION)
+            .all()
+        )
+        return {row.cache_key: ProcessedMarker(row.content_hash, row.records, row.complexes) for row in rows}
+    
+    def _page_sizer(self, city: str, page_size: Optional[int] = None) -> AdaptivePageSize:
+        """
+        Размер страниц запуска.
+        
+        Явно заданный размер (page_size региона) и выключенный PARSER_ADAPTIVE_PAGE_SIZE -
+        фиксированный размер. Иначе размер подстраивается в границах
+        PARSER_PAGE_SIZE_MIN..PARSER_PAGE_SIZE_MAX, начиная с размера последнего запуска
+        города (PARSER_PAGE_SIZE, если запусков ещё не было).
+        """
+        if page_size or not settings.PARSER_ADAPTIVE_PAGE_SIZE:
+            page_size = page_size or settings.PARSER_PAGE_SIZE
+            return AdaptivePageSize(page_size, page_size, page_size)
+        
+        last = (
+            self.db.query(RefreshRun.page_size)
+            .filter(RefreshRun.city == city, RefreshRun.page_size.isnot(None))
+            .order_by(RefreshRun.id.desc())
+            .first()
+        )
+        initial = last.page_size if last is not None else settings.PARSER_PAGE_SIZE
+        logger.info(f"Начальный размер страницы API: {initial}")
+        return AdaptivePageSize(
+            initial,
+            min_size=settings.PARSER_PAGE_SIZE_MIN,
+            max_size=settings.PARSER_PAGE_SIZE_MAX,
+            step=settings.PARSER_PAGE_SIZE_STEP,
+            max_response_size=int(settings.PARSER_PAGE_MAX_RESPONSE_MB * 1024 * 1024),
+        )
+    
+    def _find_resumable_run(self, city: str) -> Optional[RefreshRun]:
+        """
+        Прерванный запуск города, который можно продолжить.
+        
+        Подходит последний запуск города, если он не завершился (running - процесс
+        остановлен во время работы, failed - ошибка), у него есть контрольная точка
+        с offset и она записана не раньше PARSER_RESUME_WINDOW_MINUTES назад.
+        """
+        window = settings.PARSER_RESUME_WINDOW_MINUTES
+        if window <= 0:
+            return None
+        last_run = (
+            self.db.query(RefreshRun)
+            .filter(RefreshRun.city == city)
+            .order_by(RefreshRun.id.desc())
+            .first()
+        )
+        if (
+            last_run is None
+            or last_run.status not in ("running", "failed")
+            or not last_run.next_offset
+            or last_run.checkpointed_at is None
+            or last_run.checkpointed_at < datetime.now(timezone.utc) - timedelta(minutes=window)
+        ):
+            return None
+        return last_run
+    
+    def _start_run(self, city: str, resume_from: Optional[RefreshRun] = None) -> RefreshRun:
+        """Создать запись о запуске актуализации (продолжающую resume_from, если он передан)."""
+        run = RefreshRun(
+            status="running",
+            city=city,
+            fetched_count=0,
+            added_count=0,
+            updated_count=0,
+            unchanged_count=0,
+        )
+        if resume_from is not None:
+            logger.info(
+                f"Продолжение прерванного запуска {resume_from.id} с offset={resume_from.next_offset}"
+            )
+            run.resumed_from_id = resume_from.id
+            run.next_offset = resume_from.next_offset
+            run.fetched_count = resume_from.fetched_count
+            run.added_count = resume_from.added_count
+            run.updated_count = resume_from.updated_count
+            run.unchanged_count = resume_from.unchanged_count
+            if resume_from.status == "running":
+                # Процесс остановился во время запуска, не успев записать итог
+                resume_from.status = "failed"
+                resume_from.error = "Запуск прерван"
+        self.db.add(run)
+        self.db.commit()
+        return run
+    
+    def _finish_run(self, run: RefreshRun, tracer: Tracer, status: str, error: str = None):
+        """Сохранить итог запуска: статус, длительность и отчёт по этапам."""
+        report = tracer.report()
+        try:
+            run.status = status
+            run.error = error
+            run.finished_at = datetime.now(timezone.utc)
+            run.duration_seconds = report["total_seconds"]
+            run.stages = report
+            self.db.commit()
+        except Exception as e:
+            logger.error(f"Не удалось сохранить отчёт о запуске актуализации: {e}")
+            self.db.rollback()
     
     async def close(self):
         """Закрыть парсер."""
@@ -0,0 +1,221 @@
+"""Нормализация адресов для сопоставления домов и ЖК."""
+from typing import List, NamedTuple, Optional, Set, Tuple
+import re
+
+# Маркеры населённого пункта
+CITY_MARKERS = {"г", "город", "гор"}
+
+# Маркеры номера дома и его частей (канонические формы)
+HOUSE_MARKERS = {
+    "д": "",
+    "дом": "",
+    "вл": "вл",
+    "влд": "вл",
+    "владение": "вл",
+    "к": "к",
+    "корп": "к",
+    "корпус": "к",
+    "стр": "с",
+    "строение": "с",
+    "с": "с",
+    "лит": "лит",
+    "литера": "лит",
+}
+
+# Типы улиц: все варианты написания → каноническое сокращение
+STREET_TYPES = {
+    "ул": "ул",
+    "улица": "ул",
+    "пр-т": "пр-кт",
+    "пр-кт": "пр-кт",
+    "просп": "пр-кт",
+    "проспект": "пр-кт",
+    "пер": "пер",
+    "переулок": "пер",
+    "б-р": "б-р",
+    "бул": "б-р",
+    "бульвар": "б-р",
+    "ш": "ш",
+    "шоссе": "ш",
+    "наб": "наб",
+    "набережная": "наб",
+    "пл": "пл",
+    "площадь": "пл",
+    "пр-д": "проезд",
+    "проезд": "проезд",
+    "туп": "туп",
+    "тупик": "туп",
+    "ал": "ал",
+    "аллея": "ал",
+    "мкр": "мкр",
+    "мкрн": "мкр",
+    "микрорайон": "мкр",
+    "кв-л": "кв-л",
+    "квартал": "кв-л",
+}
+
+# Разделитель частей номера дома без маркера, идущих цифра за цифрой
+# ("1, 2" → "1 2", а не "12" - иначе совпадёт с домом 12); в токенах пробелов нет
+HOUSE_PART_SEPARATOR = " "
+
+# Всё, кроме букв, цифр, дефиса и слэша, считаем разделителем
+_SEPARATOR_RE = re.compile(r"[^\w\-/]+", re.UNICODE)
+_HAS_DIGIT_RE = re.compile(r"\d")
+# Порядковые числительные в названиях улиц ("ул. 3-я Парковая") - не номер дома
+_ORDINAL_RE = re.compile(r"\d+-?(?:я|й|е|го|ая|ий|ой|ый)$")
+
+
+class NormalizedAddress(NamedTuple):
+    """Разобранный и нормализованный адрес."""
+    city: str  # Населённый пункт (может быть пустым)
+    street_type: str  # Каноническое сокращение типа улицы (может быть пустым)
+    street: str  # Название улицы без типа
+    house: str  # Номер дома с корпусом/строением, например "1к2" или "1 2" (части без маркеров)
+
+    @property
+    def key(self) -> str:
+        """Канонический ключ адреса."""
+        street = f"{self.street_type} {self.street}".strip()
+        return "|".join((self.city, street, self.house))
+
+    @property
+    def street_key(self) -> str:
+        """Ключ улицы (без номера дома) для индексации ЖК."""
+        return f"{self.street_type} {self.street}".strip()
+
+
+def _tokenize(part: str) -> List[str]:
+    """Разбить часть адреса на токены в нижнем регистре."""
+    part = part.lower().replace("ё", "е")
+    return [token.strip("-") for token in _SEPARATOR_RE.split(part) if token.strip("-")]
+
+
+def _house_parts(tokens: List[str]) -> List[str]:
+    """Части номера дома из токенов с маркерами: ["д", "1", "корп", "2"] → ["1", "к2"]."""
+    parts = []
+    marker = ""
+    for token in tokens:
+        if token in HOUSE_MARKERS:
+            marker = HOUSE_MARKERS[token]
+            continue
+        parts.append(f"{marker}{token}")
+        marker = ""
+    return parts
+
+
+def _split_street_house(tokens: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Разделить часть адреса с типом улицы на слова названия и токены номера дома.
+
+    Номер дома может идти в той же части без запятой ("ул. Ленина 10"): он
+    начинается после типа улицы и хотя бы одного слова названия - с маркера дома
+    или токена с цифрой в начале, кроме порядковых числительных ("ул. 8 Марта",
+    "ул. Парковая 3-я").
+    """
+    words: List[str] = []
+    after_type = False
+    for index, token in enumerate(tokens):
+        if token in STREET_TYPES:
+            after_type = True
+            continue
+        is_house = token in HOUSE_MARKERS or (_HAS_DIGIT_RE.match(token) and not _ORDINAL_RE.match(token))
+        if after_type and words and is_house:
+            return words, tokens[index:]
+        words.append(token)
+    return words, []
+
+
+def _join_house_parts(parts: List[str]) -> str:
+    """
+    Собрать номер дома из частей.
+
+    Части с маркером (к2, с3) и буквы дописываются вплотную, поэтому "1, корп. 2"
+    и "1к2" дают одинаковый результат. Между частями, на стыке которых цифра
+    с обеих сторон, ставится HOUSE_PART_SEPARATOR.
+    """
+    house = ""
+    for part in parts:
+        if house and house[-1].isdigit() and part[0].isdigit():
+            house += HOUSE_PART_SEPARATOR
+        house += part
+    return house
+
+
+def normalize_address(address: Optional[str]) -> NormalizedAddress:
+    """
+    Нормализовать адрес.
+
+    Приводит регистр, убирает пунктуацию и раскрывает сокращения, так что
+    "г. Москва, ул. Солнечная, д. 1", "Москва, Солнечная ул., 1" и
+    "Москва, ул. Солнечная 1" дают одинаковый результат.
+
+    Args:
+        address: Адрес в свободной форме
+
+    Returns:
+        NormalizedAddress с компонентами адреса
+    """
+    city = ""
+    street_type = ""
+    street_words: List[str] = []
+    house_parts: List[str] = []
+
+    if not address:
+        return NormalizedAddress(city, street_type, "", "")
+
+    parts = [p for p in address.split(",") if p.strip()]
+    for index, part in enumerate(parts):
+        tokens = _tokenize(part)
+        if not tokens:
+            continue
+
+        if any(token in CITY_MARKERS for token in tokens):
+            city = " ".join(t for t in tokens if t not in CITY_MARKERS)
+            continue
+
+        part_street_type = next((STREET_TYPES[t] for t in tokens if t in STREET_TYPES), "")
+        if part_street_type:
+            street_type = part_street_type
+            words, house_tokens = _split_street_house(tokens)
+            street_words.extend(words)
+            house_parts.extend(_house_parts(house_tokens))
+            continue
+
+        if tokens[0] in HOUSE_MARKERS or _HAS_DIGIT_RE.match(tokens[0]):
+            house_parts.extend(_house_parts(tokens))
+            continue
+
+        # Часть без маркеров: первая - город, остальные - улица
+        if index == 0 and not city and len(parts) > 1:
+            city = " ".join(tokens)
+        else:
+            street_words.extend(tokens)
+
+    return NormalizedAddress(
+        city=city,
+        street_type=street_type,
+        street=" ".join(street_words),
+        house=_join_house_parts(house_parts),
+    )
+
+
+def address_key(address: Optional[str]) -> str:
+    """Канонический ключ адреса (для поиска дублей)."""
+    return normalize_address(address).key
+
+
+def trigrams(value: str) -> Set[str]:
+    """Множество триграмм строки (как в pg_trgm: слова дополняются пробелами)."""
+    result: Set[str] = set()
+    for word in value.split():
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def trigram_similarity(left: Set[str], right: Set[str]) -> float:
+    """Коэффициент похожести двух множеств триграмм (0..1)."""
+    if not left or not right:
+        return 0.0
+    common = len(left & right)
+    return common / (len(left) + len(right) - common)
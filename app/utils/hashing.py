@@ -1,9 +1,48 @@
 """Утилиты для хэширования."""
+from typing import Optional
 import hashlib
 
+# Разделитель полей и маркер отсутствующего значения в каноническом представлении:
+# управляющие символы не встречаются в данных, поэтому None, "" и "|" в полях не путаются
+FIELD_SEPARATOR = "\x1f"
+NULL_MARKER = "\x00"
+# Точность координат в хэше (6 знаков - около 10 см)
+COORDINATE_PRECISION = 6
 
-def calculate_data_hash(name: str, address: str = None, description: str = None, developer: str = None) -> str:
-    """Вычислить хэш значимых полей ЖК."""
-    data_str = f"{name}|{address or ''}|{description or ''}|{developer or ''}"
-    return hashlib.sha256(data_str.encode('utf-8')).hexdigest()
 
+def _encode_text(value: Optional[str]) -> str:
+    return NULL_MARKER if value is None else value
+
+
+def _encode_coordinate(value: Optional[float]) -> str:
+    return NULL_MARKER if value is None else f"{float(value):.{COORDINATE_PRECISION}f}"
+
+
+def calculate_data_hash(
+    name: str,
+    address: str = None,
+    description: str = None,
+    developer: str = None,
+    status: str = None,
+    latitude: float = None,
+    longitude: float = None,
+) -> int:
+    """
+    Вычислить хэш значимых полей ЖК.
+
+    Поля кодируются канонически (фиксированный порядок, разделитель \\x1f,
+    None - \\x00, координаты с COORDINATE_PRECISION знаками) и хэшируются
+    BLAKE2b с 8-байтным дайджестом. Результат - знаковое 64-битное целое
+    (колонка BIGINT); хэш не криптографический, служит только для обнаружения изменений.
+    """
+    data_str = FIELD_SEPARATOR.join((
+        _encode_text(name),
+        _encode_text(address),
+        _encode_text(description),
+        _encode_text(developer),
+        _encode_text(status),
+        _encode_coordinate(latitude),
+        _encode_coordinate(longitude),
+    ))
+    digest = hashlib.blake2b(data_str.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
@@ -0,0 +1,83 @@
+"""Потоковый разбор списка элементов из JSON ответа API."""
+from typing import Any, Iterator, Optional, Sequence
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Пути к списку элементов в порядке проверки: data.list, data (список), list
+LIST_PATHS = (("data", "list"), ("data",), ("list",))
+
+
+def _skip_ws(text: str, pos: int) -> int:
+    return _WHITESPACE.match(text, pos).end()
+
+
+def _expect(text: str, pos: int, char: str) -> int:
+    if text[pos:pos + 1] != char:
+        raise ValueError(f"Ожидался '{char}' в позиции {pos}")
+    return pos + 1
+
+
+def _find_value(text: str, pos: int, path: Sequence[str]) -> Optional[int]:
+    """
+    Позиция значения по пути ключей внутри объекта, начинающегося в pos.
+    
+    Значения других ключей пропускаются (разбираются по одному и сразу отбрасываются).
+    """
+    pos = _skip_ws(text, _expect(text, pos, "{"))
+    if text[pos:pos + 1] == "}":
+        return None
+    while True:
+        key, pos = _decoder.raw_decode(text, pos)
+        pos = _skip_ws(text, _expect(text, _skip_ws(text, pos), ":"))
+        if key == path[0]:
+            if len(path) == 1:
+                return pos
+            if text[pos:pos + 1] != "{":
+                return None
+            return _find_value(text, pos, path[1:])
+        _, pos = _decoder.raw_decode(text, pos)
+        pos = _skip_ws(text, pos)
+        if text[pos:pos + 1] == "}":
+            return None
+        pos = _skip_ws(text, _expect(text, pos, ","))
+
+
+def _iter_array(text: str, pos: int) -> Iterator[Any]:
+    """Элементы массива, начинающегося в pos, по одному."""
+    pos = _skip_ws(text, _expect(text, pos, "["))
+    if text[pos:pos + 1] == "]":
+        return
+    while True:
+        item, pos = _decoder.raw_decode(text, pos)
+        yield item
+        pos = _skip_ws(text, pos)
+        if text[pos:pos + 1] == "]":
+            return
+        pos = _skip_ws(text, _expect(text, pos, ","))
+
+
+def iter_list_items(text: str) -> Iterator[Any]:
+    """
+    Элементы списка ЖК из текста ответа API по одному.
+    
+    Список ищется по LIST_PATHS (data.list, data, list) или ответ целиком - массив.
+    В отличие от json.loads, в памяти одновременно находится только текущий
+    элемент, а не весь ответ в виде объектов Python. Если список не найден,
+    элементов нет.
+    
+    Raises:
+        ValueError: Если ответ не является корректным JSON (ошибка может возникнуть
+                    после того, как часть элементов уже выдана)
+    """
+    pos = _skip_ws(text, 0)
+    if text[pos:pos + 1] == "[":
+        yield from _iter_array(text, pos)
+        return
+    for path in LIST_PATHS:
+        value_pos = _find_value(text, pos, path)
+        if value_pos is not None and text[value_pos:value_pos + 1] == "[":
+            yield from _iter_array(text, value_pos)
+            return
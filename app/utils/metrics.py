@@ -0,0 +1,312 @@
+"""Метрики приложения в формате Prometheus (без внешних зависимостей)."""
+from typing import Callable, Dict, List, Sequence, Tuple
+import math
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    """Экранировать значение метки."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Сформировать блок меток {name="value",...}."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Форматировать значение метрики."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Базовый класс метрики с метками."""
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Метрика {self.name} ожидает метки {self.labelnames}, получены {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Представление метрики в текстовом формате Prometheus."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Монотонно растущий счётчик."""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        """Увеличить счётчик."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Gauge(_Metric):
+    """Значение, которое может как расти, так и уменьшаться."""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        """Установить значение."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        """Увеличить значение."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        """Уменьшить значение."""
+        self.inc(-amount, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Histogram(_Metric):
+    """Гистограмма распределения значений (длительности, размеры)."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Для каждого набора меток: (счётчики корзин, сумма, количество)
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        """Зарегистрировать наблюдение."""
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels) -> "_Timer":
+        """Контекстный менеджер для измерения длительности блока."""
+        return _Timer(self, labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class _Timer:
+    """Измеритель длительности для Histogram.time()."""
+
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+
+
+class Registry:
+    """Реестр метрик процесса."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Зарегистрировать метрику."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Метрика {metric.name} уже зарегистрирована")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Добавить функцию, обновляющую метрики непосредственно перед выгрузкой."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Все метрики в текстовом формате Prometheus."""
+        for collector in self._collectors:
+            collector()
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# API
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Длительность обработки HTTP запросов",
+    ["method", "route", "status"],
+))
+HTTP_REQUESTS_IN_PROGRESS = REGISTRY.register(Gauge(
+    "http_requests_in_progress", "Количество HTTP запросов в обработке",
+))
+ADMISSION_IN_FLIGHT = REGISTRY.register(Gauge(
+    "admission_in_flight", "Запросы в обработке по группам маршрутов",
+    ["group"],
+))
+ADMISSION_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "admission_queue_depth", "Запросы в очереди ожидания по группам маршрутов",
+    ["group"],
+))
+ADMISSION_WAIT = REGISTRY.register(Histogram(
+    "admission_wait_seconds", "Время ожидания в очереди допуска",
+    ["group"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+))
+ADMISSION_SHED = REGISTRY.register(Counter(
+    "admission_shed_total", "Запросы, отклонённые с 503 при перегрузке",
+    ["group", "reason"],
+))
+
+# БД
+DB_QUERY_DURATION = REGISTRY.register(Histogram(
+    "db_query_duration_seconds", "Длительность SQL запросов",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+))
+DB_POOL_SIZE = REGISTRY.register(Gauge("db_pool_size", "Размер пула соединений"))
+DB_POOL_CHECKED_OUT = REGISTRY.register(Gauge("db_pool_checked_out", "Занятые соединения пула"))
+DB_POOL_OVERFLOW = REGISTRY.register(Gauge("db_pool_overflow", "Соединения сверх размера пула"))
+DB_REPLICA_LAG = REGISTRY.register(Gauge(
+    "db_replica_lag_seconds", "Отставание реплики по последней проверке (-1 - недоступна)",
+    ["replica"],
+))
+DB_REPLICA_HEALTHY = REGISTRY.register(Gauge(
+    "db_replica_healthy", "Реплика используется для чтения (1) или исключена (0)",
+    ["replica"],
+))
+DB_READ_SESSIONS = REGISTRY.register(Counter(
+    "db_read_sessions_total", "Сессии для чтения",
+    ["target"],
+))
+
+# Парсер
+PARSER_PAGE_FETCH_DURATION = REGISTRY.register(Histogram(
+    "parser_page_fetch_seconds", "Длительность загрузки страницы API источника",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+))
+PARSER_ANTIBOT_WAIT = REGISTRY.register(Histogram(
+    "parser_antibot_wait_seconds", "Время ожидания прохождения антибот-системы",
+    buckets=(1.0, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0, 120.0),
+))
+PARSER_PAGE_RECORDS = REGISTRY.register(Histogram(
+    "parser_page_records", "Количество записей на странице ответа API",
+    buckets=(0, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+))
+PARSER_VALIDATION_FAILURES = REGISTRY.register(Counter(
+    "parser_validation_failures_total", "Ошибки валидации DTO при парсинге",
+))
+PARSER_REQUEST_ERRORS = REGISTRY.register(Counter(
+    "parser_request_errors_total", "Ошибки запросов к API источника",
+    ["kind"],
+))
+PARSER_RETRIES = REGISTRY.register(Counter(
+    "parser_retries_total", "Повторные запросы страниц API источника",
+))
+PARSER_FAILED_PAGES = REGISTRY.register(Counter(
+    "parser_failed_pages_total", "Страницы, не загруженные после всех попыток",
+))
+PARSER_UNCHANGED_PAGES = REGISTRY.register(Counter(
+    "parser_unchanged_pages_total", "Страницы, совпавшие с уже обработанными (обработка пропущена)",
+))
+PARSER_DETAIL_FETCHES = REGISTRY.register(Counter(
+    "parser_detail_fetches_total", "Запросы деталей ЖК",
+    ["result"],
+))
+PARSER_BLOCKED_REQUESTS = REGISTRY.register(Counter(
+    "parser_blocked_requests_total", "Запросы браузера, отклонённые при прохождении антибота",
+    ["resource_type"],
+))
+PARSER_RATE_LIMIT = REGISTRY.register(Gauge(
+    "parser_rate_limit", "Текущая допустимая скорость запросов к источнику (запросов/с)",
+))
+PARSER_PAGE_SIZE = REGISTRY.register(Gauge(
+    "parser_page_size", "Текущий размер страницы запросов к API источника (записей)",
+))
+
+# Актуализация
+UPDATER_COMPLEXES = REGISTRY.register(Counter(
+    "updater_complexes_total", "ЖК, обработанные при актуализации",
+    ["result"],
+))
+UPDATER_RUN_DURATION = REGISTRY.register(Histogram(
+    "updater_run_duration_seconds", "Длительность запуска актуализации",
+    buckets=(10, 30, 60, 300, 600, 1800, 3600, 7200, 14400),
+))
+UPDATER_RUNS = REGISTRY.register(Counter(
+    "updater_runs_total", "Запуски актуализации",
+    ["status"],
+))
@@ -0,0 +1,177 @@
+"""Профилирование актуализации и API запросов по запросу (cProfile, сэмплер стеков, tracemalloc)."""
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import cProfile
+import logging
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Одновременно может работать только один профилировщик (cProfile и tracemalloc глобальны)
+_active_lock = threading.Lock()
+
+
+class StackSampler(threading.Thread):
+    """
+    Сэмплер стеков потока.
+
+    С заданным интервалом снимает стек целевого потока через sys._current_frames()
+    и считает одинаковые стеки. Результат - collapsed stacks ("a;b;c count"),
+    который напрямую принимают flamegraph.pl и speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class Profiler:
+    """
+    Профилировщик участка кода.
+
+    Пишет в каталог PROFILING_DIR артефакты с общим префиксом:
+    - <prefix>.pstats - статистика cProfile (snakeviz, gprof2dot, flameprof)
+    - <prefix>.collapsed - сэмплированные стеки для flamegraph
+    - <prefix>.alloc.txt - топ-N мест выделения памяти по tracemalloc
+
+    Если уже работает другой профилировщик, этот не запускается (active=False).
+    """
+
+    def __init__(self, name: str):
+        self.name = re.sub(r"[^\w.-]+", "_", name).strip("_") or "profile"
+        self.active = False
+        self.artifacts: List[str] = []
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._started = 0.0
+
+    def start(self) -> bool:
+        """Начать профилирование. Возвращает False, если профилировщик уже занят."""
+        if not _active_lock.acquire(blocking=False):
+            return False
+        self.active = True
+        self._started = time.perf_counter()
+        tracemalloc.start(settings.PROFILING_TRACEMALLOC_FRAMES)
+        self._sampler = StackSampler(threading.get_ident(), settings.PROFILING_SAMPLE_INTERVAL)
+        self._sampler.start()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return True
+
+    def stop(self) -> List[str]:
+        """Остановить профилирование и записать артефакты."""
+        if not self.active:
+            return []
+        try:
+            self._profile.disable()
+            self._sampler.stop()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self.artifacts = self._write(snapshot, time.perf_counter() - self._started)
+            logger.info(f"Профиль '{self.name}' сохранён: {', '.join(self.artifacts)}")
+        except Exception as e:
+            logger.error(f"Ошибка при сохранении профиля '{self.name}': {e}")
+        finally:
+            self.active = False
+            _active_lock.release()
+        return self.artifacts
+
+    def _write(self, snapshot: tracemalloc.Snapshot, elapsed: float) -> List[str]:
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        prefix = directory / f"{datetime.now():%Y%m%d-%H%M%S}-{self.name}"
+
+        pstats_path = prefix.with_name(prefix.name + ".pstats")
+        self._profile.dump_stats(str(pstats_path))
+
+        collapsed_path = prefix.with_name(prefix.name + ".collapsed")
+        collapsed_path.write_text(self._sampler.collapsed(), encoding="utf-8")
+
+        alloc_path = prefix.with_name(prefix.name + ".alloc.txt")
+        top = snapshot.statistics("lineno")[:settings.PROFILING_TOP_ALLOCATIONS]
+        lines = [f"# {self.name}: {elapsed:.3f} c, топ-{len(top)} мест выделения памяти"]
+        lines.extend(str(stat) for stat in top)
+        alloc_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        return [str(pstats_path), str(collapsed_path), str(alloc_path)]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+class ProfilingState:
+    """Текущие настройки профилирования (изменяются через /admin/profiling)."""
+
+    def __init__(self):
+        self.profile_all_updater_runs = settings.PROFILING_UPDATER
+        self.updater_runs_requested = 0
+        self.api_sample_rate = settings.PROFILING_API_SAMPLE_RATE
+        self._lock = threading.Lock()
+
+    def take_updater_run(self) -> bool:
+        """Нужно ли профилировать очередной запуск актуализации."""
+        with self._lock:
+            if self.updater_runs_requested > 0:
+                self.updater_runs_requested -= 1
+                return True
+        return self.profile_all_updater_runs
+
+    def sample_api_request(self) -> bool:
+        """Попадает ли очередной API запрос в выборку профилирования."""
+        return self.api_sample_rate > 0 and random.random() < self.api_sample_rate
+
+    def as_dict(self) -> Dict:
+        return {
+            "profile_all_updater_runs": self.profile_all_updater_runs,
+            "updater_runs_requested": self.updater_runs_requested,
+            "api_sample_rate": self.api_sample_rate,
+            "directory": settings.PROFILING_DIR,
+        }
+
+
+state = ProfilingState()
+
+
+def list_artifacts(limit: int = 50) -> List[str]:
+    """Последние артефакты профилирования (новые первыми)."""
+    directory = Path(settings.PROFILING_DIR)
+    if not directory.exists():
+        return []
+    files = sorted(directory.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)
+    return [str(p) for p in files[:limit]]
@@ -0,0 +1,78 @@
+"""Выбор полей ответа (sparse fieldsets) на уровне SELECT."""
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Table
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class Projection:
+    """
+    Набор полей ответа и колонок, из которых они выбираются.
+
+    Поля задаются путями: "id", "house.address" (вложенный объект house).
+    Запрос выбирает только колонки нужных полей, строки сразу превращаются
+    в словари ответа без ORM объектов.
+    """
+
+    def __init__(self, fields: Dict[str, ColumnElement]):
+        # Путь поля → колонка (порядок путей - порядок полей в ответе)
+        self.fields = dict(fields)
+        # Колонка выбирается один раз, даже если из неё берётся несколько полей
+        # (например, house_id и house.id)
+        self._columns: List[ColumnElement] = []
+        self._keys: List[Tuple[str, Optional[str], int]] = []
+        for path, column in self.fields.items():
+            index = next((i for i, seen in enumerate(self._columns) if seen is column), None)
+            if index is None:
+                index = len(self._columns)
+                self._columns.append(column)
+            top, _, sub = path.partition(".")
+            self._keys.append((top, sub or None, index))
+
+    @property
+    def columns(self) -> List[ColumnElement]:
+        """Колонки для SELECT (без повторов)."""
+        return list(self._columns)
+
+    def tables(self) -> Set[Table]:
+        """Таблицы, колонки которых нужны (для решения, какие JOIN нужны)."""
+        return {column.table for column in self._columns}
+
+    def select(self, requested: Optional[str], always: Iterable[str] = ("id",)) -> "Projection":
+        """
+        Оставить только запрошенные поля.
+
+        Args:
+            requested: Поля через запятую ("id,house_id,housing_complex.name");
+                       имя вложенного объекта ("house") выбирает все его поля.
+                       Пусто - все поля.
+            always: Поля, которые возвращаются всегда
+
+        Raises:
+            ValueError: Если запрошено неизвестное поле
+        """
+        if not requested or not requested.strip():
+            return self
+        wanted = {name.strip() for name in requested.split(",") if name.strip()}
+        wanted.update(always)
+        unknown = [
+            name for name in wanted
+            if name not in self.fields and not any(path.startswith(f"{name}.") for path in self.fields)
+        ]
+        if unknown:
+            raise ValueError(f"Неизвестные поля: {', '.join(sorted(unknown))}")
+        return Projection({
+            path: column for path, column in self.fields.items()
+            if path in wanted or path.partition(".")[0] in wanted
+        })
+
+    def to_dict(self, row: Sequence) -> dict:
+        """Строка запроса (колонки в порядке self.columns) → словарь ответа."""
+        item: dict = {}
+        for top, sub, index in self._keys:
+            value = row[index]
+            if sub is None:
+                item[top] = value
+            else:
+                item.setdefault(top, {})[sub] = value
+        return item
@@ -0,0 +1,91 @@
+"""Трассировка этапов актуализации (in-process, без внешних зависимостей)."""
+from contextlib import contextmanager
+from typing import Any, Dict, List, NamedTuple, Optional
+import time
+
+
+class Span(NamedTuple):
+    """Завершённый интервал выполнения этапа."""
+    name: str
+    start: float  # Смещение от начала трассировки, секунды
+    duration: float  # Длительность, секунды
+    attributes: Dict[str, Any]
+
+
+class Tracer:
+    """
+    Трассировщик одного запуска актуализации.
+
+    Записывает интервалы (spans) этапов и агрегирует их по имени этапа:
+    количество, суммарное и максимальное время. Список самих интервалов
+    ограничен MAX_SPANS, агрегаты считаются по всем интервалам.
+    """
+
+    MAX_SPANS = 500
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Span] = []
+        self.dropped_spans = 0
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Измерить этап.
+
+        Пример:
+            with tracer.span("page_fetch", offset=0) as attrs:
+                ...
+                attrs["records"] = 1000
+        """
+        started = time.perf_counter()
+        try:
+            yield attributes
+        finally:
+            self.record(name, started, time.perf_counter() - started, attributes)
+
+    def record(self, name: str, started: float, duration: float, attributes: Optional[Dict[str, Any]] = None):
+        """Записать завершённый интервал."""
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        stage["count"] += 1
+        stage["total_seconds"] += duration
+        stage["max_seconds"] = max(stage["max_seconds"], duration)
+
+        if len(self.spans) < self.MAX_SPANS:
+            self.spans.append(Span(name, started - self.started, duration, dict(attributes or {})))
+        else:
+            self.dropped_spans += 1
+
+    def report(self) -> Dict[str, Any]:
+        """Отчёт для сохранения: агрегаты по этапам и список интервалов."""
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "stages": {
+                name: {
+                    "count": int(stage["count"]),
+                    "total_seconds": round(stage["total_seconds"], 4),
+                    "max_seconds": round(stage["max_seconds"], 4),
+                }
+                for name, stage in self._stages.items()
+            },
+            "spans": [
+                {
+                    "name": span.name,
+                    "start": round(span.start, 4),
+                    "duration": round(span.duration, 4),
+                    **({"attributes": span.attributes} if span.attributes else {}),
+                }
+                for span in self.spans
+            ],
+            "dropped_spans": self.dropped_spans,
+        }
+
+
+class NullTracer(Tracer):
+    """Трассировщик, который ничего не записывает (по умолчанию вне актуализации)."""
+
+    def record(self, name: str, started: float, duration: float, attributes: Optional[Dict[str, Any]] = None):
+        pass
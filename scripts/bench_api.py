@@ -0,0 +1,245 @@
+"""Нагрузочный бенчмарк API привязок.
+
+Гоняет сценарии с заданной конкурентностью через асинхронный httpx клиент
+и сохраняет пропускную способность и перцентили задержки в JSON, пригодный
+для сравнения между коммитами.
+
+Сценарии:
+- login - POST /auth/login
+- list - GET /bindings с фильтрами по ЖК/дому
+- list_deep - GET /bindings с глубокой пагинацией (большой skip)
+- create - POST /bindings (новый дом на каждый запрос)
+- delete - DELETE /bindings/{id} для привязок, созданных сценарием create
+
+Подготовка данных: scripts/seed_benchmark_data.py
+
+Примеры:
+    python scripts/bench_api.py --concurrency 32 --requests 2000 --output bench_api.json
+    python scripts/bench_api.py --compare bench_api_old.json bench_api.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+# Пользователь, создаваемый scripts/seed_benchmark_data.py
+BENCH_USERNAME = "bench_user"
+BENCH_PASSWORD = "bench_password"
+
+SCENARIOS = ["login", "list", "list_deep", "create", "delete"]
+
+
+class ScenarioResult:
+    """Результаты одного сценария."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.status_codes: Dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def add(self, latency: float, status_code: int, ok: bool):
+        self.latencies.append(latency)
+        self.status_codes[str(status_code)] = self.status_codes.get(str(status_code), 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            index = min(len(latencies) - 1, max(0, int(round(p / 100 * len(latencies))) - 1))
+            return round(latencies[index] * 1000, 2)
+
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "status_codes": self.status_codes,
+            "throughput_rps": round(len(latencies) / self.elapsed, 1) if self.elapsed else 0.0,
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+        }
+
+
+class ApiBenchmark:
+    """Запуск сценариев против работающего сервиса."""
+
+    def __init__(self, base_url: str, concurrency: int, requests: int):
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.requests = requests
+        self.token: Optional[str] = None
+        self.complex_ids: List[int] = []
+        self.house_ids: List[int] = []
+        self.total_bindings = 0
+        self.created_binding_ids: List[int] = []
+        self.rnd = random.Random(42)
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    async def prepare(self, client: httpx.AsyncClient):
+        """Получить токен и выборку ID для запросов."""
+        response = await client.post(
+            f"{self.base_url}/auth/login",
+            data={"username": BENCH_USERNAME, "password": BENCH_PASSWORD},
+        )
+        response.raise_for_status()
+        self.token = response.json()["access_token"]
+
+        response = await client.get(f"{self.base_url}/bindings", params={"limit": 1000}, headers=self.headers)
+        response.raise_for_status()
+        body = response.json()
+        self.total_bindings = body["total"]
+        self.complex_ids = sorted({item["housing_complex_id"] for item in body["items"]})
+        self.house_ids = sorted({item["house_id"] for item in body["items"]})
+        if not self.complex_ids:
+            raise RuntimeError("В БД нет привязок: запустите scripts/seed_benchmark_data.py")
+
+    async def _run(self, client: httpx.AsyncClient, name: str, make_request: Callable) -> ScenarioResult:
+        """Выполнить сценарий: self.requests запросов с ограничением конкурентности."""
+        result = ScenarioResult(name)
+        counter = iter(range(self.requests))
+
+        async def worker():
+            for index in counter:
+                started = time.perf_counter()
+                try:
+                    response = await make_request(client, index)
+                    result.add(time.perf_counter() - started, response.status_code, response.is_success)
+                except httpx.HTTPError:
+                    result.add(time.perf_counter() - started, 0, False)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    async def _login(self, client: httpx.AsyncClient, index: int) -> httpx.Response:
+        return await client.post(
+            f"{self.base_url}/auth/login",
+            data={"username": BENCH_USERNAME, "password": BENCH_PASSWORD},
+        )
+
+    async def _list(self, client: httpx.AsyncClient, index: int) -> httpx.Response:
+        params = {"limit": 100}
+        if index % 2 == 0:
+            params["housing_complex_id"] = self.rnd.choice(self.complex_ids)
+        else:
+            params["house_id"] = self.rnd.choice(self.house_ids)
+        return await client.get(f"{self.base_url}/bindings", params=params, headers=self.headers)
+
+    async def _list_deep(self, client: httpx.AsyncClient, index: int) -> httpx.Response:
+        skip = self.rnd.randint(0, max(0, self.total_bindings - 100))
+        return await client.get(
+            f"{self.base_url}/bindings", params={"skip": skip, "limit": 100}, headers=self.headers
+        )
+
+    async def _create(self, client: httpx.AsyncClient, index: int) -> httpx.Response:
+        response = await client.post(
+            f"{self.base_url}/bindings",
+            json={
+                "housing_complex_id": self.rnd.choice(self.complex_ids),
+                "address": f"г. Москва, ул. Бенчмарк Нагрузка, д. {uuid.uuid4().hex[:12]}",
+                "floors": 10,
+                "apartments_count": 100,
+            },
+            headers=self.headers,
+        )
+        if response.status_code == 201:
+            self.created_binding_ids.append(response.json()["id"])
+        return response
+
+    async def _delete(self, client: httpx.AsyncClient, index: int) -> httpx.Response:
+        if not self.created_binding_ids:
+            # Нечего удалять: запрос к несуществующей привязке (ожидается 404)
+            return await client.delete(f"{self.base_url}/bindings/0", headers=self.headers)
+        binding_id = self.created_binding_ids.pop()
+        return await client.delete(f"{self.base_url}/bindings/{binding_id}", headers=self.headers)
+
+    async def run(self, scenarios: List[str]) -> Dict[str, dict]:
+        """Выполнить выбранные сценарии по очереди."""
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+            await self.prepare(client)
+            results = {}
+            for name in scenarios:
+                result = await self._run(client, name, getattr(self, f"_{name}"))
+                results[name] = result.summary()
+                print(f"{name}: {results[name]}")
+            return results
+
+
+def git_commit() -> Optional[str]:
+    """Текущий коммит репозитория (для сравнения результатов)."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_path: str, new_path: str):
+    """Сравнить два отчёта бенчмарка."""
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"{'сценарий':<12}{'метрика':<16}{old.get('commit') or 'old':>12}{new.get('commit') or 'new':>12}{'изм.':>10}")
+    for name, new_summary in new["scenarios"].items():
+        old_summary = old["scenarios"].get(name)
+        if not old_summary:
+            continue
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            before, after = old_summary.get(metric), new_summary.get(metric)
+            if before is None or after is None:
+                continue
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "-"
+            print(f"{name:<12}{metric:<16}{before:>12}{after:>12}{change:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный бенчмарк API привязок")
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="Запросов на сценарий")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Сценарии через запятую")
+    parser.add_argument("--output", default=None, help="Файл для JSON результата")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Сравнить два отчёта")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        sys.exit(0)
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Неизвестные сценарии: {', '.join(sorted(unknown))}")
+
+    benchmark = ApiBenchmark(args.base_url, args.concurrency, args.requests)
+    report = {
+        "commit": git_commit(),
+        "params": {"base_url": args.base_url, "concurrency": args.concurrency, "requests": args.requests},
+        "scenarios": asyncio.run(benchmark.run(scenarios)),
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
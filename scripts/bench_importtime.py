@@ -0,0 +1,98 @@
+"""Бенчмарк времени импорта и памяти приложения в обычном режиме и в режиме API_ONLY.
+
+Запускает `python -X importtime` в отдельном процессе для каждого режима и выводит
+суммарное время импорта, пиковый RSS процесса и самые тяжёлые модули верхнего уровня.
+В обычном режиме дополнительно импортируется то, что загружает lifespan при старте
+(планировщик, сервис актуализации с Playwright, Alembic).
+
+Пример:
+    python scripts/bench_importtime.py --top 15 --output bench_importtime.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Модули, загружаемые при старте воркера в каждом режиме
+MODULES = {
+    "full": [
+        "app.main",
+        "apscheduler.schedulers.asyncio",
+        "app.services.updater",
+        "alembic.command",
+    ],
+    "api_only": ["app.main"],
+}
+
+# Печатает пиковый RSS процесса после импорта (в КБ на Linux)
+IMPORT_CODE = "import resource, {modules}; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Разобрать вывод -X importtime.
+
+    Строки имеют вид: "import time:  self [us] | cumulative | imported package".
+    Возвращает список (cumulative_us, self_us, module, depth).
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        except ValueError:
+            continue
+        depth = (len(module) - len(module.lstrip())) // 2
+        entries.append((int(cumulative_us), int(self_us), module.strip(), depth))
+    return entries
+
+
+def measure(api_only: bool, top: int) -> dict:
+    """Измерить импорт приложения в отдельном процессе."""
+    env = dict(os.environ, API_ONLY="true" if api_only else "false")
+    code = IMPORT_CODE.format(modules=", ".join(MODULES["api_only" if api_only else "full"]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Импорт приложения завершился ошибкой:\n{proc.stderr[-2000:]}")
+
+    entries = parse_importtime(proc.stderr)
+    top_level = sorted((e for e in entries if e[3] <= 1), reverse=True)
+    return {
+        "total_import_ms": round(sum(e[1] for e in entries) / 1000, 1),
+        "modules": len(entries),
+        "max_rss_mb": round(int(proc.stdout.strip().splitlines()[-1]) / 1024, 1),
+        "playwright_imported": any(e[2].startswith("playwright") for e in entries),
+        "top_modules_ms": [
+            {"module": module, "cumulative_ms": round(cumulative / 1000, 1)}
+            for cumulative, _, module, _ in top_level[:top]
+        ],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк времени импорта app.main")
+    parser.add_argument("--top", type=int, default=10, help="Количество самых тяжёлых модулей")
+    parser.add_argument("--output", default=None, help="Файл для JSON результата")
+    args = parser.parse_args()
+
+    report = {
+        "python": sys.version.split()[0],
+        "full": measure(api_only=False, top=args.top),
+        "api_only": measure(api_only=True, top=args.top),
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
@@ -0,0 +1,172 @@
+"""Бенчмарк индексов: пропускная способность записи и размер индексов до/после 0003_dedup_indexes.
+
+Создаёт во временной схеме две копии таблиц houses/bindings с набором индексов
+до и после миграции, заполняет их одинаковыми данными и сравнивает:
+- скорость вставки привязок (строк/с)
+- размер индексов таблиц
+- время запроса списка привязок ЖК (фильтр + сортировка по id + LIMIT)
+
+Пример:
+    python scripts/bench_indexes.py --houses 100000 --bindings 200000 --output bench_indexes.json
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text
+from app.database import engine
+
+SCHEMA = "bench_indexes"
+
+VARIANTS = {
+    "before": [
+        "CREATE INDEX ix_houses_id_{v} ON {s}.houses_{v} (id)",
+        "CREATE UNIQUE INDEX ix_houses_address_{v} ON {s}.houses_{v} (address)",
+        "CREATE INDEX idx_house_address_{v} ON {s}.houses_{v} (address)",
+        "CREATE INDEX ix_bindings_id_{v} ON {s}.bindings_{v} (id)",
+        "CREATE INDEX idx_binding_house_{v} ON {s}.bindings_{v} (house_id)",
+        "CREATE INDEX idx_binding_housing_complex_{v} ON {s}.bindings_{v} (housing_complex_id)",
+    ],
+    "after": [
+        "CREATE UNIQUE INDEX ix_houses_address_key_{v} ON {s}.houses_{v} (address_key)",
+        "CREATE INDEX idx_binding_housing_complex_id_{v} ON {s}.bindings_{v} "
+        "(housing_complex_id, id) INCLUDE (house_id, created_at)",
+    ],
+}
+
+
+def create_tables(conn, variant: str):
+    """Создать таблицы варианта с его набором индексов."""
+    conn.execute(text(f"""
+        CREATE TABLE {SCHEMA}.houses_{variant} (
+            id SERIAL PRIMARY KEY,
+            address VARCHAR(500) NOT NULL,
+            address_key VARCHAR(500),
+            floors INTEGER,
+            apartments_count INTEGER
+        )
+    """))
+    conn.execute(text(f"""
+        CREATE TABLE {SCHEMA}.bindings_{variant} (
+            id SERIAL PRIMARY KEY,
+            house_id INTEGER NOT NULL,
+            housing_complex_id INTEGER NOT NULL,
+            created_at TIMESTAMPTZ DEFAULT now(),
+            CONSTRAINT uq_house_housing_complex_{variant} UNIQUE (house_id, housing_complex_id)
+        )
+    """))
+    for ddl in VARIANTS[variant]:
+        conn.execute(text(ddl.format(s=SCHEMA, v=variant)))
+
+
+def insert_rows(conn, variant: str, houses: int, bindings: int, complexes: int, batch: int) -> dict:
+    """Вставить дома и привязки батчами, вернуть скорость вставки."""
+    started = time.perf_counter()
+    for start in range(0, houses, batch):
+        rows = [
+            {"address": f"г. Москва, ул. Бенчмарк, д. {i}", "key": f"москва|ул бенчмарк|{i}"}
+            for i in range(start, min(start + batch, houses))
+        ]
+        conn.execute(
+            text(f"INSERT INTO {SCHEMA}.houses_{variant} (address, address_key) VALUES (:address, :key)"),
+            rows,
+        )
+    houses_elapsed = time.perf_counter() - started
+
+    rnd = random.Random(42)
+    pairs = set()
+    while len(pairs) < bindings:
+        pairs.add((rnd.randint(1, houses), rnd.randint(1, complexes)))
+    pairs = sorted(pairs, key=lambda _: rnd.random())
+
+    started = time.perf_counter()
+    for start in range(0, bindings, batch):
+        conn.execute(
+            text(f"INSERT INTO {SCHEMA}.bindings_{variant} (house_id, housing_complex_id) VALUES (:h, :c)"),
+            [{"h": h, "c": c} for h, c in pairs[start:start + batch]],
+        )
+    bindings_elapsed = time.perf_counter() - started
+
+    return {
+        "houses_rows_per_sec": round(houses / houses_elapsed, 1),
+        "bindings_rows_per_sec": round(bindings / bindings_elapsed, 1),
+    }
+
+
+def measure_sizes(conn, variant: str) -> dict:
+    """Размер индексов таблиц варианта в байтах."""
+    sizes = {}
+    for table in ("houses", "bindings"):
+        sizes[f"{table}_index_bytes"] = conn.execute(
+            text("SELECT pg_indexes_size(CAST(:t AS regclass))"), {"t": f"{SCHEMA}.{table}_{variant}"}
+        ).scalar()
+    return sizes
+
+
+def measure_list_query(conn, variant: str, complexes: int, runs: int) -> dict:
+    """Время запроса списка привязок ЖК (как GET /bindings?housing_complex_id=)."""
+    conn.execute(text(f"ANALYZE {SCHEMA}.bindings_{variant}"))
+    rnd = random.Random(7)
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        conn.execute(
+            text(
+                f"SELECT id, house_id, housing_complex_id, created_at FROM {SCHEMA}.bindings_{variant} "
+                "WHERE housing_complex_id = :c ORDER BY id LIMIT 100"
+            ),
+            {"c": rnd.randint(1, complexes)},
+        ).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "list_query_p50_ms": round(statistics.median(timings), 3),
+        "list_query_p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+    }
+
+
+def run(houses: int, bindings: int, complexes: int, batch: int, runs: int) -> dict:
+    """Запустить бенчмарк для обоих вариантов."""
+    results = {"params": {"houses": houses, "bindings": bindings, "complexes": complexes, "batch": batch}}
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    try:
+        for variant in VARIANTS:
+            with engine.begin() as conn:
+                create_tables(conn, variant)
+                result = insert_rows(conn, variant, houses, bindings, complexes, batch)
+            with engine.connect() as conn:
+                result.update(measure_sizes(conn, variant))
+                result.update(measure_list_query(conn, variant, complexes, runs))
+            results[variant] = result
+            print(f"{variant}: {result}")
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк индексов houses/bindings")
+    parser.add_argument("--houses", type=int, default=50000)
+    parser.add_argument("--bindings", type=int, default=100000)
+    parser.add_argument("--complexes", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=200, help="Повторов запроса списка")
+    parser.add_argument("--output", default=None, help="Файл для JSON результата")
+    args = parser.parse_args()
+
+    report = run(args.houses, args.bindings, args.complexes, args.batch, args.runs)
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
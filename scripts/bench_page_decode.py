@@ -0,0 +1,96 @@
+"""Бенчмарк разбора страницы ответа API наш.дом.рф.
+
+Сравнивает для страниц SyntheticSource (scripts/synthetic_source.py) разного размера:
+- loads - прежний путь: json.loads всего ответа → data.list → parse_items(список)
+- stream - потоковый путь: элементы data.list разбираются по одному
+  (app/utils/json_stream.py) и сразу фильтруются по городу и валидируются
+
+Для каждого варианта выводятся медианное время и пик памяти tracemalloc
+на разбор (без текста ответа, который есть в обоих вариантах). Браузер и БД не нужны.
+
+Пример:
+    python scripts/bench_page_decode.py --page-sizes 1000,10000,50000 --output bench_page_decode.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.parser import NashDomParser
+from scripts.synthetic_source import SyntheticSource
+
+
+def decode_loads(parser: NashDomParser, text: str, city: str):
+    """Прежний путь: весь ответ превращается в объекты Python."""
+    items = json.loads(text)["data"]["list"]
+    return parser.parse_items(items, search=city)
+
+
+def decode_stream(parser: NashDomParser, text: str, city: str):
+    """Потоковый путь."""
+    return parser.parse_items(parser._iter_page_items(text), search=city)
+
+
+def measure(func, parser: NashDomParser, text: str, city: str, repeat: int) -> dict:
+    """Медианное время и пик памяти на разбор."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(parser, text, city)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    func(parser, text, city)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "peak_mb": round(peak / 1024 / 1024, 2),
+        "records": result.total_requested,
+        "complexes": len(result.complexes),
+    }
+
+
+def bench(args) -> dict:
+    """Запустить бенчмарк."""
+    parser = NashDomParser()
+    results = {}
+    for page_size in args.page_sizes:
+        source = SyntheticSource(page_size, city=args.city, foreign_share=args.foreign_share, seed=args.seed)
+        text = json.dumps(source.page(0, page_size), ensure_ascii=False)
+        results[str(page_size)] = {
+            "text_mb": round(len(text.encode("utf-8")) / 1024 / 1024, 2),
+            "loads": measure(decode_loads, parser, text, args.city, args.repeat),
+            "stream": measure(decode_stream, parser, text, args.city, args.repeat),
+        }
+    return {
+        "params": {"city": args.city, "foreign_share": args.foreign_share, "repeat": args.repeat},
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк разбора страницы ответа API")
+    parser.add_argument(
+        "--page-sizes", type=lambda value: [int(size) for size in value.split(",")],
+        default=[1000, 10000, 50000], help="Размеры страниц через запятую",
+    )
+    parser.add_argument("--city", default="Москва")
+    parser.add_argument("--foreign-share", type=float, default=0.5, help="Доля записей из других городов")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов каждого варианта")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Файл для JSON результата")
+    args = parser.parse_args()
+
+    output = json.dumps(bench(args), ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
@@ -0,0 +1,142 @@
+"""Бенчмарк сериализации страницы списка привязок.
+
+Сравнивает для страницы GET /bindings (по умолчанию 1000 привязок с домом и ЖК):
+- pydantic - прежний путь: ORM объекты → BindingListResponse (from_attributes)
+  → jsonable_encoder → json.dumps, как в JSONResponse FastAPI
+- orjson_rows - строки запроса (BINDING_COLUMNS) → словари → orjson
+
+Для каждого варианта выводятся медианное время сериализации и размер ответа
+без сжатия, с gzip и с brotli (если установлен). БД не нужна: строки и ORM-подобные
+объекты генерируются в памяти, у части ЖК длинное описание.
+
+Пример:
+    python scripts/bench_serialization.py --items 1000 --output bench_serialization.json
+"""
+import argparse
+import gzip
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.api.bindings import binding_row_to_dict
+from app.config import get_settings
+from app.middleware.compression import brotli
+from app.schemas.binding import BindingListResponse
+
+DESCRIPTION = "Жилой комплекс бизнес-класса с подземным паркингом и благоустроенным двором. " * 12
+
+
+def make_rows(items: int, seed: int) -> list:
+    """Строки в формате BINDING_COLUMNS."""
+    rnd = random.Random(seed)
+    now = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(items):
+        complex_id = rnd.randint(1, 50000)
+        created = now - timedelta(minutes=rnd.randint(0, 10 ** 6))
+        rows.append((
+            rnd.randint(1, 10 ** 6),
+            complex_id,
+            i + 1,
+            created,
+            f"г. Москва, ул. Бенчмарк {rnd.randint(1, 5000)}, д. {rnd.randint(1, 100)}",
+            rnd.randint(5, 35),
+            rnd.randint(20, 420),
+            f"ЖК Бенчмарк {complex_id}",
+            f"г. Москва, ул. Бенчмарк {complex_id % 5000}",
+            DESCRIPTION if complex_id % 3 == 0 else None,
+            f"Застройщик {complex_id % 500}",
+            "Строится",
+            round(55.5 + rnd.random() * 0.5, 6),
+            round(37.3 + rnd.random() * 0.6, 6),
+            f"https://наш.дом.рф/сервисы/kn/{complex_id}",
+            created,
+            created,
+        ))
+    return rows
+
+
+def make_objects(rows: list) -> list:
+    """ORM-подобные объекты привязок для from_attributes (как при загрузке через ORM)."""
+    objects = []
+    for row in rows:
+        item = binding_row_to_dict(row)
+        item["house"] = SimpleNamespace(**item["house"])
+        item["housing_complex"] = SimpleNamespace(**item["housing_complex"])
+        objects.append(SimpleNamespace(**item))
+    return objects
+
+
+def serialize_pydantic(objects: list) -> bytes:
+    """Прежний путь: валидация Pydantic и стандартный JSON энкодер."""
+    response = BindingListResponse(items=objects, total=len(objects))
+    return json.dumps(
+        jsonable_encoder(response), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def serialize_rows(rows: list) -> bytes:
+    """Быстрый путь: строки → словари → orjson."""
+    return orjson.dumps({"items": [binding_row_to_dict(row) for row in rows], "total": len(rows)})
+
+
+def measure(func, arg, repeat: int) -> dict:
+    """Медианное время и размеры ответа."""
+    timings = []
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = func(arg)
+        timings.append(time.perf_counter() - started)
+    settings = get_settings()
+    result = {
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "min_ms": round(min(timings) * 1000, 2),
+        "bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)),
+    }
+    if brotli is not None:
+        result["brotli_bytes"] = len(brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY))
+    return result
+
+
+def bench(args) -> dict:
+    """Запустить бенчмарк."""
+    rows = make_rows(args.items, args.seed)
+    objects = make_objects(rows)
+    results = {
+        "pydantic": measure(serialize_pydantic, objects, args.repeat),
+        "orjson_rows": measure(serialize_rows, rows, args.repeat),
+    }
+    speedup = results["pydantic"]["median_ms"] / max(results["orjson_rows"]["median_ms"], 1e-6)
+    return {
+        "params": {"items": args.items, "repeat": args.repeat},
+        "results": results,
+        "speedup": round(speedup, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарк сериализации списка привязок")
+    parser.add_argument("--items", type=int, default=1000, help="Привязок на странице")
+    parser.add_argument("--repeat", type=int, default=50, help="Повторов каждого варианта")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Файл для JSON результата")
+    args = parser.parse_args()
+
+    output = json.dumps(bench(args), ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
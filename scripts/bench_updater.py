@@ -0,0 +1,207 @@
+"""Нагрузочный тест актуализации на синтетических данных.
+
+Прогоняет DataUpdater с парсером, получающим страницы из SyntheticSource
+(scripts/synthetic_source.py), без браузера и сети. Первый запуск - начальная
+загрузка, последующие - инкрементальные (между запусками change_rate записей
+меняется). Для каждого запуска измеряются:
+- время синхронизации от начала до конца
+- количество SQL запросов (и executemany среди них)
+- пиковое потребление памяти (RSS процесса, tracemalloc при --trace-memory)
+- результат (добавлено/обновлено/без изменений) и этапы из отчёта refresh_runs
+
+PARSER_MAX_RESULTS принудительно равен 0 (загружать все), как при снятии лимита.
+Размер страницы фиксирован (--page-size); с --adaptive-page-size он подстраивается
+по ходу запуска, начиная с размера последнего запуска города (--page-size, если
+запусков не было).
+Кэш ответов API выключен; с --page-cache он включается во временном каталоге
+(неизменившиеся страницы повторных запусков пропускаются). Описания ЖК загружаются
+из синтетического API деталей (--no-details отключает загрузку).
+Синтетические ЖК удаляются до и после теста (флаг --keep оставляет их).
+
+Пример:
+    python scripts/bench_updater.py --records 100000 --runs 2 --output bench_updater.json
+"""
+import argparse
+import asyncio
+import json
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import event, text
+from app.config import get_settings
+from app.database import SessionLocal, engine, upgrade_schema
+from app.models.housing_complex import HousingComplex
+from app.models.processed_page import ProcessedPage
+from app.models.refresh_run import RefreshRun
+from app.services.parser import NashDomParser
+from app.services.updater import DataUpdater
+from scripts.synthetic_source import SyntheticSource, make_fake_parser
+
+DELETE_CHUNK = 10000
+
+
+class StatementCounter:
+    """Счётчик SQL запросов движка."""
+
+    def __init__(self):
+        self.statements = 0
+        self.executemany = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        if executemany:
+            self.executemany += 1
+
+    def reset(self):
+        self.statements = 0
+        self.executemany = 0
+
+
+def cleanup(source: SyntheticSource):
+    """Удалить ЖК синтетического источника."""
+    db = SessionLocal()
+    try:
+        ids = list(source.hobj_ids())
+        for start in range(0, len(ids), DELETE_CHUNK):
+            urls = [f"{NashDomParser.BASE_URL}/сервисы/kn/{i}" for i in ids[start:start + DELETE_CHUNK]]
+            db.execute(
+                text(f"DELETE FROM {HousingComplex.__tablename__} WHERE source_url = ANY(:urls)"),
+                {"urls": urls},
+            )
+        # ЖК удалены в обход актуализации: отметки об обработке страниц больше не верны
+        db.execute(text(f"DELETE FROM {ProcessedPage.__tablename__}"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_once(source: SyntheticSource, counter: StatementCounter, latency: float, trace_memory: bool) -> dict:
+    """Один запуск актуализации."""
+    db = SessionLocal()
+    updater = DataUpdater(db, parser=make_fake_parser(source, latency))
+    counter.reset()
+    if trace_memory:
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    try:
+        result = asyncio.run(updater.update_housing_complexes(city=source.city))
+        elapsed = time.perf_counter() - started
+        run = db.get(RefreshRun, result["run_id"])
+        run_page_size = run.page_size
+        stages = {name: stage["total_seconds"] for name, stage in (run.stages or {}).get("stages", {}).items()}
+    finally:
+        asyncio.run(updater.close())
+        db.close()
+
+    report = {
+        "generation": source.generation,
+        "seconds": round(elapsed, 2),
+        "records_per_second": round(source.records / elapsed, 1) if elapsed else None,
+        "statements": counter.statements,
+        "executemany": counter.executemany,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "added": result["added"],
+        "updated": result["updated"],
+        "unchanged": result["unchanged"],
+        "skipped_pages": result["skipped_pages"],
+        "page_size": run_page_size,
+        "stages_seconds": stages,
+    }
+    if trace_memory:
+        report["tracemalloc_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+    return report
+
+
+def bench(args) -> dict:
+    """Запустить тест."""
+    settings = get_settings()
+    settings.PARSER_MAX_RESULTS = 0
+    settings.PARSER_PAGE_SIZE = args.page_size
+    settings.PARSER_ADAPTIVE_PAGE_SIZE = args.adaptive_page_size
+    cache_dir = None
+    if args.page_cache:
+        cache_dir = tempfile.mkdtemp(prefix="bench_page_cache_")
+        settings.PARSER_PAGE_CACHE_DIR = cache_dir
+    else:
+        settings.PARSER_PAGE_CACHE_MAX_MB = 0
+    settings.PARSER_DETAILS = not args.no_details
+
+    source = SyntheticSource(
+        args.records,
+        foreign_share=args.foreign_share,
+        malformed_share=args.malformed_share,
+        change_rate=args.change_rate,
+        seed=args.seed,
+    )
+
+    upgrade_schema()
+    cleanup(source)
+
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    if args.trace_memory:
+        tracemalloc.start()
+
+    runs = []
+    try:
+        for generation in range(args.runs):
+            source.generation = generation
+            report = run_once(source, counter, args.latency, args.trace_memory)
+            runs.append(report)
+            print(f"Запуск {generation}: {report}")
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+        if args.trace_memory:
+            tracemalloc.stop()
+        if not args.keep:
+            cleanup(source)
+        if cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return {
+        "params": {
+            "records": args.records,
+            "page_size": args.page_size,
+            "adaptive_page_size": args.adaptive_page_size,
+            "foreign_share": args.foreign_share,
+            "malformed_share": args.malformed_share,
+            "change_rate": args.change_rate,
+            "latency": args.latency,
+            "page_cache": args.page_cache,
+            "details": not args.no_details,
+        },
+        "runs": runs,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Нагрузочный тест актуализации на синтетических данных")
+    parser.add_argument("--records", type=int, default=100000, help="Записей в источнике")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--adaptive-page-size", action="store_true", help="Подстраивать размер страницы")
+    parser.add_argument("--runs", type=int, default=2, help="Запусков: начальная загрузка + инкрементальные")
+    parser.add_argument("--foreign-share", type=float, default=0.1, help="Доля записей из других городов")
+    parser.add_argument("--malformed-share", type=float, default=0.01, help="Доля некорректных записей")
+    parser.add_argument("--change-rate", type=float, default=0.05, help="Доля записей, меняющихся между запусками")
+    parser.add_argument("--latency", type=float, default=0.0, help="Имитация задержки загрузки страницы (с)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--page-cache", action="store_true", help="Включить кэш ответов API (во временном каталоге)")
+    parser.add_argument("--no-details", action="store_true", help="Не загружать описания ЖК из API деталей")
+    parser.add_argument("--trace-memory", action="store_true", help="Пик памяти Python по tracemalloc (медленнее)")
+    parser.add_argument("--keep", action="store_true", help="Не удалять синтетические ЖК после теста")
+    parser.add_argument("--output", default=None, help="Файл для JSON результата")
+    args = parser.parse_args()
+
+    output = json.dumps(bench(args), ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
@@ -10,6 +10,7 @@ from app.database import SessionLocal
 from app.models.house import House
 from app.models.housing_complex import HousingComplex
 from app.services.updater import DataUpdater
+from app.utils.address import address_key
 
 
 def init_test_data():
@@ -27,7 +28,7 @@ def init_test_data():
         
         created_houses = 0
         for address in houses_data:
-            existing = db.query(House).filter(House.address == address).first()
+            existing = db.query(House).filter(House.address_key == address_key(address)).first()
             if not existing:
                 house = House(address=address)
                 db.add(house)
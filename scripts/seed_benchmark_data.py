@@ -0,0 +1,147 @@
+"""Скрипт заполнения БД синтетическими данными для нагрузочного тестирования.
+
+Создаёт ЖК, дома и привязки заданного масштаба и пользователя для бенчмарка.
+Данные генерируются на стороне PostgreSQL (generate_series), поэтому миллионы
+строк создаются за минуты. Все синтетические записи помечены и удаляются флагом --reset.
+
+Пример:
+    python scripts/seed_benchmark_data.py --complexes 50000 --houses 1000000 --bindings 2000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.database import SessionLocal, upgrade_schema
+from app.models.binding import Binding
+from app.models.house import House
+from app.models.housing_complex import HousingComplex
+from app.models.user import User
+from app.services.auth import get_password_hash
+
+# Маркеры синтетических данных
+SOURCE_URL_PREFIX = "bench://complex/"
+ADDRESS_MARKER = "Бенчмарк"
+BENCH_USERNAME = "bench_user"
+BENCH_PASSWORD = "bench_password"
+
+
+def reset(db: Session):
+    """Удалить синтетические данные (привязки удаляются каскадно)."""
+    started = time.perf_counter()
+    db.execute(
+        text(f"DELETE FROM {HousingComplex.__tablename__} WHERE source_url LIKE :prefix"),
+        {"prefix": f"{SOURCE_URL_PREFIX}%"},
+    )
+    db.execute(
+        text(f"DELETE FROM {House.__tablename__} WHERE address LIKE :marker"),
+        {"marker": f"%{ADDRESS_MARKER}%"},
+    )
+    db.commit()
+    print(f"Синтетические данные удалены за {time.perf_counter() - started:.1f} c")
+
+
+def seed_complexes(db: Session, count: int):
+    """Создать ЖК."""
+    db.execute(text(f"""
+        INSERT INTO {HousingComplex.__tablename__}
+            (name, address, description, developer, source_url, data_hash)
+        SELECT
+            'ЖК {ADDRESS_MARKER} ' || i,
+            'г. Москва, ул. {ADDRESS_MARKER} ' || (i % 5000),
+            CASE WHEN i % 3 = 0 THEN repeat('Описание ЖК ', 20) END,
+            'Застройщик ' || (i % 500),
+            '{SOURCE_URL_PREFIX}' || i,
+            ('x' || substr(md5(i::text), 1, 16))::bit(64)::bigint
+        FROM generate_series(1, :count) AS i
+        ON CONFLICT (source_url) DO NOTHING
+    """), {"count": count})
+
+
+def seed_houses(db: Session, count: int):
+    """
+    Создать дома.
+
+    address_key формируется так же, как app.utils.address.address_key для
+    адреса вида "г. Москва, ул. Бенчмарк N, д. M".
+    """
+    db.execute(text(f"""
+        INSERT INTO {House.__tablename__} (address, address_key, floors, apartments_count)
+        SELECT
+            'г. Москва, ул. {ADDRESS_MARKER} ' || (i / 100) || ', д. ' || (i % 100),
+            'москва|ул {ADDRESS_MARKER.lower()} ' || (i / 100) || '|' || (i % 100),
+            5 + i % 30,
+            20 + i % 400
+        FROM generate_series(1, :count) AS i
+        ON CONFLICT (address_key) DO NOTHING
+    """), {"count": count})
+
+
+def seed_bindings(db: Session, count: int):
+    """Создать привязки синтетических домов к синтетическим ЖК."""
+    db.execute(text(f"""
+        WITH h AS (
+            SELECT array_agg(id ORDER BY id) AS ids FROM {House.__tablename__}
+            WHERE address LIKE :marker
+        ), c AS (
+            SELECT array_agg(id ORDER BY id) AS ids FROM {HousingComplex.__tablename__}
+            WHERE source_url LIKE :prefix
+        )
+        INSERT INTO {Binding.__tablename__} (house_id, housing_complex_id)
+        SELECT
+            h.ids[1 + i % cardinality(h.ids)],
+            c.ids[1 + (i * 31 + i / cardinality(h.ids)) % cardinality(c.ids)]
+        FROM h, c, generate_series(0, :count - 1) AS i
+        ON CONFLICT ON CONSTRAINT uq_house_housing_complex DO NOTHING
+    """), {"count": count, "marker": f"%{ADDRESS_MARKER}%", "prefix": f"{SOURCE_URL_PREFIX}%"})
+
+
+def ensure_user(db: Session):
+    """Создать пользователя для бенчмарка."""
+    if db.query(User).filter(User.username == BENCH_USERNAME).first() is None:
+        db.add(User(username=BENCH_USERNAME, hashed_password=get_password_hash(BENCH_PASSWORD)))
+
+
+def seed(complexes: int, houses: int, bindings: int, do_reset: bool):
+    """Заполнить БД синтетическими данными."""
+    upgrade_schema()
+    db: Session = SessionLocal()
+    try:
+        if do_reset:
+            reset(db)
+
+        for name, func, count in (
+            ("ЖК", seed_complexes, complexes),
+            ("Дома", seed_houses, houses),
+            ("Привязки", seed_bindings, bindings),
+        ):
+            started = time.perf_counter()
+            func(db, count)
+            db.commit()
+            print(f"{name}: {count} за {time.perf_counter() - started:.1f} c")
+
+        ensure_user(db)
+        db.commit()
+        db.execute(text("ANALYZE"))
+        print(f"Пользователь бенчмарка: {BENCH_USERNAME} / {BENCH_PASSWORD}")
+    except Exception as e:
+        print(f"Ошибка при заполнении данных: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Синтетические данные для нагрузочного тестирования")
+    parser.add_argument("--complexes", type=int, default=50000)
+    parser.add_argument("--houses", type=int, default=1000000)
+    parser.add_argument("--bindings", type=int, default=2000000)
+    parser.add_argument("--reset", action="store_true", help="Удалить синтетические данные перед заполнением")
+    args = parser.parse_args()
+    seed(args.complexes, args.houses, args.bindings, args.reset)
@@ -0,0 +1,56 @@
+"""Скрипт пакетного подбора ЖК для домов без привязок."""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.house import House
+from app.services.matcher import AddressMatcher
+
+
+def suggest_bindings(output: str, limit: int, include_bound: bool):
+    """Подобрать ЖК для домов и записать результат в JSON Lines."""
+    db: Session = SessionLocal()
+    try:
+        started = time.perf_counter()
+        matcher = AddressMatcher.from_db(db)
+        print(f"Индекс построен за {time.perf_counter() - started:.1f} c ({len(matcher)} ЖК)")
+
+        query = db.query(House.id, House.address)
+        if not include_bound:
+            query = query.filter(~House.bindings.any())
+
+        processed = 0
+        matched = 0
+        started = time.perf_counter()
+        with open(output, "w", encoding="utf-8") as f:
+            for house_id, address in query.yield_per(5000):
+                candidates = matcher.match(address, limit=limit)
+                processed += 1
+                if candidates:
+                    matched += 1
+                f.write(json.dumps({
+                    "house_id": house_id,
+                    "address": address,
+                    "candidates": [c._asdict() for c in candidates],
+                }, ensure_ascii=False) + "\n")
+
+        elapsed = time.perf_counter() - started
+        print(f"Обработано домов: {processed}, с кандидатами: {matched}, за {elapsed:.1f} c")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default="binding_suggestions.jsonl", help="Файл результата")
+    parser.add_argument("--limit", type=int, default=3, help="Кандидатов на дом")
+    parser.add_argument("--include-bound", action="store_true", help="Включать дома с привязками")
+    args = parser.parse_args()
+    suggest_bindings(args.output, args.limit, args.include_bound)
@@ -0,0 +1,213 @@
+"""Синтетический источник данных в формате API наш.дом.рф.
+
+Генерирует страницы ответа API ({"data": {"list": [...]}}) с элементами
+той же структуры, что и реальный источник: hobjId, objCommercNm, shortAddr,
+вложенный developer, siteStatus, координаты и т.д. Страницы генерируются
+на лету, поэтому источник на миллион записей не держится в памяти целиком.
+
+Настраиваются:
+- доля записей из других городов (отфильтровываются парсером по shortAddr)
+- доля некорректных записей (ошибки валидации и обработки элементов)
+- доля записей, изменяющихся между запусками (generation)
+
+FakeNashDomParser подменяет загрузку страниц через браузер на этот источник,
+оставляя реальные разбор JSON, извлечение, фильтрацию по городу и валидацию DTO.
+
+Пример (выгрузить страницы в файлы):
+    python scripts/synthetic_source.py --records 10000 --page-size 1000 --output-dir synthetic_pages
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Синтетические hobjId начинаются отсюда, чтобы не пересекаться с реальными
+ID_OFFSET = 900_000_000
+
+STREETS = [
+    "ул. Солнечная", "ул. Лесная", "пр-кт Мира", "ул. Садовая", "ш. Варшавское",
+    "ул. Речная", "наб. Пресненская", "б-р Осенний", "ул. Новая", "пер. Тихий",
+]
+OTHER_CITIES = [
+    "г. Санкт-Петербург", "г. Казань", "г. Новосибирск", "г. Екатеринбург",
+    # Похоже на искомый город, но не должно проходить фильтр
+    "Московская обл., г. Красногорск",
+]
+STATUSES = ["Строится", "Сдан", "Проблемный", "Приостановлено"]
+NAME_WORDS = ["Парк", "Сити", "Резиденция", "Квартал", "Гармония", "Престиж", "Лето", "Облака"]
+DEVELOPERS = 2000
+
+
+class SyntheticSource:
+    """Детерминированный генератор страниц API наш.дом.рф."""
+
+    def __init__(
+        self,
+        records: int,
+        city: str = "Москва",
+        foreign_share: float = 0.1,
+        malformed_share: float = 0.01,
+        change_rate: float = 0.05,
+        seed: int = 42,
+    ):
+        self.records = records
+        self.city = city
+        self.foreign_share = foreign_share
+        self.malformed_share = malformed_share
+        self.change_rate = change_rate
+        self.seed = seed
+        # Номер "запуска": с каждым поколением change_rate записей меняются
+        self.generation = 0
+
+    def _unit(self, *parts) -> float:
+        """Детерминированное псевдослучайное число [0, 1) для набора параметров."""
+        digest = hashlib.blake2b(f"{self.seed}:{parts}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2 ** 64
+
+    def version(self, index: int) -> int:
+        """Сколько раз запись изменилась к текущему поколению."""
+        return sum(1 for g in range(1, self.generation + 1) if self._unit("change", index, g) < self.change_rate)
+
+    def item(self, index: int) -> Optional[dict]:
+        """Элемент data.list для записи с порядковым номером index."""
+        rnd = random.Random(self.seed * 1_000_003 + index)
+        hobj_id = ID_OFFSET + index
+        version = self.version(index)
+
+        if rnd.random() < self.foreign_share:
+            city = rnd.choice(OTHER_CITIES)
+        else:
+            city = f"г. {self.city}"
+        developer_id = rnd.randrange(DEVELOPERS)
+        latitude = round(55.5 + rnd.random() * 0.5, 6)
+        longitude = round(37.3 + rnd.random() * 0.6, 6)
+
+        item = {
+            "hobjId": hobj_id,
+            "objCommercNm": f"ЖК {rnd.choice(NAME_WORDS)} {index}" + (f" (очередь {version + 1})" if version else ""),
+            "shortAddr": f"{city}, {rnd.choice(STREETS)}, д. {rnd.randint(1, 200)}",
+            "developer": {
+                "devId": developer_id,
+                "shortName": f"ООО \"СЗ Девелопер {developer_id}\"",
+                "fullName": f"Общество с ограниченной ответственностью \"Специализированный застройщик Девелопер {developer_id}\"",
+                "devInn": f"77{developer_id:08d}",
+            },
+            "siteStatus": STATUSES[(rnd.randrange(len(STATUSES)) + version) % len(STATUSES)],
+            "latitude": latitude,
+            "longitude": longitude,
+            "hobjRenderPhotoUrl": None,
+            "objReady100PercDt": f"{rnd.randint(2020, 2030)}-{rnd.randint(1, 12):02d}-01",
+            "objFloorMin": rnd.randint(3, 10),
+            "objFloorMax": rnd.randint(10, 40),
+            "objElemLivingCnt": rnd.randint(50, 2000),
+        }
+
+        if rnd.random() < self.malformed_share:
+            kind = rnd.randrange(3)
+            if kind == 0:
+                # Ошибка валидации DTO
+                item["latitude"] = "н/д"
+            elif kind == 1:
+                # Без адреса: отбрасывается фильтром по городу
+                item["shortAddr"] = None
+            else:
+                # Элемент не является объектом: ошибка обработки
+                return None
+        return item
+
+    def page(self, offset: int, limit: int) -> dict:
+        """Страница ответа API."""
+        end = min(offset + limit, self.records)
+        return {"data": {"list": [self.item(i) for i in range(offset, end)], "total": self.records}}
+
+    def detail(self, hobj_id: str) -> dict:
+        """Ответ API деталей ЖК (у части ЖК описания нет)."""
+        index = int(hobj_id) - ID_OFFSET
+        rnd = random.Random(self.seed * 1_000_003 + index)
+        description = None
+        if rnd.random() < 0.8:
+            description = f"Жилой комплекс {index}: {rnd.choice(NAME_WORDS).lower()}, {rnd.randint(3, 40)} этажей"
+        return {"data": {"hobjId": int(hobj_id), "objDescription": description}}
+
+    def hobj_ids(self) -> range:
+        """Все hobjId источника."""
+        return range(ID_OFFSET, ID_OFFSET + self.records)
+
+
+def make_fake_parser(source: SyntheticSource, latency: float = 0.0):
+    """
+    Парсер, получающий страницы из синтетического источника вместо браузера.
+
+    Импорт парсера отложен, чтобы генератор можно было использовать без Playwright.
+    """
+    from app.services.parser import NashDomParser
+
+    class FakeNashDomParser(NashDomParser):
+        """NashDomParser с синтетическим источником вместо Playwright."""
+
+        async def _fetch_page_text(
+            self, offset: int, limit: int, search: str, params: Optional[Dict[str, str]] = None
+        ) -> Optional[str]:
+            with self.tracer.span("page_fetch", offset=offset, limit=limit):
+                if latency:
+                    await asyncio.sleep(latency)
+                return json.dumps(source.page(offset, limit), ensure_ascii=False)
+
+        async def _get_detail_page(self):
+            return None
+
+        async def _fetch_detail_text(self, page, hobj_id: str) -> Optional[str]:
+            with self.tracer.span("detail_fetch", hobj_id=hobj_id):
+                if latency:
+                    await asyncio.sleep(latency)
+                return json.dumps(source.detail(hobj_id), ensure_ascii=False)
+
+        async def _close_browser(self):
+            pass
+
+    return FakeNashDomParser()
+
+
+def dump_pages(source: SyntheticSource, page_size: int, output_dir: str) -> List[str]:
+    """Записать страницы источника в JSON файлы."""
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for offset in range(0, source.records, page_size):
+        path = directory / f"page_{offset:08d}.json"
+        path.write_text(json.dumps(source.page(offset, page_size), ensure_ascii=False), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Синтетические страницы API наш.дом.рф")
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--city", default="Москва")
+    parser.add_argument("--foreign-share", type=float, default=0.1, help="Доля записей из других городов")
+    parser.add_argument("--malformed-share", type=float, default=0.01, help="Доля некорректных записей")
+    parser.add_argument("--change-rate", type=float, default=0.05, help="Доля записей, меняющихся за поколение")
+    parser.add_argument("--generation", type=int, default=0, help="Поколение данных (номер запуска)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-dir", default="synthetic_pages")
+    args = parser.parse_args()
+
+    source = SyntheticSource(
+        args.records,
+        city=args.city,
+        foreign_share=args.foreign_share,
+        malformed_share=args.malformed_share,
+        change_rate=args.change_rate,
+        seed=args.seed,
+    )
+    source.generation = args.generation
+    paths = dump_pages(source, args.page_size, args.output_dir)
+    print(f"Записано страниц: {len(paths)} в {args.output_dir}")
@@ -0,0 +1,45 @@
+"""Тесты нормализации адресов."""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Добавляем корневую директорию проекта в sys.path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from app.utils.address import address_key, normalize_address
+
+
+@pytest.mark.parametrize("left, right", [
+    ("г. Москва, ул. Солнечная, д. 1", "Москва, Солнечная ул., 1"),
+    ("г. Москва, ул. Ленина 10", "г. Москва, ул. Ленина, 10"),
+    ("г. Москва, ул. Ленина д. 10", "г. Москва, улица Ленина, дом 10"),
+    ("г. Москва, ул. Ленина, д. 1, корп. 2", "г. Москва, ул. Ленина, 1к2"),
+])
+def test_same_address(left, right):
+    """Разные написания одного адреса дают один ключ."""
+    assert address_key(left) == address_key(right)
+
+
+@pytest.mark.parametrize("left, right", [
+    ("г. Москва, ул. Ленина, 1, 2", "г. Москва, ул. Ленина, 12"),
+    ("г. Москва, ул. Ленина, д. 1 2", "г. Москва, ул. Ленина, д. 12"),
+    ("г. Москва, ул. Ленина, 1, корп. 2", "г. Москва, ул. Ленина, 12"),
+])
+def test_different_address(left, right):
+    """Части номера дома без маркеров не склеиваются."""
+    assert address_key(left) != address_key(right)
+
+
+@pytest.mark.parametrize("address, street, house", [
+    ("г. Москва, ул. Ленина 10", "ленина", "10"),
+    ("г. Москва, ул. 8 Марта 10", "8 марта", "10"),
+    ("г. Москва, ул. Парковая 3-я, 5", "парковая 3-я", "5"),
+    ("г. Москва, ул. Ленина д. 10 корп. 2", "ленина", "10к2"),
+    ("г. Москва, ул. Ленина, 1, 2", "ленина", "1 2"),
+])
+def test_street_and_house(address, street, house):
+    """Номер дома в одной части с улицей отделяется, числа в названии улицы - нет."""
+    normalized = normalize_address(address)
+    assert (normalized.street, normalized.house) == (street, house)
@@ -0,0 +1,55 @@
+"""Тесты потокового разбора списка элементов из JSON ответа API."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Добавляем корневую директорию проекта в sys.path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from app.utils.json_stream import iter_list_items
+
+ITEMS = [
+    {"hobjId": 1, "objCommercNm": "ЖК Первый", "shortAddr": "г. Москва, ул. Лесная"},
+    {"hobjId": 2, "objCommercNm": "ЖК \"Второй\"", "shortAddr": "г. Казань", "tags": [1, [2, 3]]},
+    {"hobjId": 3, "objCommercNm": "ЖК Третий", "shortAddr": None},
+]
+
+
+@pytest.mark.parametrize("document", [
+    {"data": {"total": 3, "list": ITEMS}},
+    {"meta": {"list": [0]}, "data": ITEMS},
+    {"list": ITEMS, "data": None},
+    ITEMS,
+])
+def test_iter_list_items(document):
+    """Элементы извлекаются по тем же путям, что и из результата json.loads."""
+    text = json.dumps(document, ensure_ascii=False, indent=2)
+    assert list(iter_list_items(text)) == ITEMS
+
+
+def test_iter_list_items_without_list():
+    """Ответ без списка - элементов нет."""
+    assert list(iter_list_items(json.dumps({"data": {"total": 0}}))) == []
+    assert list(iter_list_items(json.dumps({"data": {"list": []}}))) == []
+
+
+@pytest.mark.parametrize("cut", [
+    # Оборван внутри элемента, после элемента и сразу после запятой
+    lambda text: text[:text.index('"hobjId": 3') + 5],
+    lambda text: text[:text.index('{"hobjId": 3') - 2],
+    lambda text: text[:text.index('{"hobjId": 3')],
+    # Нет закрывающей скобки списка
+    lambda text: text[:text.rindex("]")],
+])
+def test_iter_list_items_truncated(cut):
+    """Оборванный data.list - ошибка, а не укороченный список (часть элементов уже выдана)."""
+    text = cut(json.dumps({"data": {"list": ITEMS, "total": 3}}, ensure_ascii=False))
+    items = iter_list_items(text)
+    received = []
+    with pytest.raises(ValueError):
+        for item in items:
+            received.append(item)
+    assert received == ITEMS[:len(received)]
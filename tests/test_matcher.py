@@ -0,0 +1,40 @@
+"""Тесты подбора ЖК для домов по адресу."""
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в sys.path
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from app.services.matcher import AddressMatcher
+
+# Небольшой набор ЖК: у нескольких общая улица (токен "ленина" чаще 5% ЖК)
+COMPLEXES = [
+    (1, "ЖК Ленинский", "г. Москва, ул. Ленина, д. 1"),
+    (2, "ЖК Ленина 5", "г. Москва, ул. Ленина, д. 5"),
+    (3, "ЖК Центральный", "г. Москва, ул. Ленина, д. 10"),
+] + [
+    (100 + i, f"ЖК {i}", f"г. Москва, ул. Улица{i}, д. {i}")
+    for i in range(17)
+]
+
+
+def test_shared_street_token_kept_on_small_dataset():
+    """Общий токен улицы не выбрасывается из индекса на небольшом наборе ЖК."""
+    matcher = AddressMatcher(COMPLEXES)
+    # Другой тип улицы: кандидаты находятся только по токену "ленина"
+    candidates = matcher.match("г. Москва, пр-т Ленина, д. 3")
+    assert {candidate.housing_complex_id for candidate in candidates} == {1, 2, 3}
+
+
+def test_exact_street_ranked_first():
+    """ЖК на той же улице получают высокую оценку, ЖК других улиц в кандидаты не попадают."""
+    matcher = AddressMatcher(COMPLEXES)
+    candidates = matcher.match("Москва, Ленина ул., 7", limit=2)
+    assert [candidate.housing_complex_id for candidate in candidates] == [1, 2]
+    assert all(candidate.score >= 0.9 for candidate in candidates)
+
+
+def test_no_street():
+    """Адрес без улицы - кандидатов нет."""
+    assert AddressMatcher(COMPLEXES).match("г. Москва") == []